@@ -0,0 +1,66 @@
+# python, and can be SageMaths because there is a version of the SageMaths that is possible also
+
+from time import perf_counter
+
+# NumPy and the engine are imported when LLL_alg is first called, the result cache only
+# when it is asked for, so importing this module costs nothing (see bkz.py)
+
+# this takes in the basis vectors of the lattice basis
+# then we will compute this based on a delta, which is our "loose" factor that allows our fraction that is not too loose, or not too tight
+def LLL_alg(basis_vectors, delta=0.75, hook=None, cache_dir=None):
+    # The input basis_vectors are a list of lists, held as one d x n array
+    # cache_dir: check the result cache there first, and store the result in it
+    # (see result_cache.py); a cached result reports no hook events
+    import numpy as np
+
+    from .instrumentation import lll_pass
+    from .lll_engine import gso_init
+    from .lll_precision import GSO_DTYPES, LLL_adaptive, fits_double
+    from .qary import QaryLattice, qary_lll
+
+    params = {"algorithm": "lll_alg", "delta": delta}
+    wide = not isinstance(basis_vectors, QaryLattice) and not fits_double(basis_vectors)
+    if cache_dir is not None:
+        from .result_cache import cache_lookup, cache_store, summarize
+        cached = cache_lookup(basis_vectors, params, cache_dir)
+        if cached is not None:
+            return list(cached[0] if wide else np.array(cached[0], dtype=float))
+    start = perf_counter()
+    if isinstance(basis_vectors, QaryLattice):
+        # q-ary lattices (qary.py): closed form GSO, and only the part swaps reach is reduced
+        B, Mu, r, _ = qary_lll(basis_vectors, delta, hook)
+    elif wide:
+        # entries too wide for the float rows to be exact: LLL_adaptive on the integers
+        # (lll_precision.py), and the result stays a list of integer arrays
+        rows, report = LLL_adaptive(basis_vectors, delta, hook=hook)
+        B = np.array(rows)
+        if cache_dir is not None:
+            r = gso_init(B, GSO_DTYPES[report["precision"]])[1]
+    else:
+        B = np.array(basis_vectors, dtype=float)
+
+        # GSO coefficients and squared norms ||b_i*||^2, computed once and then
+        # kept up to date incrementally by the engine (see lll_engine.py)
+        # hook: optional function that gets the pass's stats event (see instrumentation.py)
+        Mu, r = gso_init(B)
+        lll_pass(B, Mu, r, delta, hook)
+    if cache_dir is not None:
+        cache_store(basis_vectors, params, B, summarize(r, time=perf_counter() - start), cache_dir)
+
+    # Return the LLL-reduced basis as a list of numpy arrays
+    return list(B)
+
+if __name__ == "__main__":
+    # TESTING Usage:
+    basis_list = [[1, 1, 1], [-1, 0, 2], [3, 5, 6]]
+    reduced_basis1 = LLL_alg(basis_list)
+
+    basis_vectors = [[1,1],[1,100]]
+    reduced_basis2 = LLL_alg(basis_vectors)
+
+    print(f"My vector basis was:\n{basis_list}")
+    print("\nMy new LLL-reduced basis is (as numpy arrays):")
+    for b in reduced_basis1:
+        print(b)
+    for b in reduced_basis2:
+        print(b)
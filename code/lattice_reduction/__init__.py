@@ -0,0 +1,37 @@
+# Lattice reduction: LLL, BKZ and the variants around them, on a NumPy engine, with fpylll
+# (and Sage, where there is one) for comparison and as alternative backends.
+# Importing the package costs nothing: the names below are looked up in their modules the
+# first time they are used, and NumPy, fpylll and the optional parts only get imported by the
+# code that needs them.
+#
+# Usage:
+#   from lattice_reduction import LLL_alg, BKZ_alg
+#   basis = BKZ_alg(LLL_alg(basis, 0.99), 20, 0.99)
+#   from lattice_reduction.dispatch import reduce     # or any module, for the rest
+
+# name -> the module that has it
+_EXPORTS = {
+    "LLL_alg": "LLL",
+    "BKZ_alg": "bkz",
+    "resume": "bkz",
+    "LLL_adaptive": "lll_precision",
+    "DeepLLL_alg": "deep_lll",
+    "PotLLL_alg": "deep_lll",
+    "Progressive_alg": "progressive",
+    "Recursive_alg": "recursive_reduction",
+    "QaryLattice": "qary",
+    "Checkpointer": "checkpoint",
+    "EventLog": "instrumentation",
+    "print_event": "instrumentation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
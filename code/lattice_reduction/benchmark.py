@@ -0,0 +1,200 @@
+# Benchmark suite for LLL_alg / BKZ_alg against fpylll
+# Times our pure Python LLL and BKZ and fpylll's LLL.reduction / BKZ.reduction on the same
+# seeded lattices, checks the output (LLL-reduced, same first-vector quality as fpylll),
+# writes everything to a JSON file, and compares against a stored baseline so that a
+# change to the engine that makes it slower or worse is flagged straight away.
+#   - instances are fpylll's seeded generators: "uniform" (random entries of `bits` bits)
+#     and "qary" (k = d/2, q of `bits` bits), so every run sees the same bases
+#   - each timing is the best of `repeats` runs, on a fresh copy of the basis
+#   - quality: ||b_0||, the root Hermite factor, whether fpylll agrees the result is
+#     LLL-reduced (for the same delta), and ||b_0|| relative to fpylll's on that instance
+#
+# Usage:
+#   python -m lattice_reduction.benchmark results.json                      # run, write results
+#   python -m lattice_reduction.benchmark results.json --save-baseline base.json
+#   python -m lattice_reduction.benchmark results.json --baseline base.json # exit code 1 on a regression
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import fpylll
+import numpy as np
+from fpylll import BKZ, FPLLL, GSO, LLL, IntegerMatrix
+
+from .LLL import LLL_alg
+from .bkz import BKZ_alg
+from .instrumentation import root_hermite_factor
+from .simulator import initial_profile
+
+DEFAULT_DIMS = [10, 20, 40, 60, 80, 100, 120]
+DEFAULT_KINDS = {"uniform": 10, "qary": 10}    # kind -> bits
+ALGORITHMS = ("lll_alg", "fpylll_lll", "bkz_alg", "fpylll_bkz")
+
+
+def make_instance(kind, dim, bits, seed):
+    """
+    The seeded test lattice, as an IntegerMatrix.
+    """
+    FPLLL.set_random_seed(seed)
+    if kind == "qary":
+        return IntegerMatrix.random(dim, "qary", k=dim // 2, bits=bits)
+    return IntegerMatrix.random(dim, kind, bits=bits)
+
+
+def _to_rows(mat):
+    return [[mat[i, j] for j in range(mat.ncols)] for i in range(mat.nrows)]
+
+
+def _to_matrix(basis):
+    # LLL_alg / BKZ_alg give float rows, or integer ones for entries past 2^53
+    return IntegerMatrix.from_matrix([[int(round(v)) for v in row] for row in basis])
+
+
+def _lll_alg(mat, delta, blocksize):
+    return _to_matrix(LLL_alg(_to_rows(mat), delta))
+
+
+def _bkz_alg(mat, delta, blocksize):
+    return _to_matrix(BKZ_alg(_to_rows(mat), blocksize, delta))
+
+
+def _fpylll_lll(mat, delta, blocksize):
+    return LLL.reduction(mat, delta=delta)
+
+
+def _fpylll_bkz(mat, delta, blocksize):
+    # plain BKZ with full enumeration (no pruning strategies), like BKZ_alg
+    return BKZ.reduction(mat, BKZ.Param(block_size=blocksize, delta=delta))
+
+
+# name -> function(mat, delta, blocksize) returning the reduced IntegerMatrix, also used by lwe.py
+RUNNERS = {"lll_alg": _lll_alg, "fpylll_lll": _fpylll_lll,
+           "bkz_alg": _bkz_alg, "fpylll_bkz": _fpylll_bkz}
+
+
+def time_algorithm(algorithm, mat, delta, blocksize, repeats):
+    """
+    Best wall time over `repeats` runs on fresh copies of mat.
+    Returns (seconds, reduced matrix of the last run).
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        work = IntegerMatrix(mat)
+        start = time.perf_counter()
+        reduced = RUNNERS[algorithm](work, delta, blocksize)
+        best = min(best, time.perf_counter() - start)
+    return best, reduced
+
+
+def bench_key(record):
+    # identity of a benchmark case, for matching against the baseline
+    return f"{record['algorithm']}/{record['kind']}/d{record['dim']}/b{record['blocksize']}/s{record['seed']}"
+
+
+def run_suite(dims=DEFAULT_DIMS, kinds=DEFAULT_KINDS, algorithms=ALGORITHMS, seeds=(0,),
+              delta=0.99, blocksize=10, bkz_max_dim=60, repeats=3):
+    """
+    Runs every (kind, dim, seed, algorithm) case and returns the list of result records.
+    The BKZ cases stop at bkz_max_dim, since BKZ_alg's enumeration is pure Python.
+    """
+    results = []
+    for kind, bits in kinds.items():
+        for dim in dims:
+            for seed in seeds:
+                mat = make_instance(kind, dim, bits, seed)
+                # reference first-vector norms from fpylll, filled in as they are run
+                reference = {}
+                # fpylll first, so our results can be compared against it
+                for algorithm in sorted(algorithms, key=lambda a: not a.startswith("fpylll")):
+                    is_bkz = "bkz" in algorithm
+                    if is_bkz and dim > bkz_max_dim:
+                        continue
+                    seconds, reduced = time_algorithm(algorithm, mat, delta, blocksize, repeats)
+                    norm = reduced[0].norm()
+                    if algorithm.startswith("fpylll"):
+                        reference["bkz" if is_bkz else "lll"] = norm
+                    ref = reference.get("bkz" if is_bkz else "lll")
+
+                    record = {"algorithm": algorithm, "kind": kind, "bits": bits, "dim": dim,
+                              "seed": seed, "blocksize": blocksize if is_bkz else 0,
+                              "delta": delta, "time": seconds, "norm": norm,
+                              "rhf": root_hermite_factor(initial_profile(GSO.Mat(IntegerMatrix(reduced)))),
+                              "lll_reduced": LLL.is_reduced(reduced, delta=delta, eta=0.51),
+                              "norm_vs_fpylll": norm / ref if ref else None}
+                    results.append(record)
+                    print(f"{bench_key(record):32s} {seconds:9.4f}s  norm {norm:10.1f}  "
+                          f"lll_reduced={record['lll_reduced']}", flush=True)
+    return results
+
+
+def compare(results, baseline, time_tolerance=0.2, min_seconds=0.01, norm_tolerance=0.02):
+    """
+    Regressions of results against a baseline run (both lists of records).
+    A case regresses when it got more than time_tolerance slower (and by more than
+    min_seconds, to ignore timer noise on tiny cases), when its ||b_0|| got more than
+    norm_tolerance longer, or when it is no longer LLL-reduced.
+    Returns a list of messages, empty if nothing regressed.
+    """
+    old = {bench_key(rec): rec for rec in baseline}
+    problems = []
+    for rec in results:
+        key = bench_key(rec)
+        if not rec["lll_reduced"]:
+            problems.append(f"{key}: output is not LLL-reduced")
+        base = old.get(key)
+        if base is None:
+            continue
+        if rec["time"] > base["time"] * (1 + time_tolerance) and rec["time"] - base["time"] > min_seconds:
+            problems.append(f"{key}: {rec['time']:.4f}s, baseline {base['time']:.4f}s "
+                            f"({rec['time'] / base['time']:.2f}x)")
+        if rec["norm"] > base["norm"] * (1 + norm_tolerance):
+            problems.append(f"{key}: ||b_0|| {rec['norm']:.1f}, baseline {base['norm']:.1f}")
+    return problems
+
+
+def _metadata():
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "fpylll": getattr(fpylll, "__version__", None),
+            "machine": platform.machine(), "processor": platform.processor()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LLL_alg / BKZ_alg against fpylll.")
+    parser.add_argument("output", help="JSON file to write the results to")
+    parser.add_argument("--dims", type=int, nargs="+", default=DEFAULT_DIMS)
+    parser.add_argument("--kinds", nargs="+", default=list(DEFAULT_KINDS),
+                        help="instance kinds (uniform, qary)")
+    parser.add_argument("--bits", type=int, default=None, help="entry/modulus size for every kind")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=ALGORITHMS)
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--delta", type=float, default=0.99)
+    parser.add_argument("--blocksize", type=int, default=10)
+    parser.add_argument("--bkz-max-dim", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--baseline", help="baseline results to check for regressions")
+    parser.add_argument("--save-baseline", help="also write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    kinds = {kind: args.bits or DEFAULT_KINDS.get(kind, 10) for kind in args.kinds}
+    results = run_suite(args.dims, kinds, args.algorithms, args.seeds, args.delta,
+                        args.blocksize, args.bkz_max_dim, args.repeats)
+    report = {"meta": _metadata(), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        problems = compare(results, baseline, args.tolerance)
+        for message in problems:
+            print("REGRESSION", message)
+        if problems:
+            sys.exit(1)
+        print("no regressions against", args.baseline)
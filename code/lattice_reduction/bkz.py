@@ -0,0 +1,242 @@
+### the next stage is BKZ
+
+## different run times, and such....
+## bkz relies on several things different to LLL - block size, and the same delta as before
+
+
+from time import perf_counter
+
+# bkz.LLL_alg is the LLL of LLL.py
+from .LLL import LLL_alg
+
+# NumPy, the engine and the optional parts (result cache, checkpoints, DeepLLL, the sieve, the
+# enumeration pool) are imported by the functions that use them, so importing bkz costs
+# nothing until a basis is reduced, and a part that isn't asked for is never imported
+
+def find_shortest_vector(Mu_block, r_block, pruning=None, pool=None, deterministic=False, stats=None):
+    # SVP Solver: This doesn't just run LLL. 
+    # It performs an "Enumeration" search to find the literal shortest vector,
+    # directly on the GSO of the projected block pi_i(b_i), ..., pi_i(b_{h-1})
+    # (Mu[i:h, i:h] and ||b_j*||^2), see enumeration.py
+    # Returns the integer coefficients x (so v = sum_j x_j b_{i+j}) and ||pi_i(v)||^2
+    # pool: an EnumerationPool to split the search over its worker processes
+    # stats: optional dict, the enumeration nodes get added to stats["nodes"]
+    if len(r_block) == 0:
+        return None
+    from .enumeration import enumerate_svp, parallel_enumerate_svp
+
+    def search(radius_sq):
+        if pool is None:
+            return enumerate_svp(Mu_block, r_block, radius_sq, pruning, stats=stats)
+        return parallel_enumerate_svp(Mu_block, r_block, radius_sq, pruning, pool=pool,
+                                      deterministic=deterministic, stats=stats)
+
+    # First with the Gaussian heuristic radius; when the block's shortest vector is longer
+    # than that (common in the first tours), search again up to ||b_i*||
+    result = search(None)
+    if result is None:
+        result = search(r_block[0])
+    return result
+
+
+def scaled_oracle(search):
+    # An exact run's GSO is longdouble or Fractions, often past the range of a float: the
+    # block goes to the float oracle search (find_shortest_vector's contract) scaled by
+    # ||b_i*||^2, and its norm is scaled back. Float64 blocks go straight through
+    def oracle(Mu_block, r_block, **options):
+        if r_block.dtype == float:
+            return search(Mu_block, r_block, **options)
+        scale = r_block[0]
+        result = search(Mu_block.astype(float), (r_block / scale).astype(float), **options)
+        if result is None:
+            return None
+        return result[0], type(scale)(result[1]) * scale
+    return oracle
+
+
+# this takes in the basis vectors of the lattice basis
+# then we will compute this based on a delta, which is our "loose" 
+# factor that allows our fraction that is not too loose, or not too tight
+# block size included because change from LL to BKZ is this
+
+def BKZ_alg(basis_vectors, blocksize, delta=0.75, pruning=None, hook=None, workers=None,
+            deterministic=False, svp="enum", max_memory_mb=None, checkpoint=None, seed=None,
+            cache_dir=None, preprocess="lll"):
+    import numpy as np
+
+    from .instrumentation import lll_pass
+    from .lll_precision import fits_double, lll_arrays
+    from .qary import QaryLattice, qary_lll
+
+    # svp: the block oracle, "enum" (enumeration) or "sieve"
+    if svp not in ("enum", "sieve"):
+        raise ValueError(f"unknown svp {svp!r}, expected 'enum' or 'sieve'")
+
+    # everything the tours need, which is also what a checkpoint stores to resume them
+    params = {"blocksize": blocksize, "delta": delta,
+              "pruning": list(pruning) if pruning is not None else None,
+              "deterministic": deterministic, "svp": svp, "max_memory_mb": max_memory_mb}
+
+    # cache_dir: the result cache (result_cache.py). A cached result for the same basis and
+    # parameters is returned as it is; failing that, a cached result for a smaller
+    # blocksize is the starting point instead of the input basis (warm start). Both happen
+    # silently, as in run_bkz2; a cached result reports no hook events
+    start_basis = basis_vectors
+    if cache_dir is not None:
+        from .result_cache import cache_lookup, cache_store, summarize, warm_start_lookup
+        cache_params = dict(params, algorithm="bkz_alg", seed=seed, preprocess=preprocess)
+        cached = cache_lookup(basis_vectors, cache_params, cache_dir)
+        if cached is not None:
+            wide = not isinstance(basis_vectors, QaryLattice) and not fits_double(basis_vectors)
+            return list(cached[0] if wide else np.array(cached[0], dtype=float))
+        warm = warm_start_lookup(basis_vectors, cache_params, cache_dir)
+        if warm is not None:
+            start_basis = warm[0]
+    start = perf_counter()
+
+    # Same arrays as LLL_alg: the basis, Mu and ||b_i*||^2, all kept up to date in place
+    # hook: optional function that gets one stats event for the LLL pass and one per
+    # tour (GSO profile, slope, RHF, counts, timings), see instrumentation.py
+    # preprocess: "deep" or "pot" starts the tours from DeepLLL / PotLLL instead of LLL
+    # (see deep_lll.py), a better profile for the first tours to start from
+    if preprocess == "lll":
+        from .lll_engine import lll_reduce as reduce
+    else:
+        from .deep_lll import PREPROCESSORS
+        reduce = PREPROCESSORS[preprocess]
+    if isinstance(start_basis, QaryLattice):
+        B, Mu, r, _ = qary_lll(start_basis, delta, hook)
+        if preprocess != "lll":
+            lll_pass(B, Mu, r, delta, hook, reduce)
+    else:
+        # float arrays, or for entries too wide for the float rows to be exact LLL_adaptive on
+        # the integers (lll_precision.py), and the tours carry on with the exact basis (Python
+        # ints, free to grow) and the GSO in the precision LLL_adaptive settled on
+        B, Mu, r, precision = lll_arrays(start_basis, delta, hook, reduce)
+        if precision is not None:
+            params["precision"] = precision
+
+    # seed: for the sieve, the only part of BKZ that is random
+    reduced = _bkz_tours(B, Mu, r, params, np.random.default_rng(seed), hook, workers, checkpoint)
+    if cache_dir is not None:
+        cache_store(basis_vectors, cache_params, B, summarize(r, time=perf_counter() - start), cache_dir)
+    return reduced
+
+
+def resume(path, hook=None, workers=None, checkpoint=None):
+    # Carries on a BKZ_alg run from the checkpoint at path (see checkpoint.py), with the
+    # parameters and RNG state it was saved with, from the window where it stopped.
+    # Pass a Checkpointer again to keep saving checkpoints.
+    import numpy as np
+
+    from .checkpoint import load_checkpoint
+    from .lll_engine import gso_init
+    from .lll_precision import GSO_DTYPES
+
+    basis, state = load_checkpoint(path)
+    # only the basis is saved: the GSO is rebuilt from it, as every tour starts by doing,
+    # in the precision of an exact run (see BKZ_alg)
+    precision = state["params"].get("precision")
+    if precision is None:
+        B = np.array(basis, dtype=float)
+        Mu, r = gso_init(B)
+    else:
+        B = np.array(basis, dtype=object)
+        Mu, r = gso_init(B, GSO_DTYPES[precision])
+    rng = np.random.default_rng()
+    rng.bit_generator.state = state["rng"]
+    return _bkz_tours(B, Mu, r, state["params"], rng, hook, workers, checkpoint, state)
+
+
+def _bkz_tours(B, Mu, r, params, rng, hook, workers, checkpoint, resume_state=None):
+    import numpy as np
+
+    from .bkz_engine import bkz_reduce
+
+    svp, pruning = params["svp"], params["pruning"]
+
+    # workers > 1: the enumeration of each block is split over that many processes
+    # (deterministic: same result as with one, see enumeration.parallel_enumerate_svp)
+    pool = None
+    if workers and workers > 1:
+        from .enumeration import EnumerationPool
+        pool = EnumerationPool(workers)
+    if svp == "sieve":
+        from .sieve import sieve_svp
+
+    # The "Oracle": enumeration on the projected block GSO, or with svp="sieve" the NumPy
+    # sieve of sieve.py (much faster for blocks of 45 and up), its database capped at
+    # max_memory_mb
+    def search(Mu_block, r_block):
+        if svp == "sieve":
+            return sieve_svp(Mu_block, r_block, max_memory_mb=params["max_memory_mb"], seed=rng)
+        block_pruning = pruning[:len(r_block)] if pruning is not None else None
+        return find_shortest_vector(Mu_block, r_block, block_pruning, pool, params["deterministic"])
+
+
+    # checkpoint: optional checkpoint.Checkpointer, saving the basis, the position in the
+    # run, the RNG state and these parameters every so many tours or seconds
+    if checkpoint is not None:
+        checkpoint.context = {"params": params}
+        checkpoint.rng = rng
+
+    # Tours until one full tour makes no insertion
+    try:
+        bkz_reduce(B, Mu, r, params["blocksize"], scaled_oracle(search), params["delta"], hook=hook,
+                   checkpoint=checkpoint, resume=resume_state)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    return list(B)
+
+if __name__ == "__main__":
+    from .instrumentation import print_event
+
+    # --- FIXED TESTING BLOCK ---
+    basis_list = [[1, 1, 1], [-1, 0, 2], [3, 5, 6]] 
+    # Added the required blocksize argument (e.g., 2 or 3)
+    # print_event reports the LLL pass and every tour as it finishes
+    reduced_basis1 = BKZ_alg(basis_list, blocksize=3, hook=print_event)
+
+    print("\nFinal BKZ-reduced basis:")
+    for b in reduced_basis1:
+        print(b)
+
+    # 4 vectors in Z^3 are linearly dependent, so not a basis: the first three only
+    basis_list = [[105, 821, 432], [123, 456, 789], [234, 567, 890]]
+    reduced_basis2 = BKZ_alg(basis_list, blocksize=3, hook=print_event)
+
+    print(f"My vector basis was:\n{basis_list}")
+    print("\nMy new BKZ-reduced basis is (as numpy arrays):")
+    for b in reduced_basis2:
+        print(b)
+
+"""
+How it does what it doesies:
+For a lattice basis L and a block size k:
+    Beings wiht: Run LLL on the entire basis to get it into a decent starting shape.
+    The Outer Loop (aka the Tours): Repeat the following until the basis stabilizes:
+        The Inner Loop (Sliding Window): For i=1 to n−1:
+            Define the current block size h=min(k,n−i+1).
+            Local Projection: Project the vectors bi​,…,bi+h−1​ onto the space orthogonal to b1​,…,bi−1​. (Then this is the focus on the block).
+            SVP Oracle: Find the absolute shortest vector (v) in this small h-dimensional projected lattice. HiHLYI EXPENSIVE
+            Update: If this new vector v is shorter than the current bi​, insert it into the basis.  NOTE: IF 
+            Local LLL: Because you just added a vector, the basis is now "linearly dependent" (too many vectors). Run LLL on this local block to remove the dependency and clean up the vectors.
+
+    MAtches project overleaf documentation: 
+    Algorithm 4 The basic BKZ algorithm
+    Input: basis vectors b1, . . . , bn for a lattice
+    Output: a BKZ-shortened lattice basis b1, . . . , bn
+    while the last epoch did a nontrivial insertion do
+        for i = 1, 2, . . . , n − 1 do
+    h ← min(i + k − 1, n) {Block size k}
+    v ← FullEnumeration(L[i,h])
+            if ∥v∥ < δ∥bi∥ then
+            LLL(. . . ) {Updating the basis }
+            end if
+        end for
+    end while 
+
+The idea is to use BKZ 2.0 with Pruning as our benchmark baseline because its behavior is well-characterized in the literature and it provides a stable environment for isolating the effects of our [Variable Change]. While Sieve-based variants offer better performance at blocksizes β>60, BKZ 2.0 remains the standard for assessing the fundamental efficiency of new reduction strategies.
+"""
\ No newline at end of file
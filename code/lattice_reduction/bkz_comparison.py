@@ -0,0 +1,191 @@
+
+
+# What this code is for
+# Create a definite way of comparing my proposed idea against the code of the BKZ 2.0 methoodoloy.
+# This is important for:
+    # reproducibility
+    # fair comparison
+    # future people to review my work
+# I will use BKZ 2.0 to compare, NOT inclusive of the Gk6 library because it is a seiving methods
+# Seiving methods are much more powerful, but they are not guaranteed to behave the same way twice
+# FOr the intitial stages of my experiments, I need to be able to 
+# edit to fplll is the backend and super fast
+import time
+
+import numpy as np
+from fpylll import LLL, BKZ, IntegerMatrix, GSO
+
+from .block_update import self_dual_bkz
+from .checkpoint import load_checkpoint
+from .darmstadtchallengepull import load_darmstadt_challenge
+from .deep_lll import PREPROCESSORS
+from .instrumentation import make_event, new_stats
+from .lll_precision import lll_arrays
+from .result_cache import cache_lookup, cache_store, summarize, warm_start_lookup
+
+def get_bkz2_params(blocksize, max_loops=8):
+    """
+    Standard high-performance BKZ 2.0 settings for research benchmarks.
+    """
+    # BKZ 2.0 flags:
+    # AUTO_ABORT: Stop if slope doesn't improve (GSA-based)
+    # GH_BND: Use Gaussian Heuristic to bound SVP radius
+    # MAX_LOOPS: Fixed cap on tours to ensure termination
+    flags = BKZ.AUTO_ABORT | BKZ.GH_BND | BKZ.MAX_LOOPS
+    
+    # DEFAULT_STRATEGY: The JSON strategy file in fpylll containing 
+    # pre-optimized pruning trees (the heart of 2.0 speed).
+    params = BKZ.Param(
+        block_size=blocksize, 
+        strategies=BKZ.DEFAULT_STRATEGY, 
+        max_loops=max_loops, 
+        flags=flags
+    )
+    
+    return params
+
+
+def run_bkz2(mat, blocksize, max_loops=8, hook=None, checkpoint=None, start_tour=0, cache_dir=None,
+             preprocess="lll"):
+    """
+    BKZ 2.0 on mat (in place), driven one tour at a time so that we can count the tours.
+    Same stopping rules as BKZ.reduction with get_bkz2_params: a clean tour,
+    the GSA-based auto-abort or max_loops.
+    hook: optional function that gets the same events as BKZ_alg's hook (see
+    instrumentation.py), built from fpylll's GSO, so the profiles can be compared.
+    fpylll doesn't expose its counters per phase, so only the time is filled in, plus
+    "nodes", the enumeration nodes visited in that tour.
+    checkpoint: optional checkpoint.Checkpointer. A tour is one call into fplll, so
+    checkpoints are only taken between tours (every_seconds is checked after each tour).
+    start_tour: tours already done, when carrying on from a checkpoint (resume_bkz2).
+    cache_dir: optional result cache (result_cache.py). A cached result for the same matrix
+    and settings is copied into mat without running anything; otherwise a cached result for
+    a smaller block size is the starting point (warm start), and the result is stored.
+    preprocess: "deep" or "pot" runs DeepLLL / PotLLL (deep_lll.py, on the exact GSO for
+    entries past a double) on mat before fplll's LLL; its time is in the "lll" event.
+    That cuts the tours and nodes, but fplll's tours are cheap next to our Python
+    preprocessing, so it is mostly there to compare the profiles BKZ 2.0 starts from.
+    Returns the number of tours.
+    """
+    if cache_dir is not None:
+        original = _rows(mat)
+        cache_params = {"algorithm": "bkz2", "blocksize": blocksize, "max_loops": max_loops,
+                        "preprocess": preprocess}
+        cached = cache_lookup(original, cache_params, cache_dir)
+        if cached is not None:
+            _set_rows(mat, cached[0])
+            return cached[1]["tours"]
+        warm = warm_start_lookup(original, cache_params, cache_dir)
+        if warm is not None:
+            _set_rows(mat, warm[0])
+        run_start = time.perf_counter()
+
+    params = get_bkz2_params(blocksize, max_loops)
+    start = time.perf_counter()
+    if preprocess != "lll":
+        # on the float rows, or past 2^53 on the exact ones after LLL_adaptive, as BKZ_alg
+        B = lll_arrays(_rows(mat), params.delta, reduce=PREPROCESSORS[preprocess])[0]
+        _set_rows(mat, np.rint(B) if B.dtype == float else B)
+    gso = GSO.Mat(mat)
+    lll = LLL.Reduction(gso)
+    bkz = BKZ.Reduction(gso, lll, params)
+    lll()
+    if hook is not None:
+        stats = new_stats()
+        stats["time"] = time.perf_counter() - start
+        hook(make_event("lll", 0, gso.r(), stats))
+
+    auto_abort = BKZ.AutoAbort(gso, mat.nrows)
+    tours = start_tour
+    nodes = 0
+    while tours < max_loops:
+        start = time.perf_counter()
+        clean, _ = bkz.tour(tours, params, 0, mat.nrows)
+        tours += 1
+        if hook is not None:
+            stats = new_stats()
+            stats["time"] = time.perf_counter() - start
+            stats["nodes"] = bkz.nodes - nodes
+            nodes = bkz.nodes
+            hook(make_event("tour", tours, gso.r(), stats))
+        if checkpoint is not None and checkpoint.due(tour_end=True):
+            checkpoint.save(np.array(_rows(mat)), {"tour": tours, "window": 0, "blocksize": blocksize,
+                                              "max_loops": max_loops})
+        if clean or auto_abort.test_abort():
+            break
+
+    if cache_dir is not None:
+        gso.update_gso()
+        summary = summarize(np.array(gso.r()), time=time.perf_counter() - run_start, tours=tours)
+        cache_store(original, cache_params, np.array(_rows(mat)), summary, cache_dir)
+    return tours
+
+
+def _rows(mat):
+    return [[mat[i, j] for j in range(mat.ncols)] for i in range(mat.nrows)]
+
+
+def _set_rows(mat, basis):
+    for i, row in enumerate(basis):
+        for j, v in enumerate(row):
+            mat[i, j] = int(v)
+
+
+def resume_bkz2(path, hook=None, checkpoint=None):
+    """
+    Carries on a run_bkz2 run from the checkpoint at path, with the same block size and
+    max_loops. The auto-abort starts over, since it only looks at the last few tours.
+    Returns (mat, tours) with tours counted from the start of the original run.
+    """
+    basis, state = load_checkpoint(path)
+    mat = IntegerMatrix.from_matrix(basis.tolist())
+    tours = run_bkz2(mat, state["blocksize"], state["max_loops"], hook, checkpoint, state["tour"])
+    return mat, tours
+
+
+if __name__ == "__main__":
+    # Setup: Dimension 60 is chosen due to time cost, and also, ways in which we can improve the final outcomes
+    dim = 60
+    mat = load_darmstadt_challenge(dim) # Darmstadt downloader from earlierm will probs be in the same file but separate for now
+
+    # --- STEP 1: BKZ 2.0 BASELINE ---
+    mat_bkz2 = IntegerMatrix(mat) # Work on a copy
+    params = get_bkz2_params(blocksize=40)
+
+    # Track time and quality
+    start = time.perf_counter()
+    BKZ.reduction(mat_bkz2, params)
+    bkz2_time = time.perf_counter() - start
+    bkz2_quality = mat_bkz2[0].norm()
+
+    print(f"BKZ 2.0: Time = {bkz2_time:.2f}s, Quality = {bkz2_quality}")
+
+    # --- STEP 2: MY ALGORITHM (To run on same DVP so that I can show comparison)
+
+    # proposed ideas: dual lattice with same features as the BKZ 2.0 for more components,
+    # but take into account that we will also use statistics that we pre-generate from running LLL first
+    # this will be the dual lengths, because we can use the dual function to calculate the length of the primal vectors, and the other way around
+    # we can also grab the Geometric Series from the LLL step
+    # we can also grab the GSO coefficients from the LL step to help with pruning
+
+    # Self-dual BKZ (block_update.py): the same sliding window, but every block is reduced
+    # in the primal or the dual depending on which end of the block is further off the
+    # current GSO profile. One GSO.Mat/LLL/BKZ object set is shared by the whole run, so
+    # this decision costs nothing extra
+    mat_my = IntegerMatrix(mat) # Work on a copy STILL IN PROG
+    start = time.perf_counter()
+    self_dual_bkz(mat_my, blocksize=40)
+
+    my_time = time.perf_counter() - start
+    my_quality = mat_my[0].norm()
+    print(f"My Alg: Time = {my_time:.2f}s, Quality = {my_quality}")
+
+    # --- STEP 3: COMPARE
+    print("Comparison Results: ")
+    print(f"BKZ 2.0: Time = {bkz2_time:.2f}s, Quality = {bkz2_quality}")
+    print(f"My Alg: Time = {my_time:.2f}s, Quality = {my_quality}")
+
+    # Step 4
+
+    # Identify the cost for each of these ideas 
+    # Verify in code that is is taking the time that I think it is
@@ -0,0 +1,234 @@
+# BKZ tours on top of the incremental GSO engine
+# Same arrays as lll_engine.py (B, Mu with unit diagonal, r = ||b_i*||^2), all updated in
+# place. Inserting the oracle's vector at position i only touches rows i..h-1 of the basis,
+# so only the GSO columns i..h-1 are recomputed (for the rows at or after i), and the local
+# LLL runs on the same arrays instead of a list copy of the block.
+
+from fractions import Fraction
+from math import gcd
+from time import perf_counter
+
+import numpy as np
+
+from .instrumentation import make_event, new_stats
+from .lll_engine import gso_row, gso_update, lll_reduce, size_reduce_row
+
+
+def insert_vector(B, Mu, r, i, h, x, T=None):
+    """
+    Inserts v = sum_j x_j b_{i+j} (x integer, not all zero) at position i of the block
+    b_i..b_{h-1}, without ever making the rows linearly dependent: the coefficient vector
+    is brought down to a single +-1 by unimodular row operations (Euclid on the x_j), and
+    the row that ends up equal to v is moved to position i.
+    The coefficients mu_{l,j} of the block rows against the earlier b_j* (j < i) are
+    linear in b_l, so they go through the same row operations; after that only the
+    GSO columns i..h-1 have to be recomputed.
+    T: optional transform rows that follow the row operations (see lll_engine.py).
+    """
+    x = np.array(x, dtype=np.int64)
+    # the oracle's vector should be primitive, but a pruned search could return a multiple
+    g = 0
+    for c in x:
+        g = gcd(g, int(c))
+    x //= g
+
+    # invariant: v = sum_j x_j b_{i+j}. Take the smallest nonzero |x_p| and reduce every
+    # other x_q modulo it: x_q -= c x_p together with b_p += c b_q keeps v the same
+    nz = np.flatnonzero(x)
+    while nz.size > 1:
+        p = nz[np.argmin(np.abs(x[nz]))]
+        c = np.round(x / x[p]).astype(np.int64)
+        c[p] = 0
+        x -= c * x[p]
+        B[i + p] += c @ B[i:h]
+        Mu[i + p, :i] += c @ Mu[i:h, :i]
+        if T is not None:
+            T[i + p] += c @ T[i:h]
+        nz = np.flatnonzero(x)
+
+    # now v = x_p b_{i+p} with x_p = +-1: rotate that row up to position i
+    p = nz[0]
+    for M in (B, Mu[:, :i]) if T is None else (B, Mu[:, :i], T):
+        v = M[i + p] * x[p]
+        M[i + 1:i + p + 1] = M[i:i + p]
+        M[i] = v
+
+    gso_update(B, Mu, r, i, h)
+
+
+def dual_block_gso(Mu_block, r_block):
+    """
+    GSO of the dual of the projected block, with the dual basis d_j (<b_i, d_j> = delta_ij)
+    taken in reverse order d_{m-1}, ..., d_0, which makes it lower triangular again:
+    Mu_dual = J Mu^-T J and r_dual[j] = 1 / r[m-1-j].
+    A short dual vector sum_j x_j d_{m-1-j} found on this GSO can be put in with
+    insert_dual_vector (with the coefficients flipped back, y = x[::-1]).
+    """
+    m = len(r_block)
+    Mu_block = np.asarray(Mu_block, dtype=float)
+    Mu_inv = np.linalg.solve(Mu_block, np.eye(m))
+    return Mu_inv.T[::-1, ::-1].copy(), 1.0 / np.asarray(r_block, dtype=float)[::-1]
+
+
+def insert_dual_vector(B, Mu, r, i, h, y, T=None):
+    """
+    Makes w = sum_j y_j d_j (the dual basis of the projected block b_i..b_{h-1}, y integer)
+    the last dual vector, so that ||b_{h-1}*|| becomes 1 / ||w||.
+    Same Euclid as insert_vector, but on the dual side: d_p += c d_q on the dual basis is
+    b_q -= c b_p on the primal one, and swaps/sign changes are the same on both sides.
+    Only rows i..h-1 of B change, inside the lattice they span.
+    T: optional transform rows that follow the row operations (see lll_engine.py).
+    """
+    y = np.array(y, dtype=np.int64)
+    g = 0
+    for c in y:
+        g = gcd(g, int(c))
+    y //= g
+
+    nz = np.flatnonzero(y)
+    while nz.size > 1:
+        p = nz[np.argmin(np.abs(y[nz]))]
+        c = np.round(y / y[p]).astype(np.int64)
+        c[p] = 0
+        y -= c * y[p]
+        # d_p += sum_q c_q d_q  <=>  b_q -= c_q b_p for every q
+        B[i:h] -= np.outer(c, B[i + p])
+        Mu[i:h, :i] -= np.outer(c, Mu[i + p, :i])
+        if T is not None:
+            T[i:h] -= np.outer(c, T[i + p])
+        nz = np.flatnonzero(y)
+
+    # w = y_p d_p with y_p = +-1: move that row to the end of the block
+    p = nz[0]
+    for M in (B, Mu[:, :i]) if T is None else (B, Mu[:, :i], T):
+        v = M[i + p] * y[p]
+        M[i + p:h - 1] = M[i + p + 1:h]
+        M[h - 1] = v
+
+    # The Euclid steps can leave block rows much longer than the lattice vectors they
+    # stand for, and a Gram-based GSO of long rows loses r_k to cancellation. So bring the
+    # rows back down one at a time (size-reduce b_k, recompute its GSO row from the
+    # integers, as in lll_precision.py) before the columns below the block are redone.
+    # A few passes per row is plenty; more only chase rounding in mu near 1/2
+    for k in range(i, h):
+        gso_row(B, Mu, r, k)
+        for _ in range(10):
+            if not size_reduce_row(B, Mu, k, T=T):
+                break
+            gso_row(B, Mu, r, k)
+    gso_update(B, Mu, r, i, h)
+
+
+def bkz_tour(B, Mu, r, blocksize, oracle, delta=0.75, stats=None, start=0, on_window=None):
+    """
+    One BKZ tour over the windows [i, min(i + blocksize, d)), i = 0..d-2.
+    oracle(Mu_block, r_block) returns (x, norm_sq) for the projected block, or None.
+    A vector is inserted when ||pi_i(v)|| < delta ||b_i*|| (Algorithm 4), followed by
+    size reduction of the new b_i and LLL on the window.
+    stats: optional counters dict (see instrumentation.py); oracle calls, insertions,
+    LLL swaps/size reductions and the time spent in each phase are added to it.
+    start: first window, to finish a tour that was interrupted (see checkpoint.py)
+    on_window: optional function on_window(i, insertions), called before every window
+    after the first with the insertions made so far (used for checkpoints).
+    Returns the number of insertions made during the tour.
+    """
+    d = B.shape[0]
+    insertions = 0
+    # Start every tour from a GSO recomputed from the basis. The swap and insertion
+    # updates are exact only in exact arithmetic, and over thousands of them (q-ary bases
+    # need that many) the float Mu and r drift far enough to make some r[i] <= 0
+    gso_update(B, Mu, r)
+    # a handful of clock reads per block is nothing next to the enumeration,
+    # but there is no point paying for them without a stats dict
+    timed = stats is not None
+
+    for i in range(start, d - 1):
+        if on_window is not None and i > start:
+            on_window(i, insertions)
+        h = min(i + blocksize, d)
+
+        if timed:
+            t0 = perf_counter()
+        result = oracle(Mu[i:h, i:h], r[i:h])
+        if timed:
+            t1 = perf_counter()
+            stats["oracle_calls"] += 1
+            stats["oracle_time"] += t1 - t0
+        if result is None:
+            continue
+        x, norm_sq = result
+
+        # (squared, so that it also works on longdouble and Fraction GSOs, see lll_precision.py)
+        if norm_sq < (Fraction(delta) if r.dtype == object else delta) ** 2 * r[i]:
+            insert_vector(B, Mu, r, i, h, x)
+            size_reduce_row(B, Mu, i)
+            if timed:
+                t2 = perf_counter()
+            lll_reduce(B, Mu, r, delta, i, h, stats)
+            if timed:
+                stats["insert_time"] += t2 - t1
+                stats["lll_time"] += perf_counter() - t2
+            insertions += 1
+
+    if timed:
+        stats["insertions"] += insertions
+    return insertions
+
+
+def bkz_reduce(B, Mu, r, blocksize, oracle, delta=0.75, max_tours=None, hook=None,
+               checkpoint=None, resume=None):
+    """
+    BKZ tours until a full tour makes no insertion (or max_tours tours have run),
+    then a final LLL pass over the whole basis.
+    hook: optional function called after every tour with the tour's event
+    (GSO profile, slope, RHF, counters and timings, see instrumentation.py);
+    instrumentation.print_event prints one line per tour.
+    checkpoint: optional checkpoint.Checkpointer, asked after every window and every tour
+    whether a checkpoint is due.
+    resume: the state of a checkpoint, to carry on from there (B, Mu, r rebuilt from its basis).
+    Returns the number of tours.
+    """
+    tours = 0
+    start = 0
+    prior = 0
+    prior_stats = None
+    if resume is not None:
+        tours = resume["tour"]
+        start = resume["window"]
+        prior = resume["insertions"]
+        prior_stats = resume.get("stats")
+
+    while max_tours is None or tours < max_tours:
+        tours += 1
+        stats = None
+        if hook is not None:
+            stats = new_stats()
+            if prior_stats is not None:
+                stats.update(prior_stats)
+            started = perf_counter() - stats["time"]
+
+        on_window = None
+        if checkpoint is not None:
+            def on_window(i, insertions):
+                if checkpoint.due():
+                    if stats is not None:
+                        stats["time"] = perf_counter() - started
+                    checkpoint.save(B, {"tour": tours - 1, "window": i, "insertions": prior + insertions,
+                                        "stats": stats})
+
+        insertions = prior + bkz_tour(B, Mu, r, blocksize, oracle, delta, stats, start, on_window)
+        start = prior = 0
+        prior_stats = None
+        if hook is not None:
+            stats["time"] = perf_counter() - started
+            hook(make_event("tour", tours, r, stats))
+        if checkpoint is not None and checkpoint.due(tour_end=True):
+            checkpoint.save(B, {"tour": tours, "window": 0, "insertions": 0, "stats": None})
+        if insertions == 0:
+            break
+
+    # Each local LLL only covers its window, so a pair straddling the end of a window and
+    # the size reduction of the rows after it can be left behind; one full pass tidies up
+    gso_update(B, Mu, r)
+    lll_reduce(B, Mu, r, delta)
+    return tours
@@ -0,0 +1,128 @@
+# edit to fplll is the backend and super fast
+# this idea of this program was to understand only the dual block reduction, and how this work
+# standalone and not in line with the other scripts
+# It is now the "proposed algorithm" half of bkz_comparison.py: a self-dual BKZ that goes
+# over the sliding window like a BKZ tour, and for every block decides from the current
+# GSO profile whether a primal or a dual SVP reduction will help more.
+# Everything runs on ONE GSO.Mat / LLL.Reduction / BKZ.Reduction for the whole run:
+# fplll keeps that GSO up to date as the basis changes, so no block ever rebuilds it.
+import time
+from math import log
+
+from fpylll import FPLLL, LLL, BKZ, IntegerMatrix, GSO
+
+from .instrumentation import make_event, new_stats
+
+
+def reduction_objects(basis, params):
+    """
+    The shared GSO.Mat, LLL.Reduction and BKZ.Reduction for basis (reduced in place).
+    Build these once per run and pass the BKZ object to the block reductions.
+    """
+    gso = GSO.Mat(basis)
+    lll = LLL.Reduction(gso)
+    bkz = BKZ.Reduction(gso, lll, params)
+    return gso, lll, bkz
+
+
+# dual_block_reduc done by Micciancio & Walter's Self-Dual BKZ
+# will return a basis that is dual-reduced for that block
+def dual_block_reduction(bkz, block_start, block_size, params):
+    # We find a short vector in the dual of the projected block.
+    # This vector corresponds to a 'large gap' in the primal: making it short in the dual
+    # makes ||b_{block_end-1}*|| as large as possible.
+    # fplll does this on the GSO it already has: the reversed dual GSO is treated as a primal
+    # GSO, because there is less work to do on the GSO than to create A = B^-1 * t
+    # Returns True if the block was already reduced (nothing changed).
+    return bkz.svp_reduction(block_start, block_size, params, dual=True)
+
+
+def primal_block_reduction(bkz, block_start, block_size, params):
+    # the usual BKZ step: make ||b_{block_start}*|| as small as possible
+    return bkz.svp_reduction(block_start, block_size, params, dual=False)
+
+
+def prefer_dual(block_profile):
+    """
+    Primal vs dual for one block, from its log GSO profile log||b_j*||, j = start..end-1.
+    A primal reduction can at best bring log||b_start*|| down to about the block's average
+    log||b_j*|| (Gaussian heuristic, with the same constant for the dual), and a dual
+    reduction can at best bring log||b_{end-1}*|| up to it. We pick the one with more room.
+    """
+    average = sum(block_profile) / len(block_profile)
+    primal_gap = block_profile[0] - average
+    dual_gap = average - block_profile[-1]
+    return dual_gap > primal_gap
+
+
+def self_dual_tour(gso, bkz, params, min_row=0, max_row=None, counts=None):
+    """
+    One tour over the windows [k, min(k + block_size, max_row)), each one reduced in the
+    primal or in the dual as prefer_dual decides from the GSO as it is at that moment.
+    counts: optional dict (e.g. instrumentation.new_stats()): "primal_blocks" / "dual_blocks",
+    "oracle_calls" (one SVP reduction per block), "insertions" (blocks it changed) and
+    "oracle_time" are added to it.
+    Returns True if the tour changed nothing.
+    """
+    if max_row is None:
+        max_row = gso.d
+    clean = True
+    for block_start in range(min_row, max_row - 1):
+        block_size = min(params.block_size, max_row - block_start)
+        # fplll recomputes the GSO rows lazily; update_gso only redoes the rows the last
+        # block reduction invalidated, it doesn't rebuild the GSO
+        gso.update_gso()
+        block_profile = [log(gso.get_r(j, j)) / 2 for j in range(block_start, block_start + block_size)]
+        start = time.perf_counter()
+        if prefer_dual(block_profile):
+            reduced = dual_block_reduction(bkz, block_start, block_size, params)
+            key = "dual_blocks"
+        else:
+            reduced = primal_block_reduction(bkz, block_start, block_size, params)
+            key = "primal_blocks"
+        clean &= reduced
+        if counts is not None:
+            counts[key] = counts.get(key, 0) + 1
+            counts["oracle_calls"] = counts.get("oracle_calls", 0) + 1
+            counts["insertions"] = counts.get("insertions", 0) + (not reduced)
+            counts["oracle_time"] = counts.get("oracle_time", 0.0) + time.perf_counter() - start
+    return clean
+
+
+def self_dual_bkz(basis, blocksize, max_loops=8, hook=None, strategies=BKZ.DEFAULT_STRATEGY):
+    """
+    Self-dual BKZ on basis (an IntegerMatrix, reduced in place): LLL, then self_dual_tour
+    until a tour changes nothing, the GSA-based auto-abort fires, or max_loops tours.
+    hook: optional function that gets the same events as run_bkz2 (instrumentation.py),
+    with the number of primal and dual blocks of each tour, its SVP reductions under
+    "oracle_calls" and the blocks they changed under "insertions" (fplll doesn't expose
+    its swaps and size reductions, those stay 0).
+    strategies: pruning/preprocessing strategies for the SVP calls, the same default as
+    BKZ 2.0 in bkz_comparison.get_bkz2_params so that the two are compared fairly.
+    Returns the number of tours.
+    """
+    params = BKZ.Param(block_size=blocksize, strategies=strategies, max_loops=max_loops,
+                       flags=BKZ.AUTO_ABORT | BKZ.GH_BND | BKZ.MAX_LOOPS)
+    gso, lll, bkz = reduction_objects(basis, params)
+    lll()
+
+    auto_abort = BKZ.AutoAbort(gso, basis.nrows)
+    tours = 0
+    while tours < max_loops:
+        stats = new_stats() if hook is not None else None
+        start = time.perf_counter()
+        clean = self_dual_tour(gso, bkz, params, 0, basis.nrows, stats)
+        tours += 1
+        if hook is not None:
+            stats["time"] = time.perf_counter() - start
+            hook(make_event("tour", tours, gso.r(), stats))
+        if clean or auto_abort.test_abort():
+            break
+    return tours
+
+
+if __name__ == "__main__":
+    FPLLL.set_random_seed(0)
+    A = IntegerMatrix.random(60, "qary", k=30, bits=20)
+    tours = self_dual_bkz(A, 20, strategies=None)
+    print(f"self-dual BKZ-20: {tours} tours, ||b_0|| = {A[0].norm():.1f}")
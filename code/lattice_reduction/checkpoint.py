@@ -0,0 +1,103 @@
+# Checkpoints for long BKZ runs
+# A checkpoint is everything a run needs to carry on after being killed: the basis, how far
+# it got (tours done, the window it was about to reduce, insertions so far in that tour),
+# the instrumentation counters of the current tour, the RNG state and the run's parameters.
+# Only the integer basis is stored, not the GSO: that is all a checkpoint costs to write,
+# and the GSO is rebuilt from the basis on load (gso_init), exactly as every tour
+# rebuilds it at its start anyway (bkz_engine.bkz_tour).
+#
+# File format: an uncompressed .npz with two entries,
+#   basis : the basis as int64, or if an entry doesn't fit, as decimal strings
+#   state : the rest, as a JSON string
+# Neither needs pickle, so a checkpoint is loaded with allow_pickle=False and opening one
+# from somewhere else can't run code.
+# written to a temporary file in the same directory and renamed into place, so a job
+# killed halfway through a save still leaves the previous checkpoint intact.
+#
+# Usage:
+#   BKZ_alg(basis, 60, checkpoint=Checkpointer("run.ckpt.npz", every_seconds=600))
+#   ... job preempted ...
+#   resume("run.ckpt.npz", checkpoint=Checkpointer("run.ckpt.npz", every_seconds=600))
+
+import json
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+
+def _integer_basis(B):
+    # the float basis of the engine holds integers; back to exact integers for storage
+    if B.dtype.kind != "f":
+        return B
+    if np.abs(B).max() < 2.0 ** 62:
+        return np.rint(B).astype(np.int64)
+    return np.array([[int(round(v)) for v in row] for row in B], dtype=object)
+
+
+def save_checkpoint(path, B, state):
+    """
+    Writes the basis B (an integer array, or the engine's float array, which is rounded) and
+    the JSON-able dict state to path, atomically.
+    """
+    basis = _integer_basis(np.asarray(B))
+    if basis.dtype == object:
+        basis = basis.astype(str)
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as f:
+        np.savez(f, basis=basis, state=np.array(json.dumps(state)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f.name, path)
+
+
+def load_checkpoint(path):
+    """
+    Reads a checkpoint written by save_checkpoint.
+    Returns (basis, state): the integer basis (int64, or dtype=object) and the dict.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        basis = data["basis"]
+        state = json.loads(str(data["state"]))
+    if basis.dtype.kind == "U":
+        basis = np.array([[int(v) for v in row] for row in basis], dtype=object)
+    return basis, state
+
+
+class Checkpointer:
+    """
+    Decides when a run saves a checkpoint, and saves it.
+    every_tours:    save at the end of every so many tours (None: never on tour count)
+    every_seconds:  save whenever this much time has passed since the last save; this is
+                    checked after every window, so a save can come in the middle of a tour
+    context holds extra fields saved with every checkpoint (BKZ_alg puts its parameters
+    there), and rng, if set, is a numpy Generator whose state is saved too.
+    """
+
+    def __init__(self, path, every_tours=1, every_seconds=None):
+        self.path = path
+        self.every_tours = every_tours
+        self.every_seconds = every_seconds
+        self.context = {}
+        self.rng = None
+        self.saves = 0
+        self._tours = 0
+        self._last = perf_counter()
+
+    def due(self, tour_end=False):
+        # called once after every window (tour_end=False) and once after every tour
+        if tour_end and self.every_tours:
+            self._tours += 1
+            if self._tours >= self.every_tours:
+                return True
+        return self.every_seconds is not None and perf_counter() - self._last >= self.every_seconds
+
+    def save(self, B, state):
+        state = dict(state, **self.context)
+        if self.rng is not None:
+            state["rng"] = self.rng.bit_generator.state
+        save_checkpoint(self.path, B, state)
+        self.saves += 1
+        self._tours = 0
+        self._last = perf_counter()
@@ -0,0 +1,180 @@
+
+import urllib.request
+import bz2
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Local cache for the challenge files, so that experiments don't download (and re-parse)
+# the same matrix every time, and still work on machines without network access.
+# Content-addressed: every file is stored under the SHA-256 of the bytes we downloaded,
+#   <cache>/<sha256>.bz2    the challenge exactly as published
+#   <cache>/<sha256>.npy    the parsed matrix, which loads (memory-mapped) in milliseconds
+#   <cache>/index.json      which hash belongs to which challenge dimension
+# The cache directory is $DARMSTADT_CACHE if set, otherwise ~/.cache/darmstadt_challenges
+DEFAULT_CACHE_DIR = os.environ.get(
+    "DARMSTADT_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "darmstadt_challenges"))
+
+# brackets and commas become spaces, leaving whitespace separated integers
+_MATRIX_PUNCTUATION = str.maketrans("[],", "   ")
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "index.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_index(cache_dir, index):
+    # write then rename, so a crash never leaves a half-written index behind
+    tmp = os.path.join(cache_dir, "index.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, os.path.join(cache_dir, "index.json"))
+
+
+def parse_challenge(fileobj, dimension):
+    """
+    Streaming parser for a challenge file (a binary file object, already decompressed).
+    The format starts with 3 lines of metadata, then the matrix inside [ ], which we read
+    line by line instead of building one big string.
+    Returns a dimension x dimension numpy array (int64, or Python ints if the entries
+    don't fit).
+    """
+    text = io.TextIOWrapper(fileobj, encoding="utf-8")
+    for _ in range(3):
+        text.readline()
+
+    tokens = []
+    for line in text:
+        tokens.extend(line.translate(_MATRIX_PUNCTUATION).split())
+
+    if len(tokens) != dimension * dimension:
+        raise ValueError(f"expected {dimension * dimension} entries, found {len(tokens)}")
+    try:
+        numbers = np.array(tokens, dtype=np.int64)
+    except OverflowError:
+        numbers = np.array([int(t) for t in tokens], dtype=object)
+    return numbers.reshape(dimension, dimension)
+
+
+def _parse_file(path, dimension):
+    # .bz2 files are decompressed on the fly, anything else is read as plain text
+    opener = bz2.BZ2File if path.endswith(".bz2") else open
+    with opener(path, "rb") as f:
+        return parse_challenge(f, dimension)
+
+
+def _load_npy(path):
+    # memory-map when we can; arrays of Python ints (dtype=object) can't be mapped
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path, allow_pickle=True)
+
+
+def _cached_array(cache_dir, digest, source_path, dimension):
+    # the parsed matrix for a cached file, parsing it (once) if the .npy isn't there yet
+    npy_path = os.path.join(cache_dir, digest + ".npy")
+    if os.path.exists(npy_path):
+        return _load_npy(npy_path)
+
+    array = _parse_file(source_path, dimension)
+    tmp = npy_path + ".tmp.npy"
+    np.save(tmp, array, allow_pickle=array.dtype == object)
+    os.replace(tmp, npy_path)
+    return array
+
+
+def fetch_challenge(dimension, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Downloads challenge-<dimension>.bz2 into the cache (unless it is already there)
+    and returns its SHA-256.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    index = _read_index(cache_dir)
+    name = f"challenge-{dimension}"
+    if name in index and os.path.exists(os.path.join(cache_dir, index[name] + ".bz2")):
+        return index[name]
+
+    url = f"https://www.latticechallenge.org/challenges/{name}.bz2"
+    print(f"Fetching challenge from: {url}")
+    # stream straight to disk, then move into place under the content hash
+    with urllib.request.urlopen(url) as response, \
+            tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as tmp:
+        shutil.copyfileobj(response, tmp)
+    digest = _file_sha256(tmp.name)
+    os.replace(tmp.name, os.path.join(cache_dir, digest + ".bz2"))
+
+    index[name] = digest
+    _write_index(cache_dir, index)
+    return digest
+
+
+def load_challenge_array(dimension=200, path=None, cache_dir=DEFAULT_CACHE_DIR, offline=False):
+    """
+    The challenge matrix as a numpy array (memory-mapped from the cache when possible).
+    path:     read a local challenge file (.bz2, plain text or .npy) instead of the cache
+    offline:  never touch the network; fails if the challenge isn't cached yet
+    """
+    if path is not None:
+        if path.endswith(".npy"):
+            return _load_npy(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        return _cached_array(cache_dir, _file_sha256(path), path, dimension)
+
+    if offline:
+        digest = _read_index(cache_dir).get(f"challenge-{dimension}")
+        if digest is None:
+            raise FileNotFoundError(f"challenge-{dimension} is not in the cache at {cache_dir}")
+    else:
+        digest = fetch_challenge(dimension, cache_dir)
+    return _cached_array(cache_dir, digest, os.path.join(cache_dir, digest + ".bz2"), dimension)
+
+
+# change the dimension as we get more and more confident in our methodolgy
+# this is for our experimentation down the track, but getting it set up now
+def load_darmstadt_challenge(dimension=200, path=None, cache_dir=DEFAULT_CACHE_DIR, offline=False):
+    """
+    Testing library because we need to create experiments on SVP challenge instances.
+    These should be repeatable by others, and ones that are used by others
+    as a sort of form of truth and benchmark.
+    Loads an SVP challenge matrix from latticechallenge.org, through the local cache
+    (see load_challenge_array for path / offline).
+    """
+    # basic implementation and error handling
+    try:
+        array = load_challenge_array(dimension, path, cache_dir, offline)
+
+        from fpylll import IntegerMatrix  # only needed here, so imported on first use
+
+        # Darmstadt challenges are n x n matrices, filled in one go
+        mat = IntegerMatrix.from_matrix(array.tolist())
+                
+        print(f"Successfully loaded {dimension}x{dimension} challenge matrix.")
+        return mat
+
+    except Exception as e:
+        print(f"Error loading challenge: {e}")
+        print(f"Unable to load Darmstadt challenge of dimension {dimension}.")
+        return None
+
+# Example Usage:
+# challenge_mat = load_darmstadt_challenge(60) # Start small!
+# basis_as_arrays = [np.array(row) for row in challenge_mat]
+# offline, from a file copied onto the node:
+# challenge_mat = load_darmstadt_challenge(60, path="challenge-60.bz2")
\ No newline at end of file
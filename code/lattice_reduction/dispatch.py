@@ -0,0 +1,428 @@
+# One reduce(basis, algorithm, ...) for every backend, routed by a local calibration
+# The same LLL / BKZ can run on three backends, each best somewhere else:
+#   "numpy"   our engine (lll_engine.py / bkz_engine.py): no conversion at all, but its
+#             loops are Python and its GSO is float64
+#   "fpylll"  fplll's LLL.reduction / BKZ.reduction: compiled, exact integers, but every
+#             call pays for building an IntegerMatrix and converting back
+#   "sage"    Sage's M.LLL() / M.BKZ() (see code/sagemaths_demo.py), under Sage
+# and more can be added with register_backend. Only the backends whose module can be found
+# are used, and none of them is imported until a basis is routed to it; that goes for NumPy
+# and our engine too, so importing dispatch only costs the standard library.
+#
+# calibrate() times every available backend on seeded q-ary bases in (dimension, entry
+# bits) buckets, measures the root Hermite factor it reaches, and writes the records to a
+# JSON file (DEFAULT_CALIBRATION by default), with the delta they were taken at; reduce()
+# only routes on a calibration for its own delta. It takes the bucket of the basis
+# (the smallest calibrated dimension / bits at or above its own) and picks the fastest
+# backend whose RHF there is within RHF_TOLERANCE of the best (or below max_rhf, when
+# asked for). Without a calibration for the bucket the first compiled backend available is
+# used, numpy only when there is none: measured here, fplll's conversion costs less than
+# the engine's own setup (Gram matrix, Cholesky) even at dimension 6 (0.1 ms against 3 ms).
+# The numpy backend is never given a basis above its max_dim (60) or max_bits (26, past
+# which the float GSO can't be trusted, see lll_precision.py) while another backend is
+# available, calibrated or not, and it isn't calibrated there either.
+#
+# cross_check: run a second backend on the same basis and compare. Both results must span
+# the same lattice as the input (reduced = U basis with U an integer matrix of determinant
+# +-1, see _same_lattice) and reach RHFs within RHF_TOLERANCE, otherwise
+# BackendDisagreement is raised.
+#
+# Usage:
+#   python -m lattice_reduction.dispatch      # calibrate, then print the routing table
+#   basis, report = reduce(basis, "lll", delta=0.99)
+#   basis, report = reduce(basis, "bkz", blocksize=20, cross_check=True)
+#   print(report["backend"], report["time"], report["rhf"])
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import time
+
+DEFAULT_CALIBRATION = os.path.join(os.path.expanduser("~"), ".cache", "lattice_reductions",
+                                   "dispatch.json")
+DIMS = (10, 20, 40, 80)
+BITS = (10, 20, 40)
+RHF_TOLERANCE = 0.01
+# the modulus _same_lattice solves for the transform in
+_PRIME = 2 ** 127 - 1
+
+
+class BackendDisagreement(ArithmeticError):
+    # raised by a cross check when two backends reduce the same basis differently
+    pass
+
+
+def _numpy_lll(rows, delta, blocksize):
+    import numpy as np
+
+    from .lll_engine import gso_init, lll_reduce
+    B = np.array(rows, dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, delta)
+    return np.rint(B).astype(np.int64).tolist()
+
+
+def _numpy_bkz(rows, delta, blocksize):
+    # BKZ_alg's steps, straight on the float engine arrays
+    import numpy as np
+
+    from .bkz import find_shortest_vector
+    from .bkz_engine import bkz_reduce
+    from .lll_engine import gso_init, lll_reduce
+    B = np.array(rows, dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, delta)
+    bkz_reduce(B, Mu, r, blocksize, find_shortest_vector, delta)
+    return np.rint(B).astype(np.int64).tolist()
+
+
+def _fpylll_lll(rows, delta, blocksize):
+    from fpylll import LLL, IntegerMatrix
+    A = IntegerMatrix.from_matrix(rows)
+    LLL.reduction(A, delta)
+    return [[A[i, j] for j in range(A.ncols)] for i in range(A.nrows)]
+
+
+def _fpylll_bkz(rows, delta, blocksize):
+    from fpylll import BKZ, IntegerMatrix
+    A = IntegerMatrix.from_matrix(rows)
+    BKZ.reduction(A, BKZ.Param(block_size=blocksize, delta=delta))
+    return [[A[i, j] for j in range(A.ncols)] for i in range(A.nrows)]
+
+
+def _sage_lll(rows, delta, blocksize):
+    from sage.all import ZZ, matrix
+    return [[int(a) for a in row] for row in matrix(ZZ, rows).LLL(delta=delta).rows()]
+
+
+def _sage_bkz(rows, delta, blocksize):
+    from sage.all import ZZ, matrix
+    M = matrix(ZZ, rows).BKZ(block_size=blocksize, delta=delta)
+    return [[int(a) for a in row] for row in M.rows()]
+
+
+# name -> the module that has to be there, the largest dimension / entry bits the backend
+# is trusted with (None: any), and a function(rows, delta, blocksize) -> rows per algorithm
+BACKENDS = {}
+_available = {}
+
+
+def register_backend(name, module, lll=None, bkz=None, max_dim=None, max_bits=None):
+    """
+    Adds a backend (or replaces the one called name). module is only looked up, not
+    imported, to see whether the backend can run; lll and bkz take (rows, delta, blocksize)
+    with rows a list of lists of ints and return the reduced rows the same way.
+    """
+    BACKENDS[name] = {"module": module, "max_dim": max_dim, "max_bits": max_bits,
+                      "lll": lll, "bkz": bkz}
+    _available.pop(name, None)
+
+
+register_backend("numpy", "numpy", _numpy_lll, _numpy_bkz, max_dim=60, max_bits=26)
+register_backend("fpylll", "fpylll", _fpylll_lll, _fpylll_bkz)
+register_backend("sage", "sage.all", _sage_lll, _sage_bkz)
+
+
+def available_backends():
+    """
+    The names of the registered backends whose module can be imported.
+    """
+    for name, backend in BACKENDS.items():
+        if name not in _available:
+            try:
+                _available[name] = importlib.util.find_spec(backend["module"]) is not None
+            except ImportError:
+                _available[name] = False
+    return [name for name in BACKENDS if _available[name]]
+
+
+def _fits(name, algorithm, dim, bits):
+    backend = BACKENDS[name]
+    return (backend[algorithm] is not None
+            and (backend["max_dim"] is None or dim <= backend["max_dim"])
+            and (backend["max_bits"] is None or bits <= backend["max_bits"]))
+
+
+def _bucket(value, edges):
+    # the smallest edge at or above value, or the largest edge
+    return next((edge for edge in sorted(edges) if value <= edge), max(edges))
+
+
+def _rows(basis):
+    # lists of Python ints from a list of rows, an array, an IntegerMatrix or a QaryLattice
+    if hasattr(basis, "basis"):
+        basis = basis.basis()
+    if hasattr(basis, "nrows"):
+        return [[basis[i, j] for j in range(basis.ncols)] for i in range(basis.nrows)]
+    return [[int(a) for a in row] for row in basis]
+
+
+def _quality(rows):
+    # (RHF, log volume) of a basis. ||b_i*|| = |R_ii| of the QR decomposition of the rows:
+    # Householder QR stays accurate with entries far past where the Gram matrix of
+    # gso_init (and the numpy backend) loses everything to cancellation
+    import numpy as np
+
+    from .instrumentation import root_hermite_factor
+    R = np.linalg.qr(np.array(rows, dtype=float).T, mode="r")
+    profile = [float(x) for x in np.log(np.abs(np.diag(R)))]
+    return root_hermite_factor(profile), sum(profile)
+
+
+def _same_volume(a, b):
+    # log volumes equal up to float noise
+    return abs(a - b) <= 1e-6 * max(1.0, abs(a))
+
+
+def _transform_mod_p(R, T):
+    # U with U R = T modulo _PRIME, lifted to (-p/2, p/2), by Gauss-Jordan on [R^T | T^T];
+    # None if R is not of full row rank mod p. R and T are dtype=object integer arrays
+    import numpy as np
+    p = _PRIME
+    d = R.shape[0]
+    S = np.concatenate([R.T, T.T], axis=1) % p
+    for c in range(d):
+        nz = np.flatnonzero(S[c:, c])
+        if nz.size == 0:
+            return None
+        i = c + nz[0]
+        S[[c, i]] = S[[i, c]]
+        S[c] = S[c] * pow(int(S[c, c]), -1, p) % p
+        f = S[:, c].copy()
+        f[c] = 0
+        S = (S - np.outer(f, S[c])) % p
+    U = S[:d, d:].T
+    return np.where(U > p // 2, U - p, U)
+
+
+def _transform_exact(R, T):
+    # U with U R = T over the integers, or None if there is none: fraction-free (Bareiss)
+    # Gauss-Jordan on [R^T | T^T] over the rationals, which leaves det * U^T in the pivot rows
+    import numpy as np
+    d = R.shape[0]
+    S = [list(row) for row in np.concatenate([R.T, T.T], axis=1)]
+    prev = 1
+    for c in range(d):
+        p = next((k for k in range(c, len(S)) if S[k][c]), None)
+        if p is None:
+            return None
+        S[c], S[p] = S[p], S[c]
+        pivot = S[c][c]
+        for k in range(len(S)):
+            if k != c:
+                f = S[k][c]
+                S[k] = [(pivot * a - f * b) // prev for a, b in zip(S[k], S[c])]
+        prev = pivot
+    if any(a % prev for row in S[:d] for a in row[d:]):
+        return None
+    return np.array([[a // prev for a in row[d:]] for row in S[:d]], dtype=object).T
+
+
+def _same_lattice(rows, reduced):
+    # True if reduced = U rows for an integer U with det U = +-1. U is solved for modulo a
+    # large prime, which is fast, and then checked over the integers; the exact solve is
+    # only the fallback. For an integer U, |det U| is 1 or at least 2, and the float log
+    # volumes are far closer than log 2, so they tell the two apart
+    import numpy as np
+    R = np.array([[int(a) for a in row] for row in rows], dtype=object)
+    T = np.array([[int(a) for a in row] for row in reduced], dtype=object)
+    if R.shape != T.shape:
+        return False
+    U = _transform_mod_p(R, T)
+    if U is None or not np.array_equal(U.dot(R), T):
+        U = _transform_exact(R, T)
+        if U is None or not np.array_equal(U.dot(R), T):
+            return False
+    return _same_volume(_quality(rows)[1], _quality(reduced)[1])
+
+
+def _instance(dim, bits, seed):
+    # the seeded q-ary basis calibrate() times: k = dim / 2, q of `bits` bits
+    import numpy as np
+
+    from .qary import QaryLattice
+    rng = np.random.default_rng([dim, bits, seed])
+    q = 2 ** bits - 1
+    A = rng.integers(0, q, size=(dim - dim // 2, dim // 2))
+    return QaryLattice(A, q).basis().tolist()
+
+
+_calibrations = {}
+
+
+def load_calibration(path=DEFAULT_CALIBRATION, delta=None):
+    """
+    The calibration records in path, [] if there are none (read once per process) or, with
+    delta given, if they were taken at a different delta.
+    """
+    if path not in _calibrations:
+        try:
+            with open(path) as f:
+                calibration = json.load(f)
+            _calibrations[path] = (calibration["delta"], calibration["records"])
+        except (OSError, ValueError, KeyError):
+            _calibrations[path] = (None, [])
+    calibrated_delta, records = _calibrations[path]
+    if delta is not None and calibrated_delta != delta:
+        return []
+    return records
+
+
+def calibrate(path=DEFAULT_CALIBRATION, algorithms=("lll", "bkz"), dims=DIMS, bits=BITS,
+              delta=0.99, blocksize=10, repeats=3, max_seconds=10.0, seed=0, backends=None):
+    """
+    Times every available backend (or those in backends) on _instance(dim, bits, seed)
+    for every algorithm, dimension and bits, and writes the records to path.
+    A record has the best time over `repeats` runs and the RHF reached; a backend that
+    takes over max_seconds in some dimension is not timed in larger ones (nor anywhere
+    its max_dim / max_bits don't allow). BKZ is timed at the one blocksize.
+    Returns the records.
+    """
+    names = [name for name in available_backends() if backends is None or name in backends]
+    records = []
+    for algorithm in algorithms:
+        for b in bits:
+            too_slow = set()
+            for dim in sorted(dims):
+                rows = _instance(dim, b, seed)
+                for name in names:
+                    if name in too_slow or not _fits(name, algorithm, dim, b):
+                        continue
+                    best = float("inf")
+                    for _ in range(repeats):
+                        start = time.perf_counter()
+                        reduced = BACKENDS[name][algorithm](rows, delta, min(blocksize, dim))
+                        best = min(best, time.perf_counter() - start)
+                        if best > max_seconds:
+                            too_slow.add(name)
+                            break
+                    rhf = _quality(reduced)[0]
+                    record = {"algorithm": algorithm, "backend": name, "dim": dim, "bits": b,
+                              "time": best, "rhf": rhf, "ok": _same_lattice(rows, reduced)}
+                    records.append(record)
+                    print(f"{algorithm} {name:8s} dim {dim:4d} bits {b:3d} {best:9.4f}s  "
+                          f"rhf {rhf:.4f}  ok={record['ok']}", flush=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                   "delta": delta, "blocksize": blocksize, "records": records}, f, indent=1)
+    _calibrations[path] = (delta, records)
+    return records
+
+
+def choose_backend(algorithm, dim, bits, max_rhf=None, calibration=DEFAULT_CALIBRATION,
+                   exclude=(), delta=0.99):
+    """
+    The backend reduce() uses for a dim-dimensional basis with bits-bit entries at delta,
+    and how it was picked ("calibrated" or "default"); see the top of the file. A
+    calibration taken at another delta is not used.
+    """
+    names = [name for name in available_backends()
+             if name not in exclude and BACKENDS[name][algorithm] is not None]
+    if not names:
+        raise ImportError(f"no backend available for {algorithm}")
+    # the size limits only give way when nothing else is there
+    names = [name for name in names if _fits(name, algorithm, dim, bits)] or names
+
+    records = load_calibration(calibration, delta)
+    dim_bucket = _bucket(dim, {rec["dim"] for rec in records} or DIMS)
+    bits_bucket = _bucket(bits, {rec["bits"] for rec in records} or BITS)
+    timed = [rec for rec in records
+             if rec["algorithm"] == algorithm and rec["dim"] == dim_bucket
+             and rec["bits"] == bits_bucket and rec["ok"] and rec["backend"] in names]
+    if timed:
+        best_rhf = min(rec["rhf"] for rec in timed)
+        limit = max_rhf if max_rhf is not None else best_rhf + RHF_TOLERANCE
+        # none good enough: the best there is
+        good = [rec for rec in timed if rec["rhf"] <= limit] or [min(timed, key=lambda rec: rec["rhf"])]
+        return min(good, key=lambda rec: rec["time"])["backend"], "calibrated"
+
+    compiled = [name for name in names if name != "numpy"]
+    return (compiled or names)[0], "default"
+
+
+def _run(name, algorithm, rows, delta, blocksize):
+    start = time.perf_counter()
+    reduced = BACKENDS[name][algorithm](rows, delta, blocksize)
+    seconds = time.perf_counter() - start
+    rhf, volume = _quality(reduced)
+    return reduced, {"backend": name, "time": seconds, "rhf": rhf, "volume": volume}
+
+
+def reduce(basis, algorithm="lll", delta=0.99, blocksize=None, backend=None, max_rhf=None,
+           cross_check=None, calibration=DEFAULT_CALIBRATION):
+    """
+    LLL (algorithm="lll") or BKZ ("bkz", blocksize required) on the backend chosen by
+    choose_backend, or on the one named by backend.
+    basis: list of rows, array, IntegerMatrix or QaryLattice.
+    max_rhf: only route to backends that reached this RHF in the calibration.
+    cross_check: True (the next backend choose_backend would pick) or a backend name, to
+    also reduce with that one and raise BackendDisagreement if the results disagree.
+    Returns (basis, report), basis a list of integer numpy arrays and report the backend,
+    how it was chosen, the time it took, the RHF of the result and the cross check.
+    """
+    from .lll_precision import integer_basis
+
+    if algorithm not in ("lll", "bkz"):
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+    if algorithm == "bkz" and blocksize is None:
+        raise ValueError("bkz needs a blocksize")
+    rows = _rows(basis)
+    dim = len(rows)
+    bits = max(abs(a) for row in rows for a in row).bit_length()
+    blocksize = min(blocksize, dim) if blocksize is not None else None
+
+    routed = "forced"
+    if backend is None:
+        backend, routed = choose_backend(algorithm, dim, bits, max_rhf, calibration, delta=delta)
+    reduced, report = _run(backend, algorithm, rows, delta, blocksize)
+    report.update(routed=routed, dim=dim, bits=bits, cross_check=None)
+
+    if cross_check:
+        other = cross_check
+        if other is True:
+            # only a backend within its size limits: a check has to finish to be of any use
+            others = [name for name in available_backends()
+                      if name != backend and _fits(name, algorithm, dim, bits)]
+            if not others:
+                raise ValueError(f"no second backend to cross check {backend} with")
+            exclude = [name for name in BACKENDS if name not in others]
+            other = choose_backend(algorithm, dim, bits, max_rhf, calibration, exclude, delta)[0]
+        checked, check = _run(other, algorithm, rows, delta, blocksize)
+        report["cross_check"] = check
+        for name, result in ((backend, reduced), (other, checked)):
+            if not _same_lattice(rows, result):
+                raise BackendDisagreement(f"{name} returned a basis of a different lattice")
+        if abs(check["rhf"] - report["rhf"]) > RHF_TOLERANCE:
+            raise BackendDisagreement(f"{backend} reached RHF {report['rhf']:.4f}, "
+                                      f"{other} {check['rhf']:.4f}")
+    return list(integer_basis(reduced)), report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the reduction backends.")
+    parser.add_argument("--calibration", default=DEFAULT_CALIBRATION, help="file to write")
+    parser.add_argument("--dims", type=int, nargs="+", default=list(DIMS))
+    parser.add_argument("--bits", type=int, nargs="+", default=list(BITS))
+    parser.add_argument("--delta", type=float, default=0.99)
+    parser.add_argument("--blocksize", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"backends: {', '.join(available_backends())}")
+    calibrate(args.calibration, dims=args.dims, bits=args.bits, delta=args.delta,
+              blocksize=args.blocksize, repeats=args.repeats, max_seconds=args.max_seconds)
+    print(f"\nwritten to {args.calibration}; routing:")
+    for algorithm in ("lll", "bkz"):
+        for b in args.bits:
+            picks = [choose_backend(algorithm, dim, b, calibration=args.calibration, delta=args.delta)[0]
+                     for dim in args.dims]
+            print(f"{algorithm} bits {b:3d}: " + "  ".join(f"{dim}:{name}" for dim, name in zip(args.dims, picks)))
+
+
+if __name__ == "__main__":
+    main()
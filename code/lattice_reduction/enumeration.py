@@ -0,0 +1,357 @@
+# Schnorr-Euchner enumeration on a projected block
+# This is the SVP oracle for BKZ_alg. It never looks at the basis vectors themselves, only at
+# the GSO of the projected block pi_i(b_i), ..., pi_i(b_{h-1}), which BKZ already has:
+#   Mu : the m x m block Mu[i:h, i:h] (only the part below the diagonal is used)
+#   r  : the m squared norms ||b_j*||^2 for j = i..h-1
+# For x in Z^m the projected vector sum_j x_j pi_i(b_j) has squared length
+#   sum_j r_j (x_j - c_j)^2,   c_j = -sum_{l>j} x_l mu_{l,j}
+# so we fix x_{m-1}, x_{m-2}, ... one level at a time (depth first), try the values of x_j
+# in zig-zag order around the centre c_j, and cut a branch as soon as the partial length is
+# over the bound for that level. The result is the integer coefficient vector, so BKZ can
+# build v = sum_j x_j b_j from the full basis and insert it.
+#
+# parallel_enumerate_svp runs the same search on several cores: the top levels of the tree
+# (x_{m-1}, ..., x_{m-t}) are enumerated first, and every node at level m - t inside the
+# bound is the root of a subtree that a worker process searches on its own. The workers
+# share the radius, so a short vector found in one subtree prunes all the others straight
+# away. Processes rather than threads, since the search is pure Python and holds the GIL.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import exp, lgamma, log, pi
+from multiprocessing import Value
+
+import numpy as np
+
+
+def gaussian_heuristic(r):
+    """
+    Expected squared length of the shortest vector of a lattice with GSO norms r:
+    GH^2 = (Gamma(m/2 + 1) * det)^(2/m) / pi, with det = prod_j sqrt(r_j).
+    """
+    m = len(r)
+    log_det = sum(log(float(rj)) for rj in r) / 2
+    return exp(2 * (lgamma(m / 2 + 1) + log_det) / m) / pi
+
+
+def linear_pruning(m):
+    """
+    Linear pruning coefficients: level i (the last m - i coordinates fixed) may use
+    a fraction (m - i) / m of the squared radius. Same convention as fpylll's pruning
+    coefficients, so those can be passed to enumerate_svp as they are.
+    """
+    return [(m - i) / m for i in range(m)]
+
+
+def _enumerate(mut, r, pruning, radius_sq, x, top, stop=0, prefixes=None, shared=None, stats=None):
+    # The enumeration loop on levels top-1 .. stop, with x[top:] fixed (top = m for the
+    # whole tree). With prefixes a list, the nodes at level stop (> 0) that are inside the
+    # bound are appended to it as x[stop:] instead of being searched below: that is how
+    # parallel_enumerate_svp cuts the tree into subtrees. With shared a SharedRadius,
+    # the radius is read from / written to it so that parallel workers prune each other.
+    # With stats a dict, the nodes visited are added to stats["nodes"].
+    m = len(r)
+    bound = [p * radius_sq for p in pruning]
+    dx = [0] * m
+    ddx = [0] * m
+    center = [0.0] * m
+    partdist = [0.0] * (m + 1)
+    # partsums[i][j] = -sum_{l>=j} x_l mu_{l,i}, so center[i] = partsums[i][i+1]; begin[k] is the
+    # highest level whose x changed since the row below k was last brought up to date
+    partsums = [[0.0] * (m + 1) for _ in range(m)]
+    begin = [m - 1] * m
+
+    # the fixed levels: their centres and partial distances, in the same order of
+    # operations as the loop below, so a subtree sees exactly the numbers the whole tree does
+    for k in range(m - 1, top - 1, -1):
+        row = partsums[k]
+        for j in range(m - 1, k, -1):
+            row[j] = row[j + 1] - x[j] * mut[k][j]
+        center[k] = row[k + 1]
+        diff = x[k] - center[k]
+        partdist[k] = partdist[k + 1] + diff * diff * r[k]
+
+    best = None
+    best_sq = radius_sq
+
+    k = top - 1
+    row = partsums[k]
+    for j in range(m - 1, k, -1):
+        row[j] = row[j + 1] - x[j] * mut[k][j]
+    c = row[k + 1]
+    center[k] = c
+    x[k] = round(c)
+    dx[k] = ddx[k] = 1 if c >= x[k] else -1
+    nodes = 0
+    while True:
+        diff = x[k] - center[k]
+        dist = partdist[k + 1] + diff * diff * r[k]
+
+        if dist <= bound[k]:
+            if k > stop:
+                # go one level down
+                partdist[k] = dist
+                row = partsums[k - 1]
+                mu_row = mut[k - 1]
+                for j in range(begin[k], k - 1, -1):
+                    row[j] = row[j + 1] - x[j] * mu_row[j]
+                if begin[k] > begin[k - 1]:
+                    begin[k - 1] = begin[k]
+                begin[k] = k
+
+                k -= 1
+                c = row[k + 1]
+                center[k] = c
+                x[k] = round(c)
+                dx[k] = ddx[k] = 1 if c >= x[k] else -1
+                continue
+
+            if prefixes is not None:
+                prefixes.append(x[k:])
+            elif dist > 0:
+                # a shorter vector: keep it and shrink every level bound with the radius
+                best = list(x)
+                best_sq = dist
+                bound = [p * dist for p in pruning]
+                if shared is not None:
+                    shared.lower(dist)
+        else:
+            # over the bound, go back up
+            k += 1
+            if k == top:
+                break
+
+        # every so often pick up a radius another worker found
+        nodes += 1
+        if shared is not None and nodes & 1023 == 0:
+            radius = shared.value()
+            if radius < best_sq:
+                best_sq = radius
+                bound = [p * radius for p in pruning]
+
+        # next value of x_k: zig-zag around the centre, or only upwards while every
+        # higher coordinate is zero (so v and -v are not both visited)
+        if partdist[k + 1] != 0.0:
+            x[k] += dx[k]
+            ddx[k] = -ddx[k]
+            dx[k] = ddx[k] - dx[k]
+        else:
+            x[k] += 1
+
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + nodes
+    if best is None:
+        return None
+    return best, best_sq
+
+
+def _setup(Mu, r, radius_sq, pruning, gh_factor):
+    # the float lists the enumeration loop works on
+    m = len(r)
+    r = [float(rj) for rj in r]
+    # mut[i][j] = mu_{j,i}: the coefficients feeding the centre of level i
+    mut = [[float(Mu[j][i]) if j > i else 0.0 for j in range(m)] for i in range(m)]
+    if radius_sq is None:
+        radius_sq = min(r[0], gh_factor * gaussian_heuristic(r))
+    if pruning is None:
+        pruning = [1.0] * m
+    return mut, r, list(pruning), radius_sq
+
+
+def enumerate_svp(Mu, r, radius_sq=None, pruning=None, gh_factor=1.1, stats=None):
+    """
+    Finds the shortest nonzero vector of the projected block with GSO (Mu, r).
+    radius_sq:  initial squared search radius. By default min(r[0], gh_factor * GH^2),
+                the Gaussian heuristic bound of BKZ 2.0; r[0] is always reachable with x = e_0.
+    pruning:    optional coefficients p_0 = 1 >= p_1 >= ... (e.g. linear_pruning(m) or
+                the extreme-pruning coefficients from fpylll's Pruner); level i is cut at
+                p_i times the current squared radius.
+    stats:      optional dict; the number of nodes visited is added to stats["nodes"].
+    Returns (x, norm_sq) with x the integer coefficients of the block vector and norm_sq
+    its squared projected length, or None if nothing lies inside the radius.
+    """
+    mut, r, pruning, radius_sq = _setup(Mu, r, radius_sq, pruning, gh_factor)
+    m = len(r)
+    return _enumerate(mut, r, pruning, radius_sq, [0] * m, m, stats=stats)
+
+
+# below this block size a search takes less time than handing it to the workers
+PARALLEL_MIN_DIM = 30
+
+
+class SharedRadius:
+    """
+    The current squared radius, in shared memory so every worker of an EnumerationPool
+    sees it. Only ever goes down during a search.
+    """
+
+    def __init__(self):
+        self.radius = Value("d", 0.0)
+
+    def value(self):
+        return self.radius.value
+
+    def reset(self, radius_sq):
+        self.radius.value = radius_sq
+
+    def lower(self, radius_sq):
+        with self.radius.get_lock():
+            if radius_sq < self.radius.value:
+                self.radius.value = radius_sq
+
+
+# the SharedRadius of the pool this worker process belongs to
+_worker_radius = None
+
+
+def _init_worker(shared):
+    global _worker_radius
+    _worker_radius = shared
+
+
+class EnumerationPool:
+    """
+    Worker processes for parallel_enumerate_svp, with their shared radius. Start one per
+    run (BKZ_alg does, with workers > 1) instead of one per SVP call: starting the
+    processes costs more than a small enumeration. One search at a time per pool.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count()
+        self.radius = SharedRadius()
+        self.executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                            initargs=(self.radius,))
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def split_tree(mut, r, pruning, radius_sq, depth, stats=None):
+    """
+    The roots of the subtrees at depth `depth`: every x[m-depth:] inside the bound, in the
+    order the serial enumeration visits them.
+    """
+    m = len(r)
+    prefixes = []
+    _enumerate(mut, r, pruning, radius_sq, [0] * m, m, stop=m - depth, prefixes=prefixes, stats=stats)
+    return prefixes
+
+
+def _search_subtrees(mut, r, pruning, radius_sq, top, chunk, share):
+    # worker side: the subtrees of one chunk, in order, each starting from the best radius
+    # so far. Returns ((index, x, norm_sq) of the last shortest vector found, or None,
+    # and the number of nodes visited)
+    shared = _worker_radius if share else None
+    best = None
+    stats = {"nodes": 0}
+    for index, prefix in chunk:
+        if shared is not None:
+            radius_sq = min(radius_sq, shared.value())
+        result = _enumerate(mut, r, pruning, radius_sq, [0] * top + prefix, top, shared=shared,
+                            stats=stats)
+        if result is not None:
+            best = (index, result[0], result[1])
+            radius_sq = result[1]
+    return best, stats["nodes"]
+
+
+def parallel_enumerate_svp(Mu, r, radius_sq=None, pruning=None, gh_factor=1.1, pool=None,
+                           workers=None, split_depth=None, deterministic=False, stats=None):
+    """
+    enumerate_svp with the search tree split over the processes of pool (an EnumerationPool;
+    without one, a pool of `workers` processes is started for this call only).
+    split_depth:    number of top levels enumerated before splitting. By default the
+                    smallest depth that gives at least 16 subtrees per worker, so that the
+                    work evens out over the workers
+    deterministic:  the workers don't share the radius, each subtree is searched with its
+                    own. Without pruning the result is then exactly the one enumerate_svp
+                    returns (same vector, also when several are equally short), whatever
+                    the number of workers or their timing; it costs the pruning the workers
+                    would have done for each other.
+    With a shared radius the length found is the same, but which of several equally short
+    vectors comes back can depend on the timing.
+    stats: optional dict, as for enumerate_svp (the nodes of all workers are added up).
+    """
+    mut, r, pruning, radius_sq = _setup(Mu, r, radius_sq, pruning, gh_factor)
+    m = len(r)
+    if pool is None:
+        with EnumerationPool(workers) as pool:
+            return parallel_enumerate_svp(Mu, r, radius_sq, pruning, gh_factor, pool,
+                                          split_depth=split_depth, deterministic=deterministic,
+                                          stats=stats)
+    if m < PARALLEL_MIN_DIM or pool.workers < 2:
+        return _enumerate(mut, r, pruning, radius_sq, [0] * m, m, stats=stats)
+
+    # only the walk to the prefixes actually split at counts: the shallower ones are tried
+    # and thrown away
+    depth = split_depth or 1
+    walk = {"nodes": 0}
+    prefixes = split_tree(mut, r, pruning, radius_sq, depth, walk)
+    while split_depth is None and len(prefixes) < 16 * pool.workers and depth < m // 2:
+        depth += 1
+        walk = {"nodes": 0}
+        prefixes = split_tree(mut, r, pruning, radius_sq, depth, walk)
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + walk["nodes"]
+    if not prefixes:
+        return None
+
+    # neighbouring subtrees cost about the same (the first ones, closest to the centres,
+    # the most), so deal them out round robin, a few chunks per worker
+    n_chunks = min(len(prefixes), 4 * pool.workers)
+    indexed = list(enumerate(prefixes))
+    pool.radius.reset(radius_sq)
+    futures = [pool.executor.submit(_search_subtrees, mut, r, pruning, radius_sq, m - depth,
+                                    indexed[c::n_chunks], not deterministic)
+               for c in range(n_chunks)]
+
+    # the shortest; among equally short ones the last in serial order, like enumerate_svp
+    best = None
+    for future in futures:
+        result, nodes = future.result()
+        if stats is not None:
+            stats["nodes"] = stats.get("nodes", 0) + nodes
+        if result is not None and (best is None or result[2] < best[2]
+                                   or (result[2] == best[2] and result[0] > best[0])):
+            best = result
+    if best is None:
+        return None
+    return best[1], best[2]
+
+
+def fpylll_enumerate_svp(Mu, r, radius_sq=None, gh_factor=1.1, stats=None):
+    """
+    Same contract as enumerate_svp (no pruning, stats counts fplll's nodes), with fplll's enumeration doing the search.
+    fplll wants an integer basis, so the block is written out in GSO coordinates
+    (rows Mu[j] * sqrt(r)), scaled up to about 2^30 and rounded: the coefficients found are
+    those of the block itself, and the rounding error is far below the gaps between
+    vector lengths that matter to BKZ.
+    """
+    # fpylll is imported here, on first use: the rest of this module needs NumPy only
+    from fpylll import GSO, Enumeration, EnumerationError, IntegerMatrix
+
+    m = len(r)
+    r = np.asarray(r, dtype=float)
+    L = np.asarray(Mu, dtype=float) * np.sqrt(r)
+    # keep the largest entry well inside int64 even when Mu is far from size-reduced
+    scale = min(2.0 ** 30 / np.sqrt(r.max()), 2.0 ** 60 / np.abs(L).max())
+    M = GSO.Mat(IntegerMatrix.from_matrix(np.rint(L * scale).astype(np.int64).tolist()))
+    M.update_gso()
+
+    if radius_sq is None:
+        radius_sq = min(r[0], gh_factor * gaussian_heuristic(r))
+    enum = Enumeration(M)
+    try:
+        dist, x = enum.enumerate(0, m, radius_sq * scale ** 2, 0)[0]
+    except EnumerationError:
+        return None
+    finally:
+        if stats is not None:
+            stats["nodes"] = stats.get("nodes", 0) + enum.get_nodes()
+    return [int(round(c)) for c in x], dist / scale ** 2
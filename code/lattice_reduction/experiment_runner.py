@@ -0,0 +1,264 @@
+# Parallel experiment runner for the BKZ 2.0 vs. proposed-algorithm comparison
+# bkz_comparison.py times one (dimension, block size) pair. For the actual experiments we
+# sweep dimensions, block sizes, seeds and algorithms, so this spreads the jobs over a
+# process pool and appends one JSON line per finished job to a results file.
+#   - every job is a small dict (instance kind, dim, seed, algorithm, block size), and the
+#     worker builds its own IntegerMatrix from it, so no basis is ever pickled between
+#     processes; only the numbers come back
+#   - the results file is append-only, and a rerun skips every job already in it, so an
+#     interrupted sweep just carries on
+#
+# Grid spec (a dict, or a JSON file with the same keys):
+#   {"instances": [{"kind": "qary", "bits": 20}],   # or {"kind": "darmstadt"}
+#    "dims": [40, 50, 60],
+#    "blocksizes": [20, 30, 40],
+#    "seeds": [0, 1, 2],
+#    "algorithms": ["bkz2", "self_dual", "bkz_alg", "recursive", "progressive"],
+#    "max_loops": 8}
+# Every algorithm runs at delta = DELTA, the default of fpylll's BKZ.Param that the bkz2 and
+# self_dual jobs use.
+#
+# Usage:
+#   python -m lattice_reduction.experiment_runner grid.json results.jsonl --workers 8
+#   python -m lattice_reduction.experiment_runner grid.json results.jsonl --cache ~/.cache/lattice_reductions
+# --cache keeps the bkz2 results in a result cache (result_cache.py): reruns get them from
+# disk, and a larger block size starts from the largest smaller one already reduced (so its
+# time is only the extra tours; leave it off when the timings are what you are after)
+#   python -m lattice_reduction.experiment_runner grid.json results.jsonl --target-gh-factor 1.05
+# --target-gh-factor first runs the BKZ simulator (simulator.py) on every job and drops the
+# ones predicted not to reach ||b_0|| <= factor * GH(L) in their block size and max_loops
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+# fpylll, NumPy and the algorithms are imported by the functions that run the jobs (in the
+# workers), so expand_grid / load_done and the rest of the bookkeeping work without them
+
+# LLL/BKZ delta for our algorithms, the same as fpylll's BKZ.Param uses for bkz2 and self_dual
+DELTA = 0.99
+
+
+def expand_grid(spec):
+    """
+    Turns a grid spec into the list of job dicts, in a fixed order.
+    """
+    jobs = []
+    for inst, dim, seed, blocksize, algorithm in product(
+            spec["instances"], spec["dims"], spec.get("seeds", [0]),
+            spec["blocksizes"], spec["algorithms"]):
+        if blocksize > dim:
+            continue
+        job = dict(inst)
+        job.update(dim=dim, seed=seed, blocksize=blocksize, algorithm=algorithm,
+                   max_loops=spec.get("max_loops", 8))
+        jobs.append(job)
+    return jobs
+
+
+def job_key(job):
+    # the identity of a job in the results file
+    return json.dumps(job, sort_keys=True)
+
+
+def load_done(path):
+    """
+    Keys of the jobs that already have a successful result in the results file.
+    A half-written last line (from an interrupted run) is ignored.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "error" not in record:
+                done.add(job_key(record["job"]))
+    return done
+
+
+# Per-process cache of generated/downloaded instances: a worker usually gets several jobs
+# on the same lattice (different algorithms and block sizes), and only needs to build it once
+_instances = {}
+
+
+def build_instance(job):
+    """
+    The IntegerMatrix for a job, built inside the worker. Returns a fresh copy each time.
+    """
+    from fpylll import FPLLL, IntegerMatrix
+
+    key = (job["kind"], job["dim"], job["seed"], job.get("bits"))
+    if key not in _instances:
+        if job["kind"] == "qary":
+            FPLLL.set_random_seed(job["seed"])
+            mat = IntegerMatrix.random(job["dim"], "qary", k=job["dim"] // 2, bits=job.get("bits", 20))
+        elif job["kind"] == "darmstadt":
+            from .darmstadtchallengepull import load_darmstadt_challenge
+            mat = load_darmstadt_challenge(job["dim"])
+            if mat is None:
+                raise RuntimeError(f"could not load Darmstadt challenge {job['dim']}")
+        else:
+            raise ValueError(f"unknown instance kind {job['kind']!r}")
+        _instances[key] = mat
+    return IntegerMatrix(_instances[key])
+
+
+def _to_rows(mat):
+    return [[mat[i, j] for j in range(mat.ncols)] for i in range(mat.nrows)]
+
+
+def _lll_arrays(mat):
+    # LLL into the engine arrays, float or (entries past 2^53, as the larger Darmstadt
+    # challenges have) exact, as LLL_alg / BKZ_alg route (lll_precision.lll_arrays)
+    from .lll_precision import lll_arrays
+    return lll_arrays(_to_rows(mat), DELTA)[:3]
+
+
+def _to_matrix(B):
+    # back through Python ints: an exact basis can be past int64
+    from fpylll import IntegerMatrix
+    return IntegerMatrix.from_matrix([[int(round(v)) for v in row] for row in B])
+
+
+def _run_bkz_alg(mat, blocksize, max_loops):
+    # our BKZ_alg, on the engine arrays directly so that we get the tour count back
+    from .bkz import find_shortest_vector, scaled_oracle
+    from .bkz_engine import bkz_reduce
+    B, Mu, r = _lll_arrays(mat)
+    tours = bkz_reduce(B, Mu, r, blocksize, scaled_oracle(find_shortest_vector), DELTA, max_tours=max_loops)
+    return _to_matrix(B), tours
+
+
+def _run_recursive(mat, blocksize, max_loops):
+    # the recursive framework with base rank = blocksize and one round per "tour"
+    from .bkz import scaled_oracle
+    from .recursive_reduction import fpylll_oracle, make_aux, recursive_reduce
+    B, Mu, r = _lll_arrays(mat)
+    report = recursive_reduce(B, Mu, r, scaled_oracle(fpylll_oracle), make_aux(blocksize, rounds=max_loops), DELTA)
+    return _to_matrix(B), report["tours"]
+
+
+def _run_progressive(mat, blocksize, max_loops):
+    # progressive BKZ up to blocksize with fplll's enumeration, at most max_loops tours per block size
+    from .bkz import scaled_oracle
+    from .progressive import default_schedule, progressive_bkz
+    from .recursive_reduction import fpylll_oracle
+    B, Mu, r = _lll_arrays(mat)
+    report = progressive_bkz(B, Mu, r, default_schedule(blocksize), scaled_oracle(fpylll_oracle), DELTA,
+                             max_tours=max_loops)
+    return _to_matrix(B), report["tours"]
+
+
+def run_job(job, cache_dir=None):
+    """
+    Runs one job in a worker process and returns its result record (numbers only).
+    cache_dir: result cache for the bkz2 jobs, or None.
+    """
+    from fpylll import GSO, IntegerMatrix
+
+    from .instrumentation import root_hermite_factor
+    from .simulator import initial_profile
+
+    try:
+        mat = build_instance(job)
+        start = time.perf_counter()
+        if job["algorithm"] == "bkz2":
+            from .bkz_comparison import run_bkz2
+            tours = run_bkz2(mat, job["blocksize"], job["max_loops"], cache_dir=cache_dir)
+        elif job["algorithm"] == "self_dual":
+            from .block_update import self_dual_bkz
+            tours = self_dual_bkz(mat, job["blocksize"], job["max_loops"])
+        elif job["algorithm"] == "bkz_alg":
+            mat, tours = _run_bkz_alg(mat, job["blocksize"], job["max_loops"])
+        elif job["algorithm"] == "recursive":
+            mat, tours = _run_recursive(mat, job["blocksize"], job["max_loops"])
+        elif job["algorithm"] == "progressive":
+            mat, tours = _run_progressive(mat, job["blocksize"], job["max_loops"])
+        else:
+            raise ValueError(f"unknown algorithm {job['algorithm']!r}")
+        elapsed = time.perf_counter() - start
+
+        return {"job": job, "time": elapsed, "norm": mat[0].norm(),
+                "rhf": root_hermite_factor(initial_profile(GSO.Mat(IntegerMatrix(mat)))),
+                "tours": tours}
+    except Exception as e:
+        return {"job": job, "error": f"{type(e).__name__}: {e}"}
+
+
+def screen_jobs(jobs, target_gh_factor):
+    """
+    Splits jobs into those the BKZ simulator predicts reach ||b_0|| <= target_gh_factor * GH(L)
+    (BKZ with the job's block size, at most max_loops tours, from the LLL-reduced instance)
+    and the hopeless rest. Each instance is built and LLL-reduced once, here.
+    Returns (kept, dropped).
+    """
+    from fpylll import GSO, LLL
+
+    from .simulator import initial_profile, log_gh, simulate
+
+    kept, dropped = [], []
+    profiles = {}
+    for job in jobs:
+        key = (job["kind"], job["dim"], job["seed"], job.get("bits"))
+        if key not in profiles:
+            profiles[key] = initial_profile(GSO.Mat(LLL.reduction(build_instance(job))))
+        profile = profiles[key]
+        d = len(profile)
+        log_target = math.log(target_gh_factor) + sum(profile) / d + log_gh(d)
+        prediction = simulate(profile, job["blocksize"], job["max_loops"])
+        (kept if math.log(prediction["norm"]) <= log_target else dropped).append(job)
+    return kept, dropped
+
+
+def run_grid(spec, out_path, workers=None, cache_dir=None, target_gh_factor=None):
+    """
+    Runs every job of the grid that is not already in out_path, on a pool of `workers`
+    processes, appending each result to out_path as soon as it arrives.
+    target_gh_factor: if given, jobs screen_jobs deems hopeless are left out.
+    Returns the number of jobs run.
+    """
+    done = load_done(out_path)
+    todo = [job for job in expand_grid(spec) if job_key(job) not in done]
+    if target_gh_factor is not None:
+        todo, dropped = screen_jobs(todo, target_gh_factor)
+        print(f"{len(dropped)} jobs dropped: predicted to miss {target_gh_factor} * GH")
+    print(f"{len(todo)} jobs to run, {len(done)} already recorded in {out_path}")
+
+    with open(out_path, "a") as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_job, job, cache_dir) for job in todo]
+        for n, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            # one line per job, flushed straight away so a kill loses at most that line
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+
+            job = record["job"]
+            status = record.get("error") or f"{record['time']:.2f}s, norm {record['norm']:.1f}"
+            print(f"[{n}/{len(todo)}] {job['algorithm']} dim={job['dim']} "
+                  f"beta={job['blocksize']} seed={job['seed']}: {status}")
+
+    return len(todo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a BKZ comparison sweep in parallel.")
+    parser.add_argument("grid", help="JSON grid spec")
+    parser.add_argument("results", help="JSONL results file (appended to, and used to resume)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--cache", default=None, help="result cache directory for the bkz2 jobs")
+    parser.add_argument("--target-gh-factor", type=float, default=None,
+                        help="skip jobs the BKZ simulator predicts won't reach this multiple of GH")
+    args = parser.parse_args()
+
+    with open(args.grid) as f:
+        grid = json.load(f)
+    run_grid(grid, args.results, args.workers, args.cache, args.target_gh_factor)
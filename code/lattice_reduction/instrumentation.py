@@ -0,0 +1,142 @@
+# Instrumentation for LLL and BKZ runs
+# Every LLL pass and every BKZ tour can report an event to a hook: a plain function that
+# takes one dict. Nothing here is computed unless a hook is attached; without one the
+# reduction code only keeps a few integer counters and timers it needs anyway.
+#
+# An event looks like
+#   {"phase": "tour",            # "lll" or "tour"
+#    "index": 3,                 # tour number (1, 2, ...), 0 for the LLL pass
+#    "profile": [...],           # log ||b_i*|| for i = 0..d-1
+#    "slope": -0.031,            # GSA slope: least squares slope of the profile
+#    "rhf": 1.0123,              # root Hermite factor ||b_0|| / vol(L)^(1/d), to the 1/d
+#    "swaps": 12, "size_reductions": 40, "oracle_calls": 59, "insertions": 7,
+#    "time": 0.84,               # wall time of the pass/tour
+#    "oracle_time": 0.71, "insert_time": 0.01, "lll_time": 0.11}   # tour phases
+# The profile is computed from the same r = ||b_i*||^2 array for our code and from
+# GSO.Mat.r() for fpylll, so the two can be lined up directly (see bkz_comparison.run_bkz2).
+#
+# Usage:
+#   log = EventLog()
+#   BKZ_alg(basis, 20, hook=log)
+#   for event in log:
+#       print(event["index"], event["slope"], event["oracle_time"])
+
+import json
+from fractions import Fraction
+from math import exp, log
+from time import perf_counter
+
+import numpy as np
+
+from .lll_engine import lll_reduce
+
+
+def new_stats():
+    """
+    Zeroed counters for one LLL pass or BKZ tour, filled in by lll_reduce and bkz_tour.
+    """
+    return {"swaps": 0, "size_reductions": 0, "oracle_calls": 0, "insertions": 0,
+            "time": 0.0, "oracle_time": 0.0, "insert_time": 0.0, "lll_time": 0.0}
+
+
+def gso_profile(r):
+    """
+    log ||b_i*|| for every i, from the squared norms r[i] = ||b_i*||^2.
+    r can be longdouble or Fractions (lll_precision.py), past the range of a float.
+    """
+    return [_log(ri) / 2 for ri in r]
+
+
+def _log(x):
+    if isinstance(x, Fraction):
+        return log(x.numerator) - log(x.denominator)
+    return float(np.log(x))
+
+
+def gsa_slope(profile):
+    """
+    Least squares slope of the profile against i. Under the geometric series assumption
+    log ||b_i*|| is a straight line, and the better reduced the basis, the flatter it is.
+    """
+    d = len(profile)
+    if d < 2:
+        return 0.0
+    mean_i = (d - 1) / 2
+    mean_p = sum(profile) / d
+    num = sum((i - mean_i) * (p - mean_p) for i, p in enumerate(profile))
+    den = sum((i - mean_i) ** 2 for i in range(d))
+    return num / den
+
+
+def root_hermite_factor(profile):
+    """
+    (||b_0|| / vol(L)^(1/d))^(1/d), with log vol(L) = sum_i log ||b_i*|| and ||b_0|| = ||b_0*||.
+    """
+    d = len(profile)
+    return exp((profile[0] - sum(profile) / d) / d)
+
+
+def make_event(phase, index, r, stats):
+    """
+    Builds the event dict for one pass/tour from the GSO norms r and its counters.
+    """
+    profile = gso_profile(r)
+    event = {"phase": phase, "index": index, "profile": profile,
+             "slope": gsa_slope(profile), "rhf": root_hermite_factor(profile)}
+    event.update(stats)
+    return event
+
+
+def lll_pass(B, Mu, r, delta=0.75, hook=None, reduce=lll_reduce):
+    """
+    lll_reduce on the whole basis, reporting one "lll" event to hook if there is one.
+    reduce: the LLL to run instead, with lll_reduce's arguments (see deep_lll.py).
+    Returns the number of swaps.
+    """
+    if hook is None:
+        return reduce(B, Mu, r, delta)
+    stats = new_stats()
+    start = perf_counter()
+    swaps = reduce(B, Mu, r, delta, stats=stats)
+    stats["time"] = perf_counter() - start
+    hook(make_event("lll", 0, r, stats))
+    return swaps
+
+
+class EventLog:
+    """
+    A hook that keeps every event, in order. Iterate over it, or index it like a list.
+    Pass a file path to also append each event to a JSON lines file as it arrives.
+    """
+
+    def __init__(self, path=None):
+        self.events = []
+        self.path = path
+
+    def __call__(self, event):
+        self.events.append(event)
+        if self.path is not None:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(event) + "\n")
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __getitem__(self, i):
+        return self.events[i]
+
+    def column(self, key):
+        # one field across all events, e.g. log.column("slope")
+        return [event.get(key) for event in self.events]
+
+
+def print_event(event):
+    """
+    A hook that prints one line per event, a drop-in for the old "Starting Tour" prints.
+    """
+    print(f"{event['phase']} {event['index']}: slope {event['slope']:.5f}, "
+          f"rhf {event['rhf']:.5f}, swaps {event['swaps']}, "
+          f"oracle calls {event['oracle_calls']}, {event['time']:.3f}s")
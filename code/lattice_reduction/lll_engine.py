@@ -0,0 +1,214 @@
+# Incremental GSO engine for LLL
+# The basis, the GSO coefficients Mu and the squared norms r[i] = ||b_i*||^2 all
+# live in preallocated numpy arrays, and every step of LLL updates them in place
+# instead of rebuilding the Gram-Schmidt vectors from scratch.
+#   B  : d x n basis, one basis vector per row
+#   Mu : d x d, lower triangular with Mu[i, i] = 1, Mu[i, j] = <b_i, b_j*> / ||b_j*||^2
+#   r  : length d, r[i] = ||b_i*||^2
+# A swap is the standard O(d) rank-2 update (Cohen, Algorithm 2.6.3), and size reduction
+# of a whole row is a single vectorised update of b_k and Mu[k] once the integer
+# coefficients have been found.
+# B can be a float array (as LLL_alg uses it) or an exact integer array (int64 or
+# dtype=object holding Python ints), and Mu/r can be float64, longdouble or
+# dtype=object holding Fractions, see lll_precision.py.
+# T (optional, in size_reduce_row / swap_rows / lll_reduce and bkz_engine's insertions) is
+# an array with a row per basis vector that gets the same integer row operations as B; start
+# it from the identity and it records the unimodular transform (recursive_reduction.py).
+# numpy wraps int64 products around silently, so on an int64 B every product of basis rows
+# is bounded first (in floats, from the absolute values) and IntegerOverflow is raised
+# before anything is written when the result might not fit; the caller then carries on
+# with dtype=object.
+
+from fractions import Fraction
+
+import numpy as np
+
+# elementwise int -> Fraction, for the exact rational GSO
+_to_fraction = np.frompyfunc(Fraction, 1, 1)
+
+# largest magnitude an int64 result is allowed to reach (2^63 less a margin for the
+# rounding of the float bound)
+_INT64_LIMIT = 2.0 ** 62
+
+
+class IntegerOverflow(OverflowError):
+    # raised when an int64 basis operation could overflow
+    pass
+
+
+def _int_product(a, b, extra=0.0):
+    # a @ b, for an int64 b checking first that |a| @ |b| (+ extra) stays within int64
+    if b.dtype.kind == "i":
+        bound = np.abs(a).astype(float) @ np.abs(b).astype(float) + extra
+        if np.max(bound, initial=0.0) > _INT64_LIMIT:
+            raise IntegerOverflow("int64 basis arithmetic would overflow")
+    return a @ b
+
+
+def _as_gso(G, dtype):
+    # converts exact Gram entries into the arithmetic used for Mu and r
+    if np.dtype(dtype) == object:
+        return _to_fraction(G)
+    return G.astype(dtype)
+
+
+def gso_alloc(d, dtype=float):
+    """
+    Allocates an empty Mu (d x d) and r (length d) in the given arithmetic.
+    """
+    Mu = np.zeros((d, d), dtype=dtype)
+    r = np.zeros(d, dtype=dtype)
+    if Mu.dtype == object:
+        Mu[:] = Fraction(0)
+        r[:] = Fraction(0)
+    return Mu, r
+
+
+def gso_init(B, dtype=float):
+    """
+    Allocates Mu and r for the basis B and fills them in.
+    Returns (Mu, r).
+    """
+    d = B.shape[0]
+    Mu, r = gso_alloc(d, dtype)
+    gso_update(B, Mu, r, 0, d)
+    return Mu, r
+
+
+def gso_update(B, Mu, r, start=0, end=None):
+    """
+    Recomputes the GSO columns start..end-1 from the basis: r[start:end] and
+    Mu[i, j] for start <= j < end and every row i > j.
+    Columns before start must already be correct. This is the only place where the
+    GSO is rebuilt from the basis, everything else is an incremental update.
+    """
+    d = B.shape[0]
+    if end is None:
+        end = d
+    if start >= end:
+        return
+
+    # Gram entries <b_i, b_j> for i >= start, j in [start, end), one matrix product
+    G = _as_gso(_int_product(B[start:], B[start:end].T), Mu.dtype)
+
+    # Left-looking Cholesky on the Gram matrix: column j only needs columns < j
+    for j in range(start, end):
+        # r_j = <b_j, b_j> - sum_{l<j} mu_{j,l}^2 r_l
+        r[j] = G[j - start, j - start] - np.dot(Mu[j, :j] ** 2, r[:j])
+        Mu[j, j] = 1
+        if j + 1 < d:
+            # mu_{i,j} = (<b_i, b_j> - sum_{l<j} mu_{i,l} mu_{j,l} r_l) / r_j, for all i > j at once
+            Mu[j + 1:, j] = (G[j + 1 - start:, j - start] - (Mu[j + 1:, :j] * r[:j]) @ Mu[j, :j]) / r[j]
+
+
+def gso_row(B, Mu, r, k):
+    """
+    Recomputes row k of the GSO (Mu[k, :k] and r[k]) from the basis, assuming
+    rows 0..k-1 are correct. Used to refresh b_k after it was size-reduced with
+    an inexact Mu, so that rounding errors do not build up.
+    """
+    g = _as_gso(_int_product(B[:k + 1], B[k]), Mu.dtype)
+    for j in range(k):
+        Mu[k, j] = (g[j] - np.dot(Mu[j, :j] * r[:j], Mu[k, :j])) / r[j]
+    r[k] = g[k] - np.dot(Mu[k, :k] ** 2, r[:k])
+
+
+def size_reduce_row(B, Mu, k, start=0, T=None):
+    """
+    Size-reduces b_k against b_start, ..., b_{k-1} so that |mu_{k,j}| <= 1/2.
+    The integer coefficients are found by back substitution on Mu (cheap, scalar),
+    then b_k and Mu[k] are updated with one vectorised operation each.
+    Returns True if b_k changed.
+    """
+    mu = Mu[k, start:k]
+    big = np.flatnonzero(np.abs(mu) > 0.5)
+    if big.size == 0:
+        return False
+
+    # Coefficients x_j = round(mu_{k,j} - sum_{l>j} x_l mu_{l,j}), from the top down.
+    # Everything above the largest offending index is zero already.
+    # round() gives exact Python ints for float, longdouble and Fraction alike.
+    top = start + big[-1]
+    coeffs = [0] * (k - start)
+    x = np.zeros(k - start, dtype=Mu.dtype)
+    for j in range(top, start - 1, -1):
+        c = round(Mu[k, j] - np.dot(x[j + 1 - start:top + 1 - start], Mu[j + 1:top + 1, j]))
+        coeffs[j - start] = c
+        x[j - start] = c
+
+    if not any(coeffs):
+        return False
+
+    # b_k = b_k - sum_j x_j b_j  and  mu_k = mu_k - sum_j x_j mu_j (Mu has a unit diagonal)
+    B[k] -= _int_product(np.array(coeffs, dtype=B.dtype), B[start:k],
+                         np.abs(B[k]).astype(float) if B.dtype.kind == "i" else 0.0)
+    if T is not None:
+        T[k] -= np.array(coeffs, dtype=T.dtype) @ T[start:k]
+    Mu[k, :k] -= x @ Mu[start:k, :k]
+    return True
+
+
+def swap_rows(B, Mu, r, k, T=None):
+    """
+    Swaps b_{k-1} and b_k and applies the rank-2 update to Mu and r in O(d).
+    """
+    mu = Mu[k, k - 1]
+    r_new = r[k] + mu * mu * r[k - 1]
+
+    # swap the basis rows and the already known coefficients to the left of the pair
+    B[[k - 1, k]] = B[[k, k - 1]]
+    Mu[[k - 1, k], :k - 1] = Mu[[k, k - 1], :k - 1]
+    if T is not None:
+        T[[k - 1, k]] = T[[k, k - 1]]
+
+    # the 2 x 2 block and the two norms
+    Mu[k, k - 1] = mu * r[k - 1] / r_new
+    r[k] = r[k - 1] * r[k] / r_new
+    r[k - 1] = r_new
+
+    # every later row sees the pair (b_{k-1}*, b_k*) rotated
+    t = Mu[k + 1:, k].copy()
+    Mu[k + 1:, k] = Mu[k + 1:, k - 1] - mu * t
+    Mu[k + 1:, k - 1] = t + Mu[k, k - 1] * Mu[k + 1:, k]
+
+
+def lovasz_holds(Mu, r, k, delta):
+    # ||b_k*||^2 >= (delta - mu_{k,k-1}^2) ||b_{k-1}*||^2
+    # (a float delta would turn a Fraction r into a float, which can overflow)
+    if Mu.dtype == object:
+        delta = Fraction(delta)
+    return r[k] >= (delta - Mu[k, k - 1] ** 2) * r[k - 1]
+
+
+def lll_reduce(B, Mu, r, delta=0.75, start=0, end=None, stats=None, T=None):
+    """
+    LLL-reduces the rows start..end-1 of B in place, keeping Mu and r valid for
+    every row of the basis (rows after end only see the swap updates).
+    Rows are size-reduced against all earlier rows, as in the full LLL.
+    stats: optional counters dict (see instrumentation.py), swaps and size reductions
+    are added to it.
+    Returns the number of swaps.
+    """
+    d = B.shape[0]
+    if end is None:
+        end = d
+
+    swaps = 0
+    reductions = 0
+    k = start + 1
+    while k < end:
+        if size_reduce_row(B, Mu, k, T=T):
+            reductions += 1
+
+        if lovasz_holds(Mu, r, k, delta):
+            k += 1
+        else:
+            swap_rows(B, Mu, r, k, T)
+            swaps += 1
+            # Return to the previous index to re-check the swapped vectors
+            k = max(start + 1, k - 1)
+
+    if stats is not None:
+        stats["swaps"] += swaps
+        stats["size_reductions"] += reductions
+    return swaps
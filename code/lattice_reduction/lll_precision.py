@@ -0,0 +1,213 @@
+# Precision-adaptive LLL, in the style of L^2 / fplll
+# LLL_alg works on float rows, which is fine for the toy bases but silently wrong once the
+# entries go past 2^53 (the Darmstadt challenge matrices do). Here the basis is always kept
+# as exact integers, and only the GSO (Mu and ||b_i*||^2) is approximated. We start with
+# the cheapest arithmetic, and move up a level as soon as we see that it can't be trusted:
+#   double      -> numpy float64
+#   longdouble  -> numpy longdouble (80-bit extended on x86)
+#   rational    -> Python Fractions, exact, slow but always correct
+# The integer basis stays a valid basis of the same lattice whatever happens to the GSO,
+# so moving up a level just carries on from where the previous level stopped.
+# LLL_alg and BKZ_alg come here by themselves for any basis fits_double turns down.
+
+from time import perf_counter
+
+import numpy as np
+
+from .instrumentation import lll_pass, make_event, new_stats
+from .lll_engine import (IntegerOverflow, gso_alloc, gso_init, gso_row, size_reduce_row, swap_rows,
+                        lll_reduce, lovasz_holds)
+
+PRECISIONS = ("double", "longdouble", "rational")
+
+# arithmetic for Mu and r at each level
+GSO_DTYPES = {
+    "double": np.float64,
+    "longdouble": np.longdouble,
+    "rational": object,
+}
+
+
+class PrecisionError(ArithmeticError):
+    # raised when the approximate GSO has visibly lost precision
+    pass
+
+
+def _entry_bits(rows):
+    return max(abs(a) for row in rows for a in row).bit_length()
+
+
+def fits_double(basis_vectors):
+    """
+    Whether the float64 engine (LLL_alg's arrays) is exact on this basis: integer entries
+    whose inner products, up to n * 2^(2 bits), fit the 53-bit mantissa.
+    """
+    rows = [[int(a) for a in v] for v in basis_vectors]
+    return 2 * _entry_bits(rows) + len(rows[0]).bit_length() <= 53
+
+
+def integer_basis(basis_vectors):
+    """
+    Turns a list of lists (or an fpylll IntegerMatrix) into an exact integer array.
+    int64 is used while the Gram entries are expected to fit, Python ints (dtype=object)
+    otherwise.
+    """
+    rows = [[int(a) for a in v] for v in basis_vectors]
+    d, n = len(rows), len(rows[0])
+    bits = _entry_bits(rows)
+
+    # LLL usually keeps ||b_i|| within sqrt(d) of the largest input vector, so the Gram
+    # entries stay below d * n * 2^(2 bits). That is only a guess: the engine checks every
+    # int64 product and raises IntegerOverflow instead of wrapping (see lll_engine.py),
+    # and LLL_adaptive then carries on with dtype=object
+    if 2 * bits + n.bit_length() + d.bit_length() + 8 < 63:
+        return np.array(rows, dtype=np.int64)
+    return np.array(rows, dtype=object)
+
+
+def _lll_at_precision(B, delta, dtype, max_size_reductions=10, max_refreshes=2):
+    # Runs LLL on the integer basis B in place with the GSO in the given dtype.
+    # Raises PrecisionError when it sees the GSO going wrong. Returns the number of swaps.
+    d = B.shape[0]
+    swaps = 0
+
+    for _ in range(max_refreshes + 1):
+        # The GSO is computed lazily, row k the first time the loop reaches it (as L^2 does).
+        # By then b_0..b_{k-1} are reduced, and b_k is size-reduced before its ||b_k*||^2 is
+        # used, so we never trust an r computed from huge, nearly parallel vectors
+        Mu, r = gso_alloc(d, dtype)
+        gso_row(B, Mu, r, 0)
+        k_max = 0
+
+        # touched[k] is the last change to row k (swap or size reduction), swapped_at[k] the
+        # last swap done at k. Swapping the same pair again with neither row changed since
+        # means the Lovasz test flipped back and forth, which can't happen in exact arithmetic
+        events = 0
+        touched = [0] * d
+        swapped_at = [-1] * d
+
+        k = 1
+        while k < d:
+            if k > k_max:
+                gso_row(B, Mu, r, k)
+                k_max = k
+
+            # Size-reduce b_k, then refresh its GSO row from the exact integers. Each pass
+            # should leave less to do, so needing more than a few passes means Mu is wrong
+            for _ in range(max_size_reductions):
+                if not size_reduce_row(B, Mu, k):
+                    break
+                gso_row(B, Mu, r, k)
+                events += 1
+                touched[k] = events
+            else:
+                raise PrecisionError(f"size reduction of row {k} did not converge")
+
+            if lovasz_holds(Mu, r, k, delta):
+                k += 1
+                continue
+
+            if swapped_at[k] == touched[k - 1] == touched[k]:
+                raise PrecisionError(f"Lovasz test at row {k} flipped back and forth")
+
+            if r[k] > 0:
+                swap_rows(B, Mu, r, k)
+            else:
+                # ||b_k*||^2 came out as cancellation noise (b_k still nearly parallel to the
+                # earlier vectors), so the rank-2 update would only spread the noise. Swap the
+                # integer rows, recompute row k-1 and let the loop recompute the rows after it
+                B[[k - 1, k]] = B[[k, k - 1]]
+                gso_row(B, Mu, r, k - 1)
+                if not r[k - 1] > 0:
+                    raise PrecisionError(f"non-positive ||b_{k - 1}*||^2 after a swap")
+                k_max = k - 1
+            swaps += 1
+            events += 1
+            touched[k - 1] = touched[k] = swapped_at[k] = events
+            k = max(1, k - 1)
+
+        # The loop only saw the incrementally updated GSO. Recompute it from scratch in the
+        # same arithmetic and check the result really is LLL-reduced; if not, carry on from
+        # the fresh GSO (this is what L^2 does), and give up on this level after a few tries
+        if dtype is object or _is_reduced(B, delta, dtype):
+            return swaps
+
+    raise PrecisionError("basis is not LLL-reduced after recomputing the GSO")
+
+
+def _is_reduced(B, delta, dtype, eta=0.51):
+    Mu, r = gso_init(B, dtype)
+    d = B.shape[0]
+    if not np.all(r > 0):
+        return False
+    if np.any(np.abs(np.tril(Mu, -1)) > eta):
+        return False
+    return all(lovasz_holds(Mu, r, k, delta) for k in range(1, d))
+
+
+def LLL_adaptive(basis_vectors, delta=0.75, precision="double", hook=None):
+    """
+    LLL on the exact integer basis, with the GSO at the lowest precision that stays correct.
+    precision is the level to start from (see PRECISIONS).
+    hook: gets one "lll" event, as from LLL_alg, with the GSO in the finishing precision.
+    Returns (basis, report), where basis is a list of integer numpy arrays and report says
+    which precision finished the run and why any lower ones were abandoned, e.g.
+        {"precision": "longdouble", "swaps": 1234,
+         "escalations": ["double: size reduction of row 17 did not converge"]}
+    """
+    B = integer_basis(basis_vectors)
+    report = {"precision": None, "swaps": 0, "escalations": []}
+    start = perf_counter()
+
+    levels = list(PRECISIONS[PRECISIONS.index(precision):])
+    while levels:
+        level = levels[0]
+        try:
+            # overflow/invalid in the float GSO is a loss of precision too
+            with np.errstate(over="raise", invalid="raise", divide="raise"):
+                report["swaps"] += _lll_at_precision(B, delta, GSO_DTYPES[level])
+        except IntegerOverflow as e:
+            # the basis outgrew int64 (nothing was written), the GSO was fine: same level
+            # again on Python ints
+            report["escalations"].append(f"int64: {e}")
+            B = B.astype(object)
+            continue
+        except (PrecisionError, FloatingPointError, OverflowError, ZeroDivisionError) as e:
+            report["escalations"].append(f"{level}: {e}")
+            levels.pop(0)
+            continue
+        report["precision"] = level
+        break
+    else:
+        # even the exact GSO failed, which only happens for linearly dependent vectors
+        raise ValueError(f"LLL_adaptive failed at every precision: {report['escalations']}")
+
+    if hook is not None:
+        stats = new_stats()
+        stats["swaps"] = report["swaps"]
+        stats["time"] = perf_counter() - start
+        hook(make_event("lll", 0, gso_init(B, GSO_DTYPES[report["precision"]])[1], stats))
+    return list(B), report
+
+
+def lll_arrays(basis_vectors, delta=0.75, hook=None, reduce=lll_reduce):
+    """
+    LLL on the basis, returning the engine arrays for whatever runs on them next (BKZ tours,
+    the recursive framework, ...), the way LLL_alg routes: float arrays when fits_double
+    allows, otherwise the exact basis (Python ints) with the GSO in the precision
+    LLL_adaptive finished in.
+    reduce: the LLL to run instead, as for lll_pass (DeepLLL / PotLLL, see deep_lll.py). On
+    an exact basis it runs after LLL_adaptive, on the exact GSO, with an "lll" event of its own.
+    Returns (B, Mu, r, precision), precision None for the float arrays.
+    """
+    if fits_double(basis_vectors):
+        B = np.array([[int(a) for a in v] for v in basis_vectors], dtype=float)
+        Mu, r = gso_init(B)
+        lll_pass(B, Mu, r, delta, hook, reduce)
+        return B, Mu, r, None
+    rows, report = LLL_adaptive(basis_vectors, delta, hook=hook)
+    B = np.array(rows, dtype=object)
+    Mu, r = gso_init(B, GSO_DTYPES[report["precision"]])
+    if reduce is not lll_reduce:
+        lll_pass(B, Mu, r, delta, hook, reduce)
+    return B, Mu, r, report["precision"]
@@ -0,0 +1,200 @@
+# LWE instances and the primal attack (Kannan's embedding), for attack-cost experiments
+# An LWE instance is (A, b = A s + e mod q) with A uniform m x n, s the secret and e a short
+# error (rounded Gaussian, width sigma). The primal attack:
+#   - the q-ary lattice L = { y in Z^m : y = A s mod q } has the basis
+#       [ I_n | (A_2 A_1^-1)^T ]      (A_1 = first n rows of A, invertible mod q)
+#       [ 0   | q I_{m-n}      ]
+#   - b - e is in L, so (e, M) is a short vector of the embedding lattice with basis
+#       [ L  | 0 ]
+#       [ b  | M ]      (M = the embedding factor, about sigma)
+#   - reduce that basis; if some row is +-(e, M), the error and then the secret come out:
+#     s = A_1^-1 (b_1 - e_1) mod q, checked against the whole of b
+# Instances are generated from a seed and streamed one at a time (lwe_instances is a
+# generator), so a sweep over n, q and sigma never holds more than one basis.
+#
+# Reduction strategies are benchmark.RUNNERS ("lll_alg", "bkz_alg", "fpylll_lll",
+# "fpylll_bkz") and "bkz2" (BKZ 2.0 as in bkz_comparison.run_bkz2).
+#
+# Usage:
+#   python -m lattice_reduction.lwe --n 20 30 --q 401 --sigma 3 --algorithms lll_alg bkz_alg --blocksize 20 --seeds 20
+
+import argparse
+import json
+import time
+from itertools import product
+
+import numpy as np
+from fpylll import IntegerMatrix
+
+from .benchmark import RUNNERS
+from .bkz_comparison import run_bkz2
+
+
+def generate_lwe(n, m, q, sigma, seed):
+    """
+    A seeded LWE instance: dict with A (m x n), b, s (n), e (m) as int64 arrays, and n, m, q, sigma, seed.
+    The secret is uniform mod q, the error a rounded Gaussian of standard deviation sigma.
+    """
+    rng = np.random.default_rng(seed)
+    A = rng.integers(0, q, size=(m, n))
+    s = rng.integers(0, q, size=n)
+    e = np.rint(rng.normal(0, sigma, size=m)).astype(np.int64)
+    b = (A @ s + e) % q
+    return {"n": n, "m": m, "q": q, "sigma": sigma, "seed": seed, "A": A, "b": b, "s": s, "e": e}
+
+
+def _inverse_mod(M, q):
+    # inverse of the square matrix M mod a prime q (Gauss-Jordan on Python ints), or None
+    n = len(M)
+    R = [[int(v) % q for v in row] + [int(i == j) for j in range(n)] for i, row in enumerate(M)]
+    for col in range(n):
+        pivot = next((i for i in range(col, n) if R[i][col]), None)
+        if pivot is None:
+            return None
+        R[col], R[pivot] = R[pivot], R[col]
+        inv = pow(R[col][col], -1, q)
+        R[col] = [v * inv % q for v in R[col]]
+        for i in range(n):
+            if i != col and R[i][col]:
+                f = R[i][col]
+                R[i] = [(v - f * w) % q for v, w in zip(R[i], R[col])]
+    return np.array([row[n:] for row in R], dtype=object)
+
+
+def embedding_basis(instance, factor=None):
+    """
+    Kannan's embedding basis ((m + 1) x (m + 1) IntegerMatrix) for an instance, or None if
+    the first n rows of A are not invertible mod q. factor: the embedding factor M,
+    by default round(sigma) (at least 1).
+    """
+    A, b, q = instance["A"], instance["b"], instance["q"]
+    n, m = instance["n"], instance["m"]
+    A1_inv = _inverse_mod(A[:n], q)
+    if A1_inv is None:
+        return None
+    if factor is None:
+        factor = max(1, int(round(instance["sigma"])))
+
+    basis = np.zeros((m + 1, m + 1), dtype=object)
+    basis[:n, :n] = np.eye(n, dtype=object)
+    basis[:n, n:m] = (A[n:].astype(object) @ A1_inv % q).T
+    basis[n:m, n:m] = q * np.eye(m - n, dtype=object)
+    basis[m, :m] = b
+    basis[m, m] = factor
+    return IntegerMatrix.from_matrix(basis.tolist())
+
+
+def recover_secret(instance, reduced, factor=None):
+    """
+    Looks for +-(e, M) among the rows of the reduced embedding basis and solves for s.
+    Returns the secret (int64 array) if one checks out against the whole instance, else None.
+    """
+    A, b, q = instance["A"], instance["b"], instance["q"]
+    n, m = instance["n"], instance["m"]
+    if factor is None:
+        factor = max(1, int(round(instance["sigma"])))
+    A1_inv = _inverse_mod(A[:n], q)
+    for i in range(reduced.nrows):
+        row = [reduced[i, j] for j in range(m + 1)]
+        if abs(row[m]) != factor:
+            continue
+        e = np.array(row[:m], dtype=np.int64) * (1 if row[m] == factor else -1)
+        # b - e = A s, so the first n equations give s and the rest must agree
+        s = np.array(A1_inv @ ((b[:n] - e[:n]) % q).astype(object) % q, dtype=np.int64)
+        if np.array_equal((A @ s + e) % q, b):
+            return s
+    return None
+
+
+def lwe_instances(ns, qs, sigmas, seeds, m_factor=2):
+    """
+    Generator over seeded instances for every (n, q, sigma, seed), with m = m_factor * n
+    samples. Each one is built only when it is asked for.
+    """
+    for n, q, sigma, seed in product(ns, qs, sigmas, seeds):
+        yield generate_lwe(n, m_factor * n, q, sigma, seed)
+
+
+def attack(instance, algorithm, blocksize=20, delta=0.99):
+    """
+    The primal attack on one instance with one reduction strategy.
+    Returns the result record: instance parameters, algorithm, success, time.
+    """
+    record = {key: instance[key] for key in ("n", "m", "q", "sigma", "seed")}
+    record.update(algorithm=algorithm, blocksize=blocksize if "bkz" in algorithm else 0)
+    mat = embedding_basis(instance)
+    if mat is None:
+        record.update(success=False, time=0.0, error="A_1 not invertible mod q")
+        return record
+
+    start = time.perf_counter()
+    if algorithm == "bkz2":
+        run_bkz2(mat, blocksize)
+        reduced = mat
+    else:
+        reduced = RUNNERS[algorithm](mat, delta, blocksize)
+    record["time"] = time.perf_counter() - start
+
+    s = recover_secret(instance, reduced)
+    record["success"] = s is not None and bool(np.array_equal(s, instance["s"]))
+    return record
+
+
+def run_sweep(instances, algorithms, blocksize=20, delta=0.99):
+    """
+    Generator of attack records: every instance against every algorithm, one at a time.
+    """
+    for instance in instances:
+        for algorithm in algorithms:
+            yield attack(instance, algorithm, blocksize, delta)
+
+
+def summarize(records):
+    """
+    Success probability and mean time per instance for each (n, q, sigma, algorithm).
+    Returns a list of dicts, one per group.
+    """
+    groups = {}
+    for rec in records:
+        key = (rec["n"], rec["q"], rec["sigma"], rec["algorithm"], rec["blocksize"])
+        groups.setdefault(key, []).append(rec)
+    summary = []
+    for (n, q, sigma, algorithm, blocksize), recs in sorted(groups.items()):
+        summary.append({"n": n, "q": q, "sigma": sigma, "algorithm": algorithm, "blocksize": blocksize,
+                        "instances": len(recs),
+                        "success": sum(rec["success"] for rec in recs) / len(recs),
+                        "time": sum(rec["time"] for rec in recs) / len(recs)})
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Primal (Kannan embedding) attack on seeded LWE instances.")
+    parser.add_argument("--n", type=int, nargs="+", default=[20])
+    parser.add_argument("--q", type=int, nargs="+", default=[401], help="prime moduli")
+    parser.add_argument("--sigma", type=float, nargs="+", default=[3.0])
+    parser.add_argument("--m-factor", type=int, default=2, help="samples m = m_factor * n")
+    parser.add_argument("--seeds", type=int, default=10, help="instances per (n, q, sigma)")
+    parser.add_argument("--algorithms", nargs="+", default=["lll_alg", "bkz_alg"],
+                        choices=sorted(RUNNERS) + ["bkz2"])
+    parser.add_argument("--blocksize", type=int, default=20)
+    parser.add_argument("--delta", type=float, default=0.99)
+    parser.add_argument("--output", help="JSONL file for the per-instance records")
+    args = parser.parse_args()
+
+    instances = lwe_instances(args.n, args.q, args.sigma, range(args.seeds), args.m_factor)
+    records = []
+    out = open(args.output, "a") if args.output else None
+    for rec in run_sweep(instances, args.algorithms, args.blocksize, args.delta):
+        records.append(rec)
+        if out is not None:
+            out.write(json.dumps(rec) + "\n")
+            out.flush()
+        print(f"n={rec['n']} q={rec['q']} sigma={rec['sigma']} seed={rec['seed']} {rec['algorithm']}: "
+              f"{'recovered' if rec['success'] else 'failed'} in {rec['time']:.2f}s")
+    if out is not None:
+        out.close()
+
+    print()
+    for row in summarize(records):
+        print(f"n={row['n']:4d} q={row['q']:6d} sigma={row['sigma']:5.2f} {row['algorithm']:10s} "
+              f"success {row['success']:6.1%}  {row['time']:8.3f}s per instance")
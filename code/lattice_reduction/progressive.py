@@ -0,0 +1,148 @@
+# Progressive BKZ with a time / node budget and a GSA-based auto-abort
+# BKZ_alg runs one block size until a tour makes no insertion, which at a large block size
+# can go on for a long time for very little. Progressive BKZ instead walks the block size
+# up a schedule (10, 20, ..., beta by default), each block size starting from the basis the
+# previous one left, so the expensive large-block tours start from a basis that is already
+# nearly as good as they will make it and only a few of them are needed.
+#
+# At each block size tours run until
+#   - a tour makes no insertion (as in bkz_reduce), or
+#   - the GSA slope has stopped improving: fplll's BKZ.AUTO_ABORT rule, i.e. the tour is
+#     not counted as progress unless |slope| < abort_scale * (best |slope| so far), and
+#     after abort_tours tours in a row without progress we move on, or
+#   - max_tours tours have run.
+#
+# The budget (wall clock seconds and/or enumeration nodes) is checked before every window,
+# so it can stop a run in the middle of a tour; the basis is always consistent between
+# windows, and a final LLL pass tidies up as after bkz_reduce. The report then says which
+# block size was reached and the quality (slope, RHF) the basis has at that point.
+#
+# Any block oracle with the find_shortest_vector contract works: "enum" (our enumeration),
+# "fpylll" (fplll's) or "sieve", as in recursive_reduction.ORACLES. Nodes can only be
+# counted for the enumeration oracles, which take a stats dict (see enumeration.py).
+#
+# Usage:
+#   basis, report = Progressive_alg(basis, 50, oracle="fpylll", time_budget=600)
+#   print(report["blocksize"], report["rhf"], report["out_of_budget"])
+
+import time
+from functools import partial
+
+import numpy as np
+
+from .bkz_engine import bkz_tour
+from .instrumentation import gsa_slope, gso_profile, make_event, new_stats, root_hermite_factor
+from .lll_engine import gso_init, gso_update, lll_reduce
+from .recursive_reduction import ORACLES
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+def default_schedule(blocksize, step=10, start=10):
+    """
+    Block sizes start, start + step, ... below blocksize, then blocksize itself.
+    """
+    return list(range(start, blocksize, step)) + [blocksize]
+
+
+def progressive_bkz(B, Mu, r, schedule, oracle, delta=0.75, max_tours=8, abort_tours=2,
+                    abort_scale=1.0, time_budget=None, node_budget=None, hook=None):
+    """
+    Progressive BKZ on the engine arrays (as in lll_engine.py, updated in place, B already
+    LLL-reduced) over the block sizes in schedule, with oracle as the SVP oracle.
+    max_tours:     most tours per block size
+    abort_tours:   tours in a row without slope progress before moving to the next block size
+    abort_scale:   a tour makes progress when |slope| < abort_scale * best |slope| so far
+    time_budget:   seconds for the whole run, or None
+    node_budget:   enumeration nodes for the whole run, or None (oracle must take stats=)
+    hook:          optional function that gets one event per tour (see instrumentation.py),
+                   with the tour's block size under "blocksize"
+    Returns the report: the block sizes run with their tour counts, total tours, the largest
+    block size that completed a tour, what ran out ("time", "nodes" or None), and the
+    slope and RHF of the final basis, the nodes visited and the time taken.
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget is not None else None
+    counter = {"nodes": 0}
+    if node_budget is not None:
+        oracle = partial(oracle, stats=counter)
+    d = B.shape[0]
+    report = {"schedule": [], "tours": 0, "blocksize": None, "out_of_budget": None}
+
+    def check_budget(*_):
+        if deadline is not None and time.perf_counter() >= deadline:
+            report["out_of_budget"] = "time"
+        elif node_budget is not None and counter["nodes"] >= node_budget:
+            report["out_of_budget"] = "nodes"
+        else:
+            return
+        raise _OutOfBudget
+
+    try:
+        for blocksize in schedule:
+            blocksize = min(blocksize, d)
+            report["schedule"].append([blocksize, 0])
+            best = None
+            stalled = 0
+            while report["schedule"][-1][1] < max_tours:
+                check_budget()
+                stats = None
+                if hook is not None:
+                    stats = new_stats()
+                    started = time.perf_counter()
+                insertions = bkz_tour(B, Mu, r, blocksize, oracle, delta, stats, on_window=check_budget)
+                report["schedule"][-1][1] += 1
+                report["tours"] += 1
+                report["blocksize"] = blocksize
+                if hook is not None:
+                    stats["time"] = time.perf_counter() - started
+                    event = make_event("tour", report["tours"], r, stats)
+                    event["blocksize"] = blocksize
+                    hook(event)
+                if insertions == 0:
+                    break
+
+                # auto-abort, as fplll's: the slope is negative, so compare |slope|
+                slope = -gsa_slope(gso_profile(r))
+                if best is None or slope < abort_scale * best:
+                    stalled = 0
+                else:
+                    stalled += 1
+                best = slope if best is None else min(best, slope)
+                if stalled >= abort_tours:
+                    break
+    except _OutOfBudget:
+        pass
+
+    # as at the end of bkz_reduce: the local LLLs leave the window edges to a full pass
+    gso_update(B, Mu, r)
+    lll_reduce(B, Mu, r, delta)
+    profile = gso_profile(r)
+    report.update(slope=gsa_slope(profile), rhf=root_hermite_factor(profile),
+                  nodes=counter["nodes"] if node_budget is not None else None,
+                  time=time.perf_counter() - start)
+    return report
+
+
+def Progressive_alg(basis_vectors, blocksize, delta=0.75, oracle="enum", step=10, start=10,
+                    **options):
+    """
+    Progressive BKZ next to LLL_alg / BKZ_alg: LLL, then block sizes
+    default_schedule(blocksize, step, start).
+    oracle: "enum", "fpylll", "sieve" or any function with the find_shortest_vector contract.
+    options go to progressive_bkz (max_tours, abort_tours, abort_scale, time_budget,
+    node_budget, hook).
+    Returns (basis, report) with basis a list of numpy arrays.
+    """
+    if oracle == "sieve" and options.get("node_budget") is not None:
+        raise ValueError("the sieve does not count enumeration nodes, use a time_budget")
+    if isinstance(oracle, str):
+        oracle = ORACLES[oracle]
+    B = np.array(basis_vectors, dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, delta)
+
+    report = progressive_bkz(B, Mu, r, default_schedule(blocksize, step, start), oracle, delta, **options)
+    return list(B), report
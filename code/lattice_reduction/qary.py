@@ -0,0 +1,158 @@
+# q-ary lattices, stored as (A, q) instead of as a dense basis
+# LWE/SIS lattices have the basis
+#   [ q I_m  0   ]      m rows q e_j
+#   [ A      I_n ]      n rows (a_i, e_i), A an n x m matrix mod q
+# and both LLL_alg and IntegerMatrix treat that as a generic dense d x d matrix
+# (d = m + n). QaryLattice keeps A and q only, and the structure gives a lot for free:
+#   - the GSO is known in closed form: the q e_j are orthogonal with ||.||^2 = q^2, and
+#     projecting (a_i, e_i) away from them leaves (0, e_i), so
+#       Mu = [[I, 0], [A / q, I]],   r = [q^2] * m + [1] * n
+#     with no Gram matrix and no Cholesky (gso_init) at all
+#   - size reduction against the q e_j is reduction mod q, so with A centred mod q the
+#     basis is size-reduced from the start
+#   - LLL moves the (a_i, e_i) rows forward, but each one only gets past the q e_j until
+#     its projection is longer than about q, so in the usual parameter ranges the first
+#     q e_j are never reached by a swap and never change. Projecting away the first s of
+#     them just drops their s coordinates, which leaves the q-ary lattice of A[:, s:]:
+#     that is the only part LLL has to work on. Its rows are lifted back by adding the
+#     dropped coordinates of their combination of A rows, centred mod q (the last n
+#     coordinates of a row are exactly its coefficients on the A rows).
+# s is chosen from the geometric series assumption: LLL on the q-ary lattice of dimension
+# d' = m' + n (volume q^m') reaches ||b_0|| ~ rhf^d' q^(m'/d'), which is at least q once
+# d' >= sqrt(n log q / log rhf). If the guess was too optimistic (the lifted basis fails
+# the Lovasz condition where the untouched q e_j end), LLL carries on over the whole basis,
+# which only has work to do around that point.
+#
+# Usage:
+#   lattice = QaryLattice(A, q)
+#   B, Mu, r, report = qary_lll(lattice, 0.99)    # or LLL_alg(lattice, 0.99)
+#   dense = lattice.basis()                       # only when a dense basis is needed
+
+import numpy as np
+
+from .instrumentation import lll_pass
+from .lll_engine import lll_reduce
+
+# root Hermite factor LLL reaches in practice on these lattices (delta close to 1), only
+# used to guess how many q e_j are never reached
+QARY_RHF = 1.02
+
+
+class QaryLattice:
+    """
+    The q-ary lattice with basis [[q I_m, 0], [A, I_n]], stored as A (n x m, entries taken
+    mod q) and q.
+    """
+
+    def __init__(self, A, q):
+        self.q = int(q)
+        self.A = np.asarray(A, dtype=np.int64) % self.q
+        self.n, self.m = self.A.shape
+
+    @property
+    def dim(self):
+        return self.m + self.n
+
+    @property
+    def nbytes(self):
+        return self.A.nbytes
+
+    @classmethod
+    def from_basis(cls, basis):
+        """
+        The QaryLattice of a dense basis (array, list of rows or IntegerMatrix) laid out
+        as [[q I_m, 0], [A, I_n]]. Raises ValueError for any other layout.
+        """
+        if hasattr(basis, "nrows"):
+            basis = [[basis[i, j] for j in range(basis.ncols)] for i in range(basis.nrows)]
+        B = np.asarray(basis, dtype=np.int64)
+        d = B.shape[0]
+        q = int(B[0, 0])
+        m = int(np.count_nonzero(np.diag(B) == q)) if q > 1 else 0
+        n = d - m
+        if (B.shape != (d, d) or m == 0 or not np.array_equal(B[:m], q * np.eye(m, d, dtype=np.int64))
+                or not np.array_equal(B[m:, m:], np.eye(n, dtype=np.int64))):
+            raise ValueError("not a q-ary basis [[qI, 0], [A, I]]")
+        return cls(B[m:, :m], q)
+
+    def centred(self):
+        # A with entries in (-q/2, q/2]: the rows (a_i, e_i) size-reduced against the q e_j
+        return (self.A + (self.q - 1) // 2) % self.q - (self.q - 1) // 2
+
+    def basis(self, dtype=np.int64):
+        """
+        The dense d x d basis [[q I_m, 0], [A, I_n]] (A centred mod q).
+        """
+        B = np.zeros((self.dim, self.dim), dtype=dtype)
+        B[:self.m, :self.m] = self.q * np.eye(self.m, dtype=dtype)
+        B[self.m:, :self.m] = self.centred()
+        B[self.m:, self.m:] = np.eye(self.n, dtype=dtype)
+        return B
+
+    def gso(self):
+        """
+        Mu and r of basis(), in closed form (no Gram matrix).
+        """
+        d, m = self.dim, self.m
+        Mu = np.eye(d)
+        Mu[m:, :m] = self.centred() / self.q
+        r = np.ones(d)
+        r[:m] = float(self.q) ** 2
+        return Mu, r
+
+    def untouched(self, rhf=QARY_RHF):
+        """
+        How many of the q e_j LLL is not expected to reach (see the top of the file).
+        """
+        if self.n == 0:
+            return self.m
+        active = int(np.ceil(np.sqrt(self.n * np.log(self.q) / np.log(rhf))))
+        return max(0, self.m - max(active - self.n, 1))
+
+    def project(self, s):
+        """
+        The q-ary lattice of A[:, s:]: this lattice with the first s q e_j projected away.
+        """
+        return QaryLattice(self.A[:, s:], self.q)
+
+
+def qary_lll(lattice, delta=0.75, hook=None, untouched=None):
+    """
+    LLL on a QaryLattice, only on the part swaps can reach (see the top of the file).
+    untouched: number of leading q e_j to leave out, by default lattice.untouched().
+    hook: gets the "lll" event of the pass over the active part (see instrumentation.py).
+    Returns (B, Mu, r, report): the LLL-reduced basis as a float array with its GSO (the
+    engine arrays of lll_engine.py), and a dict with the number of q e_j left untouched and
+    whether the full basis needed a second pass ("fallback").
+    """
+    q, m, n = lattice.q, lattice.m, lattice.n
+    s = lattice.untouched() if untouched is None else untouched
+    part = lattice.project(s)
+
+    # LLL on the active part, from its closed form GSO
+    P = part.basis(float)
+    Mu_p, r_p = part.gso()
+    lll_pass(P, Mu_p, r_p, delta, hook)
+    if s == 0:
+        return P, Mu_p, r_p, {"untouched": 0, "fallback": False}
+
+    # lift: the dropped coordinates of each row are its combination of A rows, centred mod q
+    coeffs = np.rint(P[:, -n:]).astype(np.int64)
+    front = (coeffs @ lattice.centred()[:, :s] + (q - 1) // 2) % q - (q - 1) // 2
+    d = lattice.dim
+    B = np.zeros((d, d))
+    B[:s, :s] = q * np.eye(s)
+    B[s:, :s] = front
+    B[s:, s:] = P
+
+    Mu = np.eye(d)
+    Mu[s:, :s] = front / q
+    Mu[s:, s:] = Mu_p
+    r = np.concatenate([np.full(s, float(q) ** 2), r_p])
+
+    # Lovasz between the last untouched q e_j and the first lifted row: if it holds, the
+    # whole basis is LLL-reduced already; if not, LLL sorts out the boundary
+    fallback = r[s] < (delta - Mu[s, s - 1] ** 2) * r[s - 1]
+    if fallback:
+        lll_reduce(B, Mu, r, delta)
+    return B, Mu, r, {"untouched": s, "fallback": bool(fallback)}
@@ -0,0 +1,229 @@
+# Recursive dense-sublattice reduction: the A(L, aux) framework of arXiv 2311.15064
+# (see README.md). To find a short vector in a lattice of rank m > k we don't enumerate
+# on all of it: we first make a sublattice of lower rank dense (small determinant), and
+# then look for the short vector inside that sublattice, recursively, until the rank is
+# down to about k and an SVP oracle can finish the job.
+# On a basis b_s..b_{e-1} (a projected block, same arrays as lll_engine.py / bkz_engine.py):
+#   - the prefix L' = L[s, e - c) is dense exactly when the suffix L[e - c, e) has a large
+#     determinant, i.e. when the dual of the suffix is dense. So
+#       primal(s, e):  dual(e - w, e),  then  primal(s, e - c)
+#     where the dual window w = max(c, k) reaches back into the prefix, so that the dual
+#     oracle has a rank k block to work with even when c is small
+#   - and the same with primal and dual swapped (a dense dual prefix is a dense
+#     primal suffix, reading the dual basis backwards, see bkz_engine.dual_block_gso):
+#       dual(s, e):    primal(s, s + w),  then  dual(s + c, e)
+#   - rank <= k: one primal SVP call (shortest vector to the front) or one dual SVP call
+#     (shortest dual vector to the back, so ||b_{e-1}*|| is as large as it can be).
+# The whole recursion is repeated for `rounds` rounds (tours) while it keeps changing the basis.
+#
+# aux is a dict holding everything the recursion needs besides the lattice (the name is
+# the paper's): the base rank k, the rank c taken off per level ("step"), the depth and
+# time budget, the memo table and the counters that end up in the report.
+#
+# Memoization: the work done on a projected block only depends on the block's GSO (Mu, r),
+# which fixes its Gram matrix. So once a subproblem is solved, the unimodular matrix U it
+# applied to the block is stored under the (rounded) GSO, and whenever the same block
+# shows up again, in another branch or in the next round, U is applied straight away
+# instead of recursing. In particular, a block that is already reduced is recognised in
+# one lookup, which is what makes the extra rounds cheap.
+# U is recorded while the subproblem runs: every subproblem starts a transform T from the
+# identity, every row operation on B is done on T too (the engine's T arguments, see
+# lll_engine.py), and a subproblem's T is multiplied into its parent's when it returns.
+
+import time
+
+import numpy as np
+
+from .bkz import find_shortest_vector
+from .bkz_engine import dual_block_gso, insert_dual_vector, insert_vector
+from .enumeration import fpylll_enumerate_svp
+from .lll_engine import gso_init, gso_update, lll_reduce, size_reduce_row
+from .sieve import sieve_svp
+
+
+def fpylll_oracle(Mu_block, r_block, stats=None):
+    # fplll's enumeration as the base-case oracle, with the same GH-then-||b_0*|| radius
+    # as find_shortest_vector
+    result = fpylll_enumerate_svp(Mu_block, r_block, stats=stats)
+    if result is None:
+        result = fpylll_enumerate_svp(Mu_block, r_block, radius_sq=r_block[0], stats=stats)
+    return result
+
+
+ORACLES = {"enum": find_shortest_vector, "fpylll": fpylll_oracle, "sieve": sieve_svp}
+
+
+def make_aux(k, step=1, rounds=8, max_depth=None, time_budget=None, memo_size=100000):
+    """
+    The auxiliary information for one run.
+    k:            rank at which the recursion stops and the SVP oracle is called
+    step:         rank c taken off per level. With c = 1 the prefix loses exactly the
+                  vector whose ||b_{e-1}*|| the dual call makes as large as it can, which
+                  is what works best; larger steps make fewer, cruder calls
+    rounds:       how many times the whole recursion is repeated (while it changes something)
+    max_depth:    deepest recursion level; below it the block is handled by one base-case
+                  call on its first (primal) or last (dual) k vectors
+    time_budget:  seconds; once used up, the recursion returns with the basis as it is
+    memo_size:    most memoized subproblems to keep
+    """
+    return {"k": k, "step": step, "rounds": rounds,
+            "max_depth": max_depth,
+            "deadline": time.perf_counter() + time_budget if time_budget is not None else None,
+            "memo": {}, "memo_size": memo_size,
+            "tours": 0, "oracle_calls": 0, "insertions": 0, "memo_hits": 0, "subproblems": 0,
+            "depth_reached": 0, "out_of_time": False}
+
+
+def _memo_key(Mu, r, s, e, dual):
+    # The block's GSO up to scaling, rounded so that the same block recomputed in a
+    # different order of operations still gives the same key
+    log_r = np.log(np.asarray(r[s:e], dtype=float))
+    shape = np.concatenate([log_r - log_r[0], np.asarray(Mu[s:e, s:e], dtype=float)[np.tril_indices(e - s, -1)]])
+    return dual, e - s, np.round(shape, 6).tobytes()
+
+
+def _apply_transform(B, Mu, r, s, e, U, T):
+    # Replays a memoized U on the block (and on the transform T), then size-reduces it again
+    if np.array_equal(U, np.eye(e - s)):
+        return
+    B[s:e] = U @ B[s:e]
+    T[s:e] = U @ T[s:e]
+    Mu[s:e, :s] = U @ Mu[s:e, :s]
+    gso_update(B, Mu, r, s, e)
+    for k in range(s, e):
+        size_reduce_row(B, Mu, k, T=T)
+
+
+def _primal_step(B, Mu, r, s, e, oracle, delta, aux, T):
+    # base case: the shortest vector of the block to position s, then LLL on the block
+    aux["oracle_calls"] += 1
+    result = oracle(Mu[s:e, s:e], r[s:e])
+    if result is None:
+        return
+    x, norm_sq = result
+    if norm_sq < delta * delta * r[s]:
+        insert_vector(B, Mu, r, s, e, x, T)
+        size_reduce_row(B, Mu, s, T=T)
+        lll_reduce(B, Mu, r, delta, s, e, T=T)
+        aux["insertions"] += 1
+
+
+def _dual_step(B, Mu, r, s, e, oracle, delta, aux, T):
+    # base case: the shortest dual vector of the block to the back, making ||b_{e-1}*||
+    # as large as possible (no LLL afterwards, it would undo the point of it)
+    # LLL on the block first: a previous dual insertion leaves it unreduced, and the
+    # enumeration on a badly reduced (dual) block costs orders of magnitude more
+    lll_reduce(B, Mu, r, delta, s, e, T=T)
+    aux["oracle_calls"] += 1
+    Mu_dual, r_dual = dual_block_gso(Mu[s:e, s:e], r[s:e])
+    result = oracle(Mu_dual, r_dual)
+    if result is None:
+        return
+    x, norm_sq = result
+    if norm_sq < delta * delta * r_dual[0]:
+        insert_dual_vector(B, Mu, r, s, e, x[::-1], T)
+        aux["insertions"] += 1
+
+
+def _reduce(B, Mu, r, s, e, dual, depth, oracle, delta, aux, T=None):
+    # A(L, aux) on the projected block L = L[s, e), in the primal or the dual
+    # T: the caller's transform, which this call's row operations are added to
+    m = e - s
+    if m < 2:
+        return
+    if aux["deadline"] is not None and time.perf_counter() > aux["deadline"]:
+        aux["out_of_time"] = True
+        return
+
+    key = _memo_key(Mu, r, s, e, dual)
+    U = aux["memo"].get(key)
+    if U is not None:
+        aux["memo_hits"] += 1
+        _apply_transform(B, Mu, r, s, e, U, np.eye(e, dtype=B.dtype) if T is None else T)
+        return
+
+    aux["subproblems"] += 1
+    aux["depth_reached"] = max(aux["depth_reached"], depth)
+    # B[:e] = T_block (B[:e] as it is now); the rows from e on are never touched here
+    T_block = np.eye(e, dtype=B.dtype)
+    k, c = aux["k"], aux["step"]
+    memoize = True
+
+    if m <= k:
+        (_dual_step if dual else _primal_step)(B, Mu, r, s, e, oracle, delta, aux, T_block)
+    elif aux["max_depth"] is not None and depth >= aux["max_depth"]:
+        # out of depth: settle for the end of the block this call is about (and don't
+        # memoize it, the same block higher up the recursion deserves the full treatment)
+        memoize = False
+        if dual:
+            _dual_step(B, Mu, r, e - k, e, oracle, delta, aux, T_block)
+        else:
+            _primal_step(B, Mu, r, s, s + k, oracle, delta, aux, T_block)
+    else:
+        c = min(c, m - 1)
+        w = max(c, min(k, m - 1))
+        # Only the top level repeats (like BKZ tours): repeating every level would multiply
+        # the work by rounds^depth, and the memo already skips the sub-blocks that a
+        # repeat would find unchanged
+        for _ in range(aux["rounds"] if depth == 0 else 1):
+            # start each round from a GSO recomputed from the basis, so that the float
+            # drift of the many swaps below doesn't build up (as bkz_tour does per tour)
+            gso_update(B, Mu, r)
+            if depth == 0:
+                aux["tours"] += 1
+            before = B[s:e].copy()
+            if dual:
+                # dense dual prefix = dense primal suffix: make the primal head short first
+                _reduce(B, Mu, r, s, s + w, False, depth + 1, oracle, delta, aux, T_block)
+                _reduce(B, Mu, r, s + c, e, True, depth + 1, oracle, delta, aux, T_block)
+            else:
+                # dense primal prefix: make the suffix long (its dual dense) first
+                _reduce(B, Mu, r, e - w, e, True, depth + 1, oracle, delta, aux, T_block)
+                _reduce(B, Mu, r, s, e - c, False, depth + 1, oracle, delta, aux, T_block)
+            if np.array_equal(before, B[s:e]):
+                break
+
+    # pi_s(B[s:e]) = U pi_s(old B[s:e]): the rows before s only add to the projected-away part.
+    # Remember it, unless this subproblem was cut short by the time budget
+    if memoize and not aux["out_of_time"]:
+        if len(aux["memo"]) >= aux["memo_size"]:
+            aux["memo"].pop(next(iter(aux["memo"])))
+        aux["memo"][key] = T_block[s:e, s:e].copy()
+    # and hand the row operations up: rows s..e-1 are now T_block times the caller's
+    if T is not None:
+        T[s:e] = T_block[s:e] @ T[:e]
+
+
+def recursive_reduce(B, Mu, r, oracle, aux, delta=0.75):
+    """
+    Runs A(L, aux) on the whole basis (arrays as in lll_engine.py, updated in place,
+    B already LLL-reduced), then a final LLL pass, as bkz_reduce does.
+    Returns the report: rounds run, oracle calls, insertions, memo hits, subproblems solved,
+    deepest level reached, whether the time budget ran out, and the time taken.
+    """
+    start = time.perf_counter()
+    _reduce(B, Mu, r, 0, B.shape[0], False, 0, oracle, delta, aux)
+    gso_update(B, Mu, r)
+    lll_reduce(B, Mu, r, delta)
+    report = {key: aux[key] for key in ("tours", "oracle_calls", "insertions", "memo_hits", "subproblems",
+                                        "depth_reached", "out_of_time")}
+    report["time"] = time.perf_counter() - start
+    return report
+
+
+def Recursive_alg(basis_vectors, k, delta=0.75, oracle="fpylll", **aux_options):
+    """
+    The recursive framework next to LLL_alg / BKZ_alg: LLL, then A(L, aux) with base rank k.
+    oracle: "fpylll" (fplll's enumeration), "enum" (our enumeration.py), "sieve" (sieve.py)
+    or any function with the find_shortest_vector contract. aux_options go to make_aux
+    (step, rounds, max_depth, time_budget, memo_size).
+    Returns (basis, report) with basis a list of numpy arrays.
+    """
+    if isinstance(oracle, str):
+        oracle = ORACLES[oracle]
+    B = np.array(basis_vectors, dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, delta)
+
+    report = recursive_reduce(B, Mu, r, oracle, make_aux(k, **aux_options), delta)
+    return list(B), report
@@ -0,0 +1,233 @@
+# Command line reduction of a stream of bases
+# Reads bases from stdin or from files and writes every reduced basis out as soon as it is
+# done, so that a shell pipeline (or a job scheduler starting one worker per batch) can push
+# thousands of small bases through without paying for a Python session per basis:
+#   - nothing but the standard library is imported at startup: the backend module (NumPy
+#     for ours, fpylll for fplll's) is imported when the first basis for it arrives, so
+#     `reduce --help` and a worker that ends up with no input take milliseconds
+#   - each basis is reduced and written (one flushed line) before the next one is read
+#
+# Input, one record after another (blank lines and lines starting with # are skipped):
+#   [[1, 2, 3], [4, 5, 6], [7, 8, 10]]              a JSON list of rows, on one line
+#   {"id": "x1", "basis": [[...]], "blocksize": 20}  a JSON object: the basis under "basis",
+#                                                    "algorithm" / "delta" / "blocksize"
+#                                                    override the command line for it, any
+#                                                    other keys are copied to the output
+#   [[1 2 3]                                         fplll's text format (what printing an
+#   [4 5 6]                                          IntegerMatrix gives), over any number
+#   [7 8 10]]                                        of lines
+# Output: one JSON object per line, the record's own keys plus "index" (position in the
+# input, counting across all files), "basis" (the reduced rows, integers) and "time", or
+# "error" if that record failed; the exit status is 1 if any record did.
+#
+# Usage:
+#   reduce bases.jsonl > reduced.jsonl
+#   cat bases.jsonl | reduce --algorithm bkz --blocksize 20
+#   reduce a.txt b.txt --algorithm fpylll-lll --delta 0.99 --workers 4
+#   reduce --algorithm auto-lll                  # backend picked per basis, see dispatch.py
+# after `pip install -e .` (see pyproject.toml), or python -m lattice_reduction.reduce ...
+# With --workers the results come out in the order they finish, "index" says which is which.
+
+import argparse
+import contextlib
+import json
+import re
+import sys
+import time
+from numbers import Integral
+
+
+def _lll(basis, delta, blocksize):
+    from .LLL import LLL_alg
+    return LLL_alg(basis, delta)
+
+
+def _lll_adaptive(basis, delta, blocksize):
+    # exact integer basis, for entries past 2^53 (see lll_precision.py)
+    from .lll_precision import LLL_adaptive
+    return LLL_adaptive(basis, delta)[0]
+
+
+def _deep_lll(basis, delta, blocksize):
+    # blocksize doubles as the insertion depth here
+    from .deep_lll import DeepLLL_alg
+    return DeepLLL_alg(basis, delta, blocksize)
+
+
+def _pot_lll(basis, delta, blocksize):
+    from .deep_lll import PotLLL_alg
+    return PotLLL_alg(basis, delta)
+
+
+def _bkz(basis, delta, blocksize):
+    from .bkz import BKZ_alg
+    return BKZ_alg(basis, blocksize, delta)
+
+
+def _progressive(basis, delta, blocksize):
+    from .progressive import Progressive_alg
+    return Progressive_alg(basis, blocksize, delta)[0]
+
+
+def _recursive(basis, delta, blocksize):
+    from .recursive_reduction import Recursive_alg
+    return Recursive_alg(basis, blocksize, delta)[0]
+
+
+def _fpylll_lll(basis, delta, blocksize):
+    from fpylll import LLL, IntegerMatrix
+    A = IntegerMatrix.from_matrix(basis)
+    LLL.reduction(A, delta)
+    return A
+
+
+def _fpylll_bkz(basis, delta, blocksize):
+    from fpylll import BKZ, IntegerMatrix
+    A = IntegerMatrix.from_matrix(basis)
+    BKZ.reduction(A, BKZ.Param(block_size=blocksize, delta=delta))
+    return A
+
+
+def _auto_lll(basis, delta, blocksize):
+    # whichever backend the calibration says is fastest (see dispatch.py)
+    from . import dispatch
+    return dispatch.reduce(basis, "lll", delta)[0]
+
+
+def _auto_bkz(basis, delta, blocksize):
+    from . import dispatch
+    return dispatch.reduce(basis, "bkz", delta, blocksize)[0]
+
+
+# name -> function(basis rows, delta, blocksize) returning the reduced basis; each one
+# imports its backend on first use
+ALGORITHMS = {
+    "lll": _lll,
+    "lll-adaptive": _lll_adaptive,
+    "deep-lll": _deep_lll,
+    "pot-lll": _pot_lll,
+    "bkz": _bkz,
+    "progressive": _progressive,
+    "recursive": _recursive,
+    "fpylll-lll": _fpylll_lll,
+    "fpylll-bkz": _fpylll_bkz,
+    "auto-lll": _auto_lll,
+    "auto-bkz": _auto_bkz,
+}
+
+_ROW = re.compile(r"\[([^\[\]]*)\]")
+
+
+def parse_fplll(text):
+    """
+    Rows of a matrix in fplll's text format, "[[1 2 3]\n[4 5 6]\n]".
+    """
+    rows = [[int(x) for x in row.split()] for row in _ROW.findall(text)]
+    if not rows or any(len(row) != len(rows[0]) for row in rows):
+        raise ValueError(f"not a matrix: {text[:40]!r}")
+    return rows
+
+
+def read_records(lines):
+    """
+    The records in an iterable of input lines (see the top of the file), each a dict with
+    the basis under "basis", or with "error" for input that could not be read.
+    """
+    pending = []
+    for line in lines:
+        if not pending and (not line.strip() or line.lstrip().startswith("#")):
+            continue
+        pending.append(line)
+        text = "".join(pending).strip()
+        try:
+            record = json.loads(text)
+        except ValueError:
+            # an fplll matrix carries on until its brackets close
+            if text.count("[") > text.count("]"):
+                continue
+            try:
+                record = parse_fplll(text)
+            except ValueError as e:
+                record = {"error": str(e)}
+        pending = []
+        if isinstance(record, list):
+            record = {"basis": record}
+        elif not isinstance(record, dict) or "basis" not in record and "error" not in record:
+            record = {"error": f"no basis in {text[:40]!r}"}
+        yield record
+    if pending:
+        yield {"error": f"unterminated matrix: {''.join(pending).strip()[:40]!r}"}
+
+
+def _integer_rows(basis):
+    # the engines return float rows, LLL_adaptive integer ones, fpylll an IntegerMatrix
+    if hasattr(basis, "nrows"):
+        basis = [[basis[i, j] for j in range(basis.ncols)] for i in range(basis.nrows)]
+    return [[int(x) if isinstance(x, Integral) else int(round(x)) for x in row] for row in basis]
+
+
+def reduce_record(job):
+    """
+    Reduces one record; job is (index, record, defaults) with defaults the command line's
+    algorithm, delta and blocksize. Returns the output record.
+    """
+    index, record, defaults = job
+    out = {k: v for k, v in record.items() if k != "basis"}
+    out["index"] = index
+    if "error" in record:
+        return out
+    options = {k: record.get(k, v) for k, v in defaults.items()}
+    if options["algorithm"] not in ALGORITHMS:
+        out["error"] = f"unknown algorithm {options['algorithm']!r}"
+        return out
+    start = time.perf_counter()
+    try:
+        # the backends print progress; stdout is the output stream, so that goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            reduced = ALGORITHMS[options["algorithm"]](record["basis"], options["delta"],
+                                                       options["blocksize"])
+        out["basis"] = _integer_rows(reduced)
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    out["time"] = time.perf_counter() - start
+    return out
+
+
+def _input_lines(paths):
+    for path in paths or ["-"]:
+        if path == "-":
+            yield from sys.stdin
+        else:
+            with open(path) as f:
+                yield from f
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reduce a stream of lattice bases.")
+    parser.add_argument("files", nargs="*", help="input files (default, or -: stdin)")
+    parser.add_argument("--algorithm", "-a", choices=sorted(ALGORITHMS), default="lll")
+    parser.add_argument("--delta", type=float, default=0.99)
+    parser.add_argument("--blocksize", "-b", type=int, default=20)
+    parser.add_argument("--workers", "-j", type=int, default=1,
+                        help="reduce this many bases at once, in separate processes")
+    args = parser.parse_args(argv)
+
+    defaults = {"algorithm": args.algorithm, "delta": args.delta, "blocksize": args.blocksize}
+    jobs = ((i, record, defaults) for i, record in enumerate(read_records(_input_lines(args.files))))
+
+    failed = False
+    with contextlib.ExitStack() as stack:
+        if args.workers > 1:
+            from multiprocessing import Pool
+            pool = stack.enter_context(Pool(args.workers))
+            results = pool.imap_unordered(reduce_record, jobs)
+        else:
+            results = map(reduce_record, jobs)
+        for out in results:
+            failed = failed or "error" in out
+            print(json.dumps(out), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+# Content-addressed cache of reduced bases
+# Sweeps and reruns of bkz_comparison.py reduce the same matrices with the same settings
+# over and over. Every result is stored under
+#   sha256(input basis) + the reduction parameters (algorithm, blocksize, delta, ...)
+# so the second time round the reduced basis comes straight off the disk. Laid out like
+# the Darmstadt challenge cache (darmstadtchallengepull.py):
+#   <cache>/<key>.npz      the reduced basis and its summary (same file format as a
+#                          checkpoint, see checkpoint.py)
+#   <cache>/index.json     key -> input basis hash, parameters, size and last use, for the
+#                          warm start lookups and the LRU eviction
+# An entry's file name is its key, so a lookup only needs the file to exist: a lost update
+# of the index (two workers writing it at once) costs at most a warm start or an eviction.
+#
+# Warm start: a BKZ-beta run on a basis with no cached BKZ-beta result can start from a
+# cached BKZ-beta' result (beta' < beta, the largest there is, same other parameters)
+# instead of from LLL; the tours it saves are the ones BKZ-beta' already did.
+#
+# The cache directory is $REDUCTION_CACHE if set, otherwise ~/.cache/lattice_reductions
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from .checkpoint import load_checkpoint, save_checkpoint
+from .instrumentation import gsa_slope, gso_profile, root_hermite_factor
+from .qary import QaryLattice
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "REDUCTION_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "lattice_reductions"))
+
+# total size of the cached bases; beyond it the least recently used go first
+DEFAULT_MAX_BYTES = 2 * 2 ** 30
+
+
+def _as_array(basis):
+    # IntegerMatrix, QaryLattice, list of rows or array -> integer numpy array
+    if isinstance(basis, QaryLattice):
+        return basis.basis()
+    if hasattr(basis, "nrows"):
+        basis = [[basis[i, j] for j in range(basis.ncols)] for i in range(basis.nrows)]
+    A = np.asarray(basis)
+    if A.dtype.kind == "f":
+        A = np.rint(A)
+    try:
+        return A.astype(np.int64)
+    except OverflowError:
+        return np.array([[int(v) for v in row] for row in A], dtype=object)
+
+
+def basis_digest(basis):
+    """
+    SHA-256 of a basis: its shape and its integer entries.
+    """
+    A = _as_array(basis)
+    h = hashlib.sha256(repr(A.shape).encode())
+    h.update(A.tobytes() if A.dtype != object else repr(A.tolist()).encode())
+    return h.hexdigest()
+
+
+def _entry_key(digest, params):
+    return hashlib.sha256((digest + json.dumps(params, sort_keys=True)).encode()).hexdigest()
+
+
+def _read_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "index.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_index(cache_dir, index):
+    # write then rename, so a crash never leaves a half-written index behind
+    tmp = os.path.join(cache_dir, f"index.json.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, os.path.join(cache_dir, "index.json"))
+
+
+def _touch(cache_dir, key):
+    index = _read_index(cache_dir)
+    if key in index:
+        index[key]["used"] = time.time()
+        _write_index(cache_dir, index)
+
+
+def summarize(r, **counts):
+    """
+    The summary stored with a reduced basis: GSO slope and root Hermite factor from the
+    squared GSO norms r, plus whatever counts are passed (time, tours, ...).
+    """
+    profile = gso_profile(r)
+    summary = {"slope": gsa_slope(profile), "rhf": root_hermite_factor(profile)}
+    summary.update(counts)
+    return summary
+
+
+def cache_lookup(basis, params, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    The cached result for reducing basis with params (a JSON-able dict), or None.
+    Returns (reduced basis as an integer array, summary dict).
+    """
+    key = _entry_key(basis_digest(basis), params)
+    path = os.path.join(cache_dir, key + ".npz")
+    if not os.path.exists(path):
+        return None
+    reduced, summary = load_checkpoint(path)
+    _touch(cache_dir, key)
+    return reduced, summary
+
+
+def cache_store(basis, params, reduced, summary, cache_dir=DEFAULT_CACHE_DIR,
+                max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Stores the reduced basis and its summary under (basis, params), then evicts the least
+    recently used entries while the cache is over max_bytes.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = basis_digest(basis)
+    key = _entry_key(digest, params)
+    path = os.path.join(cache_dir, key + ".npz")
+    save_checkpoint(path, reduced, summary)
+
+    index = _read_index(cache_dir)
+    index[key] = {"basis": digest, "params": params, "bytes": os.path.getsize(path), "used": time.time()}
+    total = sum(entry["bytes"] for entry in index.values())
+    for old in sorted(index, key=lambda k: index[k]["used"]):
+        if total <= max_bytes or old == key:
+            break
+        total -= index[old]["bytes"]
+        del index[old]
+        try:
+            os.remove(os.path.join(cache_dir, old + ".npz"))
+        except FileNotFoundError:
+            pass
+    _write_index(cache_dir, index)
+
+
+def warm_start_lookup(basis, params, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    For a BKZ run (params with a "blocksize"): the cached result on the same basis with
+    the largest smaller blocksize and otherwise the same parameters, or None.
+    Returns (reduced basis as an integer array, its blocksize).
+    """
+    digest = basis_digest(basis)
+    others = {k: v for k, v in params.items() if k != "blocksize"}
+    best = None
+    for key, entry in _read_index(cache_dir).items():
+        cached = entry["params"]
+        if entry["basis"] != digest or cached.get("blocksize") is None:
+            continue
+        if cached["blocksize"] >= params["blocksize"]:
+            continue
+        if {k: v for k, v in cached.items() if k != "blocksize"} != others:
+            continue
+        if best is None or cached["blocksize"] > best[1]:
+            best = (key, cached["blocksize"])
+    if best is None or not os.path.exists(os.path.join(cache_dir, best[0] + ".npz")):
+        return None
+    reduced, _ = load_checkpoint(os.path.join(cache_dir, best[0] + ".npz"))
+    _touch(cache_dir, best[0])
+    return reduced, best[1]
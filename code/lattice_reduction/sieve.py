@@ -0,0 +1,163 @@
+# Sieving as the SVP oracle, in NumPy
+# Same contract as find_shortest_vector (bkz.py): it works on the GSO of the projected block
+# (Mu, r) and returns the integer coefficients x of a short block vector and its squared
+# projected length, so BKZ_alg / Recursive_alg can use it in place of enumeration.
+#
+# Enumeration is cheap in memory but its time grows like 2^(m^2/8) ... 2^(m log m); a sieve
+# keeps a list (the "database") of about (4/3)^(m/2) lattice vectors and keeps replacing the
+# longest ones by short differences v - w of pairs of them, which takes 2^(0.3 m) or so.
+# The database is two contiguous arrays, updated a whole batch at a time:
+#   X : int64, N x m     the coefficients of each vector in the block basis
+#   Y : float32, N x m   the vectors themselves in GSO coordinates, Y = X L with
+#                        L = Mu * sqrt(r), so that <v, w> = Y_v . Y_w
+# Y is always recomputed from X (exact integers), so float32 rounding never builds up.
+#
+# Each pass (Nguyen-Vidick style, with the buckets of Becker-Gama-Joux's sieve):
+#   - pick random database vectors as bucket centres, and put in each bucket the vectors
+#     at the smallest angle to its centre (up to sign). This is the locality-sensitive
+#     step: a pass only compares vectors that share a bucket, instead of all N^2 pairs,
+#     and vectors at a small angle are the ones whose difference is short
+#   - inside a bucket all the pairs at once: the bucket's Gram matrix is one matrix
+#     product, and ||v - w||^2 = ||v||^2 + ||w||^2 - 2<v, w> for all pairs from it
+#   - the short differences replace the longest database vectors (duplicates dropped)
+# until the database is saturated: it holds half the vectors the Gaussian heuristic
+# expects below sqrt(4/3) GH, which is when a sieve has found (about) all short vectors.
+
+import numpy as np
+
+from .enumeration import enumerate_svp, gaussian_heuristic
+
+# below this block size enumeration is faster than setting up a sieve
+SIEVE_MIN_DIM = 30
+
+
+def database_size(m, max_memory_mb=None):
+    """
+    Number of vectors to keep for a rank m sieve: 3.2 (4/3)^(m/2) (the size G6K uses),
+    capped so that X and Y together stay under max_memory_mb.
+    """
+    size = max(int(3.2 * (4 / 3) ** (m / 2)), 8 * m)
+    if max_memory_mb is not None:
+        bytes_per_vector = m * (8 + 4) + 8
+        size = min(size, int(max_memory_mb * 2 ** 20 / bytes_per_vector))
+    return size
+
+
+def _canonical(X):
+    # v and -v are the same for a sieve: keep the one whose first nonzero coefficient is > 0
+    first = X[np.arange(len(X)), np.argmax(X != 0, axis=1)]
+    return X * np.where(first < 0, -1, 1)[:, None]
+
+
+def _sample(L, Mu, count, rng):
+    # Random tail coefficients, the head found by Babai's nearest plane (size reduction), so
+    # the samples are spread out but not much longer than the basis vectors themselves
+    m = len(L)
+    tail = min(m, 12)
+    X = np.zeros((count, m), dtype=np.int64)
+    X[:, m - tail:] = rng.integers(-2, 3, size=(count, tail))
+    for j in range(m - tail - 1, -1, -1):
+        center = -(X[:, j + 1:] @ Mu[j + 1:, j])
+        X[:, j] = np.rint(center)
+    return X
+
+
+def _keep_shortest(X, L, size, hash_weights):
+    # the `size` shortest distinct nonzero vectors of X, sorted by length. Duplicates are
+    # found on a random 64 bit hash of the coefficients (one integer per vector) instead of
+    # comparing whole rows, which is what makes this cheap
+    X = _canonical(X[X.any(axis=1)])
+    X = X[np.unique(X @ hash_weights, return_index=True)[1]]
+    Y = X @ L
+    norms = np.einsum("ij,ij->i", Y, Y)
+    keep = np.argsort(norms)[:size]
+    return X[keep], Y[keep].astype(np.float32), norms[keep]
+
+
+def _bucket_pairs(Xb, Yb, norms_b, pairs, threshold, limit):
+    # all pairs v, w of one bucket (signs already aligned): the differences v - w shorter
+    # than threshold, at most `limit` of them (the shortest). pairs = np.triu_indices of
+    # the bucket size, made once per sieve
+    gram = Yb @ Yb.T
+    i, j = pairs
+    diff = norms_b[i] + norms_b[j] - 2 * gram[i, j]
+    short = np.flatnonzero(diff < threshold)
+    if len(short) > limit:
+        short = short[np.argpartition(diff[short], limit)[:limit]]
+    return Xb[i[short]] - Xb[j[short]]
+
+
+def sieve_svp(Mu, r, radius_sq=None, max_memory_mb=None, max_passes=200, seed=None):
+    """
+    Finds a shortest (in practice: the shortest) nonzero vector of the projected block with
+    GSO (Mu, r), by sieving. Blocks smaller than SIEVE_MIN_DIM go to enumerate_svp.
+    radius_sq:      only vectors shorter than this are returned; by default r[0], which
+                    b_0 itself reaches, so BKZ always gets its best vector back
+    max_memory_mb:  cap on the database (X and Y) size; a smaller database sieves faster
+                    but saturates less, so the vector found can be longer
+    max_passes:     give up after this many passes even if not saturated
+    seed:           for the sampler and the bucket centres (a fixed seed, same result)
+    Returns (x, norm_sq) like enumerate_svp, or None if nothing shorter than radius_sq was found.
+    """
+    m = len(r)
+    if radius_sq is None:
+        radius_sq = float(r[0])
+    if m < SIEVE_MIN_DIM:
+        # as find_shortest_vector: the Gaussian heuristic radius first
+        result = enumerate_svp(Mu, r, min(radius_sq, 1.1 * gaussian_heuristic(r)))
+        return result if result is not None else enumerate_svp(Mu, r, radius_sq)
+
+    rng = np.random.default_rng(seed)
+    Mu = np.tril(np.asarray(Mu, dtype=float), -1) + np.eye(m)
+    L = Mu * np.sqrt(np.asarray(r, dtype=float))
+    size = database_size(m, max_memory_mb)
+
+    # saturation target: half the vectors GH expects inside sqrt(4/3) GH (counting v and -v
+    # once), or as many as a capped database can hold
+    sat_radius = 4 / 3 * gaussian_heuristic(r)
+    sat_count = min(0.5 * (4 / 3) ** (m / 2), size / 2)
+
+    # start from the basis vectors themselves and samples around them
+    hash_weights = rng.integers(-2 ** 62, 2 ** 62, size=m)
+    X, Y, norms = _keep_shortest(np.vstack([np.eye(m, dtype=np.int64), _sample(L, Mu, size, rng)]),
+                                 L, size, hash_weights)
+
+    bucket_size = min(len(X), max(32, int(4 * np.sqrt(len(X)))))
+    pairs = np.triu_indices(bucket_size, 1)
+    stale = 0
+    for _ in range(max_passes):
+        if np.count_nonzero(norms <= sat_radius) >= sat_count:
+            break
+        n = len(X)
+        # a vector only helps if it beats the longest one we keep
+        threshold = norms[-1] if n >= size else np.inf
+        directions = Y / np.sqrt(norms)[:, None].astype(np.float32)
+        centres = directions[rng.choice(n, size=max(1, 2 * n // bucket_size), replace=False)]
+        cosines = directions @ centres.T
+
+        new = []
+        for c in range(len(centres)):
+            members = np.argpartition(-np.abs(cosines[:, c]), bucket_size - 1)[:bucket_size]
+            signs = np.where(cosines[members, c] < 0, -1, 1)
+            new.append(_bucket_pairs(X[members] * signs[:, None], Y[members] * signs[:, None].astype(np.float32),
+                                     norms[members], pairs, threshold, bucket_size))
+        new = np.vstack(new)
+        if not len(new):
+            stale += 1
+            if stale >= 3:
+                break
+            continue
+
+        before = norms.sum()
+        X, Y, norms = _keep_shortest(np.vstack([X, new]), L, size, hash_weights)
+        stale = stale + 1 if norms.sum() >= before else 0
+        if stale >= 3:
+            break
+
+    # the exact length of the best one, from the integer coefficients
+    x = X[0]
+    v = x @ L
+    norm_sq = float(v @ v)
+    if norm_sq >= radius_sq:
+        return None
+    return [int(c) for c in x], norm_sq
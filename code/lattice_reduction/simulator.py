@@ -0,0 +1,273 @@
+# BKZ simulator: predict the outcome of a BKZ run from the LLL profile, before running it
+# A real BKZ-60 run in bkz_comparison.py can take hours; the simulator takes milliseconds,
+# so a sweep can check first which (dim, blocksize, tours) are worth it.
+#
+# Everything is on the profile l_i = log ||b_i*|| (natural log, the same profile as
+# instrumentation.gso_profile, so predictions and measured tour events line up directly):
+#   - Chen-Nguyen (BKZ 2.0, Asiacrypt 2011): in every window [k, k + beta) the SVP oracle is
+#     assumed to find a vector of the Gaussian heuristic length of the projected block,
+#       l'_k = log vol(block) / beta + log GH_beta,
+#     and to insert it if that beats l_k. Once a window has improved, every later window of
+#     the tour is assumed to as well. The volume is kept, so what b_k gains the rest pays
+#     for. The last (up to 45) vectors are taken to be HKZ reduced, with the average HKZ
+#     shape of CN11's table, since the Gaussian heuristic is off in small dimension.
+#   - Bai-Stehle-Wen (Asiacrypt 2018), simulate(..., probabilistic=True): the vector found
+#     is as long as GH times a random factor (x^(1/beta), x exponentially distributed, so
+#     some windows do better than GH and some worse), and the loss is spread over
+#     the rest of the block instead of the rest of the basis. It reproduces the "head
+#     concavity" of real profiles; average several trials.
+#
+# Tours stop when a tour changes nothing, after max_tours, or with auto_abort on the same
+# GSA slope rule as fplll's BKZ.AUTO_ABORT (what run_bkz2 uses), so the tour count is
+# comparable to the real one.
+#
+# calibrate() runs the simulation next to the tour events of a real run (the hook of
+# BKZ_alg / run_bkz2, see instrumentation.py) and reports how far off it is, per tour.
+#
+# Usage:
+#   profile = initial_profile(LLL_alg(basis))          # or a GSO.Mat, IntegerMatrix, r
+#   prediction = simulate(profile, 60, max_tours=8)
+#   print(prediction["norm"], prediction["tours"], prediction["rhf"])
+
+import time
+from math import exp, lgamma, log, pi
+
+import numpy as np
+
+from .instrumentation import gsa_slope, gso_profile, root_hermite_factor
+from .lll_engine import gso_init
+
+# Average log2 ||b_k*|| of an HKZ reduced random 45-dimensional lattice of volume 1
+# (Chen-Nguyen 2011, Algorithm 2, line 2), here in natural log
+HKZ_PROFILE = [v * log(2) for v in (
+    0.789527997160000, 0.780003183804613, 0.750872218594458, 0.706520454592593,
+    0.696345241018901, 0.660533841808400, 0.626274718790505, 0.581480717333169,
+    0.553171463433503, 0.520811087419712, 0.487994338534253, 0.459541470573431,
+    0.414638319529319, 0.392811729940846, 0.339090376264829, 0.306561491936042,
+    0.276041187709516, 0.236698863270441, 0.196186341673080, 0.161214212092249,
+    0.110895134828114, 0.0678261623920553, 0.0272807162335610, -0.0234609979600137,
+    -0.0320527224746912, -0.0940331032784437, -0.129109087817554, -0.176965384290173,
+    -0.209405754915959, -0.265867993276493, -0.299031324494802, -0.349338597048432,
+    -0.380428160303508, -0.427399405474537, -0.474944677694975, -0.530140672818150,
+    -0.561625221138784, -0.612008793872032, -0.669011014635905, -0.713766731570930,
+    -0.754041787011810, -0.808609696192079, -0.859933249032210, -0.884479963601658,
+    -0.886666930030433)]
+
+# A tour counts as making progress only if some window gains more than this (in log
+# ||b_k*||): real BKZ inserts below delta ||b_i*|| (bkz_tour, delta = 0.99 in our runs), and
+# without a threshold the simulated tours never come out clean
+MIN_GAIN = -log(0.99)
+
+
+def log_gh(m):
+    """
+    log of the Gaussian heuristic length of a volume 1 lattice of dimension m: from the HKZ
+    table up to 45 (where the heuristic itself is off), the usual formula above.
+    """
+    if m <= len(HKZ_PROFILE):
+        tail = HKZ_PROFILE[-m:]
+        return tail[0] - sum(tail) / m
+    return lgamma(m / 2 + 1) / m - log(pi) / 2
+
+
+def initial_profile(basis):
+    """
+    The profile log ||b_i*|| to start a simulation from: basis is a GSO.Mat, an
+    IntegerMatrix, a reduced basis as LLL_alg returns it (list of rows) or the squared GSO
+    norms r themselves (a 1-d array).
+    """
+    if hasattr(basis, "update_gso"):
+        basis.update_gso()
+        return gso_profile(basis.r())
+    if hasattr(basis, "nrows"):
+        basis = [[basis[i, j] for j in range(basis.ncols)] for i in range(basis.nrows)]
+    A = np.asarray(basis, dtype=float)
+    if A.ndim == 1:
+        return gso_profile(A)
+    _, r = gso_init(A)
+    return gso_profile(r)
+
+
+def _cn11_tour(l, beta, ghs):
+    # one Chen-Nguyen tour on the profile l (a list), returns the new profile and whether
+    # some window gained more than MIN_GAIN
+    d = len(l)
+    tail = min(len(HKZ_PROFILE), beta, d)
+    new = list(l)
+    changed = False
+    progress = False
+    # log vol of the projected window [k, f): sum of l over [0, f) minus the new l'_0..l'_{k-1}
+    prefix_new = 0.0
+    f_sum = sum(l[:min(beta, d)])
+    for k in range(d - tail):
+        f = min(k + beta, d)
+        log_vol = f_sum - prefix_new
+        guess = log_vol / (f - k) + ghs[f - k]
+        if changed or guess < l[k]:
+            new[k] = guess
+            changed = True
+            progress = progress or guess < l[k] - MIN_GAIN
+        prefix_new += new[k]
+        if f < d:
+            f_sum += l[f]
+    # the last `tail` vectors: HKZ shaped, with whatever volume is left
+    # (the shape is centred, since only the 45 entries together have volume 1)
+    log_vol = sum(l) - prefix_new
+    shape = HKZ_PROFILE[-tail:]
+    offset = (log_vol - sum(shape)) / tail
+    for k in range(d - tail, d):
+        new[k] = offset + shape[k - d + tail]
+    return new, progress
+
+
+def _bsw18_tour(l, beta, ghs, rng, touched):
+    # one Bai-Stehle-Wen tour: same windows, a random length for the vector found, and the
+    # loss spread over the rest of its block. touched[k]: the window at k changed last tour
+    d = len(l)
+    tail = min(len(HKZ_PROFILE), beta, d)
+    r1 = list(l)
+    r2 = list(l)
+    now = [False] * d
+    progress = False
+    for k in range(d - tail):
+        m = min(beta, d - k)
+        f = k + m
+        if any(touched[k:f]):
+            # r1 and r2 agree before k, so this is sum(r1[:f]) - sum(r2[:k])
+            log_vol = sum(r1[k:f])
+            # the random factor on the GH length, x ~ Exp(1/2), as in fpylll's BSW18 simulator
+            guess = (log(rng.exponential(2.0)) + log_vol) / m + ghs[m]
+            if guess < r1[k]:
+                progress = progress or guess < r1[k] - MIN_GAIN
+                r2[k] = guess
+                r2[k + 1] = r1[k] + log(1 - 1 / m) / 2
+                loss = (r1[k] - guess) + (r1[k + 1] - r2[k + 1])
+                for j in range(k + 2, f):
+                    r2[j] = r1[j] + loss / (m - 2)
+                    now[j] = True
+        r1[k:f] = r2[k:f]
+    log_vol = sum(r1) - sum(r2[:d - tail])
+    shape = HKZ_PROFILE[-tail:]
+    offset = (log_vol - sum(shape)) / tail
+    for k in range(d - tail, d):
+        r2[k] = offset + shape[k - d + tail]
+        now[k] = True
+    return r2, progress, now
+
+
+def _simulate_tours(l, beta, ghs, max_tours, auto_abort, rng=None, per_tour=None, stop_clean=True):
+    # the tour loop of simulate; per_tour, if a list, gets the profile after every tour
+    touched = [True] * len(l)
+    best = None
+    stalled = 0
+    tours = 0
+    while tours < max_tours:
+        if rng is None:
+            l, changed = _cn11_tour(l, beta, ghs)
+        else:
+            l, changed, touched = _bsw18_tour(l, beta, ghs, rng, touched)
+        tours += 1
+        if per_tour is not None:
+            per_tour.append(l)
+        if not changed and stop_clean:
+            break
+        if auto_abort:
+            # fplll's rule (scale 1, 5 tours): |slope| has to hit a new low to count as progress
+            slope = -gsa_slope(l)
+            if best is None or slope < best:
+                stalled = 0
+                best = slope
+            else:
+                stalled += 1
+                if stalled >= 5:
+                    break
+    return l, tours
+
+
+def simulate(profile, blocksize, max_tours=None, auto_abort=True, probabilistic=False,
+             trials=10, seed=None):
+    """
+    Predicts BKZ-blocksize on a basis with the given profile (log ||b_i*||, e.g. from
+    initial_profile).
+    max_tours:      at most this many tours (default: the dimension)
+    auto_abort:     stop as fplll's BKZ.AUTO_ABORT does (no slope progress in 5 tours)
+    probabilistic:  the Bai-Stehle-Wen simulator, averaged over `trials` runs seeded from seed
+                    (its random windows rarely give a clean tour, so set max_tours)
+    Returns a dict: profile (predicted log ||b_i*||), tours, norm (predicted ||b_0||),
+    slope, rhf, and time (seconds the simulation took).
+    """
+    start = time.perf_counter()
+    l = [float(v) for v in profile]
+    d = len(l)
+    beta = min(blocksize, d)
+    max_tours = max_tours or d
+    ghs = [0.0] + [log_gh(m) for m in range(1, beta + 1)]
+
+    if probabilistic:
+        rng = np.random.default_rng(seed)
+        runs = [_simulate_tours(l, beta, ghs, max_tours, auto_abort, rng) for _ in range(trials)]
+        final = list(np.mean([run[0] for run in runs], axis=0))
+        tours = sum(run[1] for run in runs) / trials
+    else:
+        final, tours = _simulate_tours(l, beta, ghs, max_tours, auto_abort)
+
+    return {"profile": final, "tours": tours, "norm": exp(final[0]),
+            "slope": gsa_slope(final), "rhf": root_hermite_factor(final),
+            "time": time.perf_counter() - start}
+
+
+def calibrate(events, blocksize, probabilistic=False, seed=None):
+    """
+    Compares the simulator with a real run: events are the run's hook events (an EventLog
+    of BKZ_alg, run_bkz2, ...), starting with its "lll" event. The simulation starts from
+    the LLL profile and runs as many tours as the real run did, and each tour is compared
+    with the measured one.
+    Returns a dict: "tours" (a list with, per tour, the predicted and measured log ||b_0||,
+    slope and RHF and the RMS difference of the profiles), "predicted_tours" (when the
+    simulator would have stopped by itself) and "measured_tours".
+    """
+    events = list(events)
+    start = next(e for e in events if e["phase"] == "lll")
+    measured = [e for e in events if e["phase"] == "tour"]
+    d = len(start["profile"])
+    beta = min(blocksize, d)
+    ghs = [0.0] + [log_gh(m) for m in range(1, beta + 1)]
+    rng = np.random.default_rng(seed) if probabilistic else None
+
+    predicted = []
+    _simulate_tours(list(start["profile"]), beta, ghs, len(measured), False, rng, predicted, False)
+    rows = []
+    for event, profile in zip(measured, predicted):
+        rows.append({"tour": event["index"],
+                     "log_norm": profile[0], "measured_log_norm": event["profile"][0],
+                     "slope": gsa_slope(profile), "measured_slope": event["slope"],
+                     "rhf": root_hermite_factor(profile), "measured_rhf": event["rhf"],
+                     "profile_rms": float(np.sqrt(np.mean((np.array(profile) - event["profile"]) ** 2)))})
+    _, tours = _simulate_tours(list(start["profile"]), beta, ghs, d, True, rng)
+    return {"tours": rows, "predicted_tours": tours, "measured_tours": len(measured)}
+
+
+if __name__ == "__main__":
+    # How fast is it at dimension 200, and how close on a run we can actually do
+    from fpylll import FPLLL, GSO, IntegerMatrix, LLL
+
+    from .bkz_comparison import run_bkz2
+    from .instrumentation import EventLog
+
+    FPLLL.set_random_seed(0)
+    A = LLL.reduction(IntegerMatrix.random(200, "qary", k=100, bits=30))
+    profile = initial_profile(GSO.Mat(A))
+    for beta in (20, 40, 60, 80):
+        prediction = simulate(profile, beta, max_tours=8)
+        print(f"d=200 BKZ-{beta}: ||b_0|| ~ {prediction['norm']:.4g}, rhf {prediction['rhf']:.5f}, "
+              f"{prediction['tours']} tours, simulated in {prediction['time'] * 1000:.1f} ms")
+
+    A = IntegerMatrix.random(80, "qary", k=40, bits=20)
+    events = EventLog()
+    run_bkz2(A, 30, max_loops=8, hook=events)
+    report = calibrate(events, 30)
+    for row in report["tours"]:
+        print(f"tour {row['tour']}: log||b_0|| predicted {row['log_norm']:.3f} measured "
+              f"{row['measured_log_norm']:.3f}, rhf {row['rhf']:.5f} vs {row['measured_rhf']:.5f}, "
+              f"profile rms {row['profile_rms']:.3f}")
+    print(f"tours: predicted {report['predicted_tours']}, measured {report['measured_tours']}")
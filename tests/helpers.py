@@ -0,0 +1,117 @@
+# Exact checks the tests share: the GSO in Fractions and the lattice comparison in Python
+# ints, so that a check never depends on the floating point the code under test uses.
+
+import random
+from fractions import Fraction
+
+import numpy as np
+
+from lattice_reduction.lll_engine import gso_init
+
+# the modulus same_lattice solves for the transform in
+_PRIME = 2 ** 127 - 1
+
+
+def integer_rows(basis):
+    # lists of Python ints from float or integer rows (the engines hold integers either way)
+    return [[int(round(a)) for a in row] for row in basis]
+
+
+def exact_gso(basis):
+    return gso_init(np.array(integer_rows(basis), dtype=object), object)
+
+
+def is_lll_reduced(basis, delta, eta=Fraction(51, 100)):
+    """
+    Size-reduced up to eta (the float engines round Mu, so not quite 1/2) and the Lovasz
+    condition at delta, on the exact GSO.
+    """
+    Mu, r = exact_gso(basis)
+    d = len(r)
+    delta = Fraction(delta) - Fraction(1, 10 ** 9)
+    if any(abs(Mu[i, j]) > eta for i in range(d) for j in range(i)):
+        return False
+    return all(r[k] >= (delta - Mu[k, k - 1] ** 2) * r[k - 1] for k in range(1, d))
+
+
+def _det(M):
+    # Bareiss: fraction-free elimination, exact on Python ints
+    M = [list(row) for row in M]
+    d, sign, prev = len(M), 1, 1
+    for c in range(d - 1):
+        p = next((k for k in range(c, d) if M[k][c]), None)
+        if p is None:
+            return 0
+        if p != c:
+            M[c], M[p] = M[p], M[c]
+            sign = -sign
+        for i in range(c + 1, d):
+            M[i] = [(M[c][c] * M[i][j] - M[i][c] * M[c][j]) // prev if j > c else 0 for j in range(d)]
+        prev = M[c][c]
+    return sign * M[-1][-1]
+
+
+def _solve_mod_p(R, T):
+    # U with U R = T modulo _PRIME (R square), entries lifted to (-p/2, p/2)
+    p, d = _PRIME, len(R)
+    S = [[R[j][i] % p for j in range(d)] + [T[j][i] % p for j in range(d)] for i in range(d)]
+    for c in range(d):
+        k = next(k for k in range(c, d) if S[k][c])
+        S[c], S[k] = S[k], S[c]
+        inv = pow(S[c][c], -1, p)
+        S[c] = [a * inv % p for a in S[c]]
+        for k in range(d):
+            if k != c and S[k][c]:
+                f = S[k][c]
+                S[k] = [(a - f * b) % p for a, b in zip(S[k], S[c])]
+    return [[S[i][d + j] - p if S[i][d + j] > p // 2 else S[i][d + j] for i in range(d)]
+            for j in range(d)]
+
+
+def same_lattice(basis, reduced):
+    """
+    Whether two square bases span the same lattice: the same |det|, and reduced = U basis
+    for an integer U (solved for mod a large prime and checked over the integers; a U with
+    entries past 2^126 would fail the check, which no reduction here gets near).
+    """
+    R, T = integer_rows(basis), integer_rows(reduced)
+    if len(R) != len(T) or abs(_det(R)) != abs(_det(T)):
+        return False
+    U = _solve_mod_p(R, T)
+    return all(sum(u * r[j] for u, r in zip(row, R)) == t[j]
+               for row, t in zip(U, T) for j in range(len(t)))
+
+
+def random_basis(d, bits, seed):
+    # a random square integer basis (full rank with overwhelming probability), entries of
+    # up to `bits` bits; Python ints, so past int64 too
+    rng = random.Random(seed)
+    return [[rng.randrange(-2 ** bits + 1, 2 ** bits) for _ in range(d)] for _ in range(d)]
+
+
+def qary_basis(d, bits, seed):
+    # the dense basis [[q I_m, 0], [A, I_n]] of a random q-ary lattice, m = d / 2 and q of
+    # `bits` bits: after LLL its b_0 is usually not the shortest vector, unlike random_basis's
+    rng = random.Random(seed)
+    q = 2 ** bits - 1
+    m = d // 2
+    return ([[q if j == i else 0 for j in range(d)] for i in range(m)]
+            + [[rng.randrange(q) for _ in range(m)] + [int(j == i) for j in range(d - m)]
+               for i in range(d - m)])
+
+
+def is_bkz_reduced(basis, blocksize, delta):
+    """
+    What the BKZ tours stop on: no projected block has a vector shorter than delta ||b_i*||
+    (found by enumeration on the exact GSO, rounded to floats).
+    """
+    from lattice_reduction.enumeration import enumerate_svp
+    Mu, r = exact_gso(basis)
+    Mu, r = Mu.astype(float), r.astype(float)
+    d = len(r)
+    for i in range(d - 1):
+        h = min(i + blocksize, d)
+        found = enumerate_svp(Mu[i:h, i:h], r[i:h], r[i] * (1 + 1e-9))
+        if found[1] < delta ** 2 * r[i] * (1 - 1e-9):
+            return False
+    return True
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from helpers import exact_gso, is_bkz_reduced, is_lll_reduced, qary_basis, same_lattice
+from lattice_reduction.bkz import BKZ_alg, find_shortest_vector
+from lattice_reduction.bkz_engine import bkz_reduce
+from lattice_reduction.lll_engine import gso_init, lll_reduce
+from lattice_reduction.LLL import LLL_alg
+
+
+@pytest.mark.parametrize("blocksize", [2, 10, 20])
+def test_bkz_alg_invariants(blocksize):
+    basis = qary_basis(30, 12, 0)
+    reduced = BKZ_alg(basis, blocksize, 0.99)
+    assert same_lattice(basis, reduced)
+    assert is_lll_reduced(reduced, 0.99)
+    assert is_bkz_reduced(reduced, blocksize, 0.99)
+
+
+def test_bkz_beats_lll():
+    basis = qary_basis(30, 12, 1)
+    lll = LLL_alg(basis, 0.99)
+    bkz = BKZ_alg(basis, 20, 0.99)
+    assert np.linalg.norm(bkz[0]) <= np.linalg.norm(lll[0])
+    assert exact_gso(bkz)[1][0] <= exact_gso(lll)[1][0]
+
+
+def test_full_blocksize_finds_the_shortest_vector():
+    from lattice_reduction.enumeration import enumerate_svp
+    reduced = BKZ_alg(qary_basis(20, 10, 2), 20, 0.99)
+    Mu, r = exact_gso(reduced)
+    shortest = enumerate_svp(Mu.astype(float), r.astype(float), float(r[0]) * (1 + 1e-9))[1]
+    assert float(r[0]) <= shortest / 0.99 ** 2 * (1 + 1e-9)
+
+
+def test_incremental_gso_stays_correct():
+    # the tours only ever update Mu and r in place; they must match a fresh GSO at the end
+    B = np.array(qary_basis(30, 12, 3), dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, 0.99)
+    tours = bkz_reduce(B, Mu, r, 10, find_shortest_vector, 0.99)
+    assert tours >= 1
+    Mu_new, r_new = gso_init(B)
+    assert np.allclose(r, r_new, rtol=1e-6)
+    assert np.allclose(np.tril(Mu, -1), np.tril(Mu_new, -1), atol=1e-6)
+
+
+def test_max_tours():
+    B = np.array(qary_basis(30, 12, 4), dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, 0.99)
+    assert bkz_reduce(B, Mu, r, 20, find_shortest_vector, 0.99, max_tours=1) == 1
@@ -0,0 +1,60 @@
+from math import log
+
+import pytest
+
+from helpers import is_lll_reduced, qary_basis, same_lattice
+
+fpylll = pytest.importorskip("fpylll")
+
+from lattice_reduction import block_update
+from lattice_reduction.block_update import prefer_dual, self_dual_bkz
+from lattice_reduction.instrumentation import EventLog
+
+
+def rows(A):
+    return [[A[i, j] for j in range(A.ncols)] for i in range(A.nrows)]
+
+
+def test_prefer_dual():
+    # more room at the head of the block: primal; a tail far below the average: dual
+    assert not prefer_dual([3.0, 1.0, 1.0, 1.0])
+    assert prefer_dual([1.0, 1.0, 1.0, -1.0])
+
+
+def test_self_dual_bkz():
+    basis = qary_basis(40, 16, 0)
+    A = fpylll.IntegerMatrix.from_matrix(basis)
+    events = EventLog()
+    tours = self_dual_bkz(A, 10, hook=events, strategies=None)
+    assert same_lattice(basis, rows(A))
+    assert is_lll_reduced(rows(A), 0.99)
+    assert len(events) == tours
+    for event in events:
+        # one SVP reduction per window, the last window starting at d - 2
+        assert event["oracle_calls"] == event["primal_blocks"] + event["dual_blocks"] == 39
+        assert 0 <= event["insertions"] <= event["oracle_calls"]
+    assert events[0]["insertions"] > 0
+    assert events[0]["primal_blocks"] > 0 and events[0]["dual_blocks"] > 0
+
+
+def test_choice_follows_the_current_profile(monkeypatch):
+    # every block reduction is the one prefer_dual picks from the GSO as it is right then,
+    # after the reductions of the tour so far
+    A = fpylll.IntegerMatrix.from_matrix(qary_basis(30, 16, 1))
+    seen = []
+
+    def check(kind, original):
+        def reduction(bkz, block_start, block_size, params):
+            bkz.M.update_gso()
+            profile = [log(bkz.M.get_r(j, j)) / 2 for j in range(block_start, block_start + block_size)]
+            seen.append(kind)
+            assert prefer_dual(profile) == (kind == "dual")
+            return original(bkz, block_start, block_size, params)
+        return reduction
+
+    monkeypatch.setattr(block_update, "dual_block_reduction",
+                        check("dual", block_update.dual_block_reduction))
+    monkeypatch.setattr(block_update, "primal_block_reduction",
+                        check("primal", block_update.primal_block_reduction))
+    self_dual_bkz(A, 8, strategies=None)
+    assert {"primal", "dual"} <= set(seen)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from helpers import qary_basis, random_basis
+from lattice_reduction.bkz import BKZ_alg, resume
+from lattice_reduction.checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+
+
+class Killed(Exception):
+    pass
+
+
+def kill_at(phase, index):
+    # a hook that stops the run at the given event, as a preempted job would stop
+    def hook(event):
+        if event["phase"] == phase and event["index"] == index:
+            raise Killed
+    return hook
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "run.ckpt.npz"
+    B = np.array(random_basis(6, 20, 0), dtype=float)
+    save_checkpoint(path, B, {"tour": 3, "params": {"blocksize": 10}})
+    basis, state = load_checkpoint(path)
+    assert basis.dtype == np.int64 and np.array_equal(basis, B)
+    assert state == {"tour": 3, "params": {"blocksize": 10}}
+
+
+def test_wide_basis_round_trip(tmp_path):
+    # Python ints past int64 are stored as decimal strings, not pickled
+    path = tmp_path / "run.ckpt.npz"
+    B = np.array(random_basis(4, 200, 1), dtype=object)
+    save_checkpoint(path, B, {})
+    basis, _ = load_checkpoint(path)
+    assert basis.dtype == object
+    assert basis.tolist() == B.tolist()
+
+
+@pytest.mark.parametrize("every_tours, every_seconds", [(1, None), (None, 0)])
+def test_resume_matches_an_uninterrupted_run(tmp_path, every_tours, every_seconds):
+    # every_tours=1 leaves the checkpoint of the end of the first tour, every_seconds=0 the
+    # one of its last window, partway into the second
+    basis = qary_basis(30, 12, 0)
+    full = BKZ_alg(basis, 10, 0.99)
+
+    path = tmp_path / "run.ckpt.npz"
+    with pytest.raises(Killed):
+        BKZ_alg(basis, 10, 0.99, hook=kill_at("tour", 2),
+                checkpoint=Checkpointer(path, every_tours, every_seconds))
+    resumed = resume(path)
+    assert np.array_equal(np.array(resumed), np.array(full))
+
+
+def test_resume_of_an_exact_run(tmp_path):
+    # q of 60 bits: past what the float rows hold, so the tours run on Python ints
+    basis = qary_basis(20, 60, 2)
+    full = BKZ_alg(basis, 10, 0.99)
+
+    path = tmp_path / "run.ckpt.npz"
+    with pytest.raises(Killed):
+        BKZ_alg(basis, 10, 0.99, hook=kill_at("tour", 2), checkpoint=Checkpointer(path))
+    assert load_checkpoint(path)[1]["params"]["precision"] is not None
+    resumed = resume(path)
+    assert [list(map(int, v)) for v in resumed] == [list(map(int, v)) for v in full]
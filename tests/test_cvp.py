@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from helpers import qary_basis
+from lattice_reduction.cvp import babai_nearest_plane, babai_rounding, cvp_basis, decode
+
+
+def bdd_targets(decoder, count, seed):
+    # lattice vectors plus errors short enough that nearest plane provably decodes them:
+    # |<e, b_j*>| / ||b_j*||^2 < 1/2 for every j once ||e|| < min ||b_j*|| / 2
+    rng = np.random.default_rng(seed)
+    B = decoder["B"]
+    X = rng.integers(-5, 6, size=(count, B.shape[0]))
+    E = rng.normal(size=(count, B.shape[1]))
+    E *= 0.45 * np.sqrt(decoder["r"].min()) / np.linalg.norm(E, axis=1)[:, None]
+    return X @ B, X @ B + E
+
+
+@pytest.mark.parametrize("blocksize", [None, 10])
+def test_nearest_plane_decodes_bdd(blocksize):
+    decoder = cvp_basis(qary_basis(30, 10, 0), blocksize)
+    V, T = bdd_targets(decoder, 500, 1)
+    X = babai_nearest_plane(decoder, T, chunk_size=128)
+    assert np.array_equal(X @ decoder["B"], V)
+
+
+def test_decode_never_loses_to_nearest_plane():
+    decoder = cvp_basis(qary_basis(30, 10, 0))
+    rng = np.random.default_rng(2)
+    T = rng.normal(scale=300.0, size=(200, 30))
+    nearest = babai_nearest_plane(decoder, T) @ decoder["B"]
+    x, dist_sq = decode(decoder, T, depth=3, width=1)
+    assert np.allclose(dist_sq, ((T - x @ decoder["B"]) ** 2).sum(axis=1))
+    assert np.all(dist_sq <= ((T - nearest) ** 2).sum(axis=1) + 1e-6)
+
+
+def test_rounding_is_exact_on_lattice_vectors():
+    decoder = cvp_basis(qary_basis(20, 10, 3))
+    V, _ = bdd_targets(decoder, 50, 4)
+    assert np.array_equal(babai_rounding(decoder, V) @ decoder["B"], V)
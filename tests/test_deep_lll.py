@@ -0,0 +1,60 @@
+import pytest
+
+from helpers import exact_gso, is_bkz_reduced, is_lll_reduced, qary_basis, same_lattice
+from lattice_reduction.bkz import BKZ_alg
+from lattice_reduction.deep_lll import DeepLLL_alg, PotLLL_alg
+from lattice_reduction.instrumentation import EventLog, gso_profile, root_hermite_factor
+from lattice_reduction.LLL import LLL_alg
+
+
+def rhf(basis):
+    return root_hermite_factor(gso_profile(exact_gso(basis)[1]))
+
+
+@pytest.mark.parametrize("alg", [DeepLLL_alg, PotLLL_alg])
+def test_reduces_and_keeps_the_lattice(alg):
+    basis = qary_basis(40, 16, 0)
+    reduced = alg(basis, 0.99)
+    assert is_lll_reduced(reduced, 0.99)
+    assert same_lattice(basis, reduced)
+    # at least as good a profile as LLL's, from the same LLL start
+    assert rhf(reduced) <= rhf(LLL_alg(basis, 0.99)) + 1e-9
+
+
+def test_insertions_are_reported():
+    events = EventLog()
+    DeepLLL_alg(qary_basis(40, 16, 1), 0.99, hook=events)
+    assert events[0]["insertions"] > 0
+
+
+@pytest.mark.parametrize("preprocess", ["deep", "pot"])
+def test_as_bkz_preprocessing(preprocess):
+    basis = qary_basis(24, 12, 3)
+    reduced = BKZ_alg(basis, 10, 0.99, preprocess=preprocess)
+    assert same_lattice(basis, reduced)
+    assert is_bkz_reduced(reduced, 10, 0.99)
+
+
+def test_unknown_preprocessing():
+    with pytest.raises(KeyError):
+        BKZ_alg(qary_basis(10, 8, 0), 4, preprocess="nope")
+
+
+@pytest.mark.parametrize("alg", [DeepLLL_alg, PotLLL_alg])
+def test_entries_past_2_53(alg):
+    # LLL_adaptive first, then the insertions on the exact GSO
+    basis = qary_basis(20, 61, 0)
+    events = EventLog()
+    reduced = alg(basis, 0.99, hook=events)
+    assert is_lll_reduced(reduced, 0.99)
+    assert same_lattice(basis, reduced)
+    assert rhf(reduced) <= rhf(LLL_alg(basis, 0.99)) + 1e-9
+    assert [e["phase"] for e in events] == ["lll", "lll"]
+
+
+@pytest.mark.parametrize("preprocess", ["deep", "pot"])
+def test_wide_bkz_preprocessing(preprocess):
+    basis = qary_basis(20, 61, 1)
+    reduced = BKZ_alg(basis, 8, 0.99, preprocess=preprocess)
+    assert same_lattice(basis, reduced)
+    assert is_bkz_reduced(reduced, 8, 0.99)
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from helpers import is_lll_reduced, qary_basis, same_lattice
+from lattice_reduction import dispatch
+from lattice_reduction.dispatch import BackendDisagreement, choose_backend, reduce, register_backend
+
+pytest.importorskip("fpylll")
+
+
+def record(backend, time, rhf, dim=20, bits=10, algorithm="lll"):
+    return {"algorithm": algorithm, "backend": backend, "dim": dim, "bits": bits,
+            "time": time, "rhf": rhf, "ok": True}
+
+
+@pytest.fixture
+def calibration(tmp_path):
+    # a stub calibration: numpy fastest at 20 dimensions, fpylll at 40, and at 40 bits only
+    # fpylll timed (numpy's float GSO isn't trusted there)
+    path = str(tmp_path / "dispatch.json")
+    records = [record("numpy", 0.001, 1.02), record("fpylll", 0.002, 1.02),
+               record("numpy", 0.05, 1.02, dim=40), record("fpylll", 0.01, 1.02, dim=40),
+               record("numpy", 0.001, 1.05, algorithm="bkz"),
+               record("fpylll", 0.01, 1.01, algorithm="bkz"),
+               record("fpylll", 0.01, 1.02, bits=40)]
+    with open(path, "w") as f:
+        json.dump({"delta": 0.99, "records": records}, f)
+    yield path
+    dispatch._calibrations.pop(path, None)
+
+
+@pytest.fixture
+def backend():
+    # registers test backends, and removes them afterwards
+    names = []
+
+    def register(name, lll):
+        register_backend(name, "json", lll=lll)
+        names.append(name)
+
+    yield register
+    for name in names:
+        dispatch.BACKENDS.pop(name)
+        dispatch._available.pop(name, None)
+
+
+def test_choose_backend(calibration):
+    # the bucket: the smallest calibrated dimension / bits at or above the basis's own
+    assert choose_backend("lll", 12, 8, calibration=calibration) == ("numpy", "calibrated")
+    assert choose_backend("lll", 30, 8, calibration=calibration) == ("fpylll", "calibrated")
+    # numpy is fastest, but its RHF is not within RHF_TOLERANCE of fpylll's
+    assert choose_backend("bkz", 20, 10, calibration=calibration)[0] == "fpylll"
+    assert choose_backend("bkz", 20, 10, max_rhf=1.06, calibration=calibration)[0] == "numpy"
+    # past numpy's max_bits, whatever the calibration has
+    assert choose_backend("lll", 20, 30, calibration=calibration)[0] == "fpylll"
+    assert choose_backend("lll", 20, 10, calibration=calibration, exclude=["numpy"])[0] == "fpylll"
+
+
+def test_default_routing(calibration, tmp_path):
+    # no calibration, or one taken at another delta: the compiled backend
+    missing = str(tmp_path / "missing.json")
+    assert choose_backend("lll", 12, 8, calibration=missing) == ("fpylll", "default")
+    assert choose_backend("lll", 12, 8, calibration=calibration, delta=0.75) == ("fpylll", "default")
+
+
+def test_reduce_with_cross_check(calibration):
+    basis = qary_basis(20, 10, 0)
+    reduced, report = reduce(basis, "lll", cross_check=True, calibration=calibration)
+    assert report["backend"] == "numpy" and report["routed"] == "calibrated"
+    assert report["cross_check"]["backend"] == "fpylll"
+    assert same_lattice(basis, reduced)
+    assert is_lll_reduced(reduced, 0.99)
+
+
+def test_cross_check_different_lattice(calibration, backend):
+    # a backend that doubles the first vector: a sublattice of index 2
+    backend("bad", lambda rows, delta, blocksize: [[2 * a for a in rows[0]]] + rows[1:])
+    with pytest.raises(BackendDisagreement, match="different lattice"):
+        reduce(qary_basis(20, 10, 0), "lll", backend="fpylll", cross_check="bad",
+               calibration=calibration)
+
+
+def test_cross_check_different_rhf(calibration, backend):
+    # a backend that does nothing: the same lattice, far from the RHF of a real LLL
+    backend("lazy", lambda rows, delta, blocksize: rows)
+    with pytest.raises(BackendDisagreement, match="RHF"):
+        reduce(qary_basis(20, 10, 0), "lll", backend="lazy", cross_check="fpylll",
+               calibration=calibration)
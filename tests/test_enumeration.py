@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from helpers import qary_basis
+from lattice_reduction.bkz import BKZ_alg
+from lattice_reduction.enumeration import (EnumerationPool, enumerate_svp, gaussian_heuristic, linear_pruning,
+                                          parallel_enumerate_svp)
+from lattice_reduction.lll_engine import gso_init, lll_reduce
+
+
+def reduced_gso(d, seed):
+    B = np.array(qary_basis(d, 10, seed), dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, 0.99)
+    return B, Mu, r
+
+
+def fpylll_shortest(B):
+    # fplll's own enumeration, on the same (integer) basis
+    fpylll = pytest.importorskip("fpylll")
+    A = fpylll.IntegerMatrix.from_matrix(np.rint(B).astype(np.int64).tolist())
+    M = fpylll.GSO.Mat(A)
+    M.update_gso()
+    return fpylll.Enumeration(M).enumerate(0, A.nrows, M.get_r(0, 0), 0)[0][0]
+
+
+@pytest.mark.parametrize("d, seed", [(20, 0), (20, 1), (30, 0), (30, 1)])
+def test_shortest_vector_matches_fpylll(d, seed):
+    B, Mu, r = reduced_gso(d, seed)
+    x, norm_sq = enumerate_svp(Mu, r, r[0])
+    v = np.array(x) @ B
+    assert any(x)
+    assert norm_sq == pytest.approx(v @ v, rel=1e-9)
+    assert norm_sq == pytest.approx(fpylll_shortest(B), rel=1e-9)
+
+
+def test_default_radius_is_the_gaussian_heuristic():
+    B, Mu, r = reduced_gso(20, 0)
+    exact = enumerate_svp(Mu, r, r[0])[1]
+    found = enumerate_svp(Mu, r)
+    if exact <= 1.1 * gaussian_heuristic(r):
+        assert found[1] == pytest.approx(exact, rel=1e-9)
+    else:
+        assert found is None
+
+
+def test_nothing_inside_a_small_radius():
+    B, Mu, r = reduced_gso(12, 0)
+    assert enumerate_svp(Mu, r, 0.5 * min(r)) is None
+
+
+def test_pruned_search_finds_no_shorter_vector():
+    B, Mu, r = reduced_gso(30, 1)
+    exact = enumerate_svp(Mu, r, r[0])[1]
+    found = enumerate_svp(Mu, r, r[0], linear_pruning(30))
+    assert found is None or found[1] >= exact * (1 - 1e-9)
+
+
+def test_stats_count_nodes():
+    B, Mu, r = reduced_gso(20, 2)
+    stats = {}
+    enumerate_svp(Mu, r, r[0], stats=stats)
+    assert stats["nodes"] > 20
+
+
+def test_parallel_search_finds_the_same_vector():
+    # (30 is PARALLEL_MIN_DIM: the smallest block that gets split over the workers)
+    B, Mu, r = reduced_gso(30, 0)
+    serial = enumerate_svp(Mu, r, r[0])
+    with EnumerationPool(2) as pool:
+        parallel = parallel_enumerate_svp(Mu, r, r[0], pool=pool, deterministic=True)
+    assert serial[1] < r[0]
+    assert parallel[1] == pytest.approx(serial[1], rel=1e-9)
+    assert list(parallel[0]) == list(serial[0])
+
+
+def test_parallel_search_counts_the_same_nodes():
+    # with the radius just past the shortest vector the serial search never shrinks it, so
+    # the split tree is the same tree: the same nodes, with the prefix walk counted once
+    B, Mu, r = reduced_gso(30, 0)
+    radius_sq = enumerate_svp(Mu, r, r[0])[1] * (1 + 1e-9)
+    serial, parallel = {}, {}
+    enumerate_svp(Mu, r, radius_sq, stats=serial)
+    with EnumerationPool(2) as pool:
+        parallel_enumerate_svp(Mu, r, radius_sq, pool=pool, deterministic=True, stats=parallel)
+    assert parallel["nodes"] == serial["nodes"]
+
+
+def test_unknown_svp_oracle():
+    with pytest.raises(ValueError):
+        BKZ_alg(qary_basis(10, 8, 0), 4, svp="enumeration")
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from helpers import is_lll_reduced, random_basis, same_lattice
+
+fpylll = pytest.importorskip("fpylll")
+
+from lattice_reduction import experiment_runner
+from lattice_reduction.experiment_runner import expand_grid, job_key, load_done, run_job
+
+
+def test_grid_and_resume(tmp_path):
+    jobs = expand_grid({"instances": [{"kind": "qary", "bits": 20}], "dims": [20, 30],
+                        "blocksizes": [10, 25], "seeds": [0], "algorithms": ["bkz_alg"]})
+    # blocksize 25 > dim 20 is left out
+    assert [(job["dim"], job["blocksize"]) for job in jobs] == [(20, 10), (30, 10), (30, 25)]
+    path = tmp_path / "results.jsonl"
+    with open(path, "w") as f:
+        f.write(json.dumps({"job": jobs[0], "time": 1.0}) + "\n")
+        f.write(json.dumps({"job": jobs[1], "error": "x"}) + "\n")
+        f.write('{"job": ')
+    assert load_done(path) == {job_key(jobs[0])}
+
+
+@pytest.mark.parametrize("algorithm", ["bkz_alg", "recursive", "progressive"])
+def test_runners_on_entries_past_2_53(monkeypatch, algorithm):
+    # a Darmstadt-sized basis: 61-bit entries, which the float arrays can't hold
+    basis = random_basis(12, 61, 0)
+    monkeypatch.setitem(experiment_runner._instances, ("darmstadt", 12, 0, None),
+                        fpylll.IntegerMatrix.from_matrix(basis))
+    job = {"kind": "darmstadt", "dim": 12, "seed": 0, "algorithm": algorithm,
+           "blocksize": 4, "max_loops": 2}
+    record = run_job(job)
+    assert "error" not in record, record
+
+    A = experiment_runner.build_instance(job)
+    mat, _ = getattr(experiment_runner, f"_run_{algorithm}")(A, 4, 2)
+    rows = [[mat[i, j] for j in range(12)] for i in range(12)]
+    assert same_lattice(basis, rows)
+    assert is_lll_reduced(rows, experiment_runner.DELTA)
@@ -0,0 +1,39 @@
+import json
+import math
+
+import pytest
+
+from helpers import qary_basis
+from lattice_reduction.bkz import BKZ_alg
+from lattice_reduction.instrumentation import EventLog, gsa_slope, gso_profile, root_hermite_factor
+from lattice_reduction.LLL import LLL_alg
+
+
+def test_profile_measures():
+    # a geometric profile: log ||b_i*|| falls by 0.1 per index
+    r = [math.exp(-0.2 * i) for i in range(10)]
+    profile = gso_profile(r)
+    assert profile == pytest.approx([-0.1 * i for i in range(10)])
+    assert gsa_slope(profile) == pytest.approx(-0.1)
+    assert root_hermite_factor(profile) == pytest.approx(math.exp(0.45 / 10))
+
+
+def test_bkz_events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    events = EventLog(path)
+    BKZ_alg(qary_basis(24, 12, 6), 10, 0.99, hook=events)
+    assert [e["phase"] for e in events] == ["lll"] + ["tour"] * (len(events) - 1)
+    assert [e["index"] for e in events[1:]] == list(range(1, len(events)))
+    # the tours stop after the first one without an insertion
+    assert events[-1]["insertions"] == 0
+    assert all(e["insertions"] > 0 and e["oracle_calls"] > 0 for e in events[1:-1])
+    with open(path) as f:
+        assert [json.loads(line)["index"] for line in f] == events.column("index")
+
+
+def test_lll_event():
+    events = EventLog()
+    LLL_alg(qary_basis(20, 12, 0), 0.99, hook=events)
+    assert len(events) == 1
+    assert events[0]["phase"] == "lll" and events[0]["swaps"] > 0
+    assert len(events[0]["profile"]) == 20
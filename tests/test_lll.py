@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from helpers import is_lll_reduced, random_basis, same_lattice
+from lattice_reduction.lll_engine import gso_init, lll_reduce
+from lattice_reduction.LLL import LLL_alg
+
+
+@pytest.mark.parametrize("delta", [0.75, 0.99])
+@pytest.mark.parametrize("seed", range(3))
+def test_lll_alg_reduces_and_keeps_the_lattice(delta, seed):
+    basis = random_basis(20, 16, seed)
+    reduced = LLL_alg(basis, delta)
+    assert is_lll_reduced(reduced, delta)
+    assert same_lattice(basis, reduced)
+
+
+def test_lll_alg_small_example():
+    reduced = LLL_alg([[1, 1, 1], [-1, 0, 2], [3, 5, 6]])
+    assert same_lattice([[1, 1, 1], [-1, 0, 2], [3, 5, 6]], reduced)
+    assert is_lll_reduced(reduced, 0.75)
+
+
+def test_lll_reduce_on_a_window_leaves_the_rest():
+    B = np.array(random_basis(12, 10, 7), dtype=float)
+    Mu, r = gso_init(B)
+    before = B.copy()
+    lll_reduce(B, Mu, r, 0.99, start=0, end=6)
+    assert is_lll_reduced(B[:6], 0.99)
+    assert np.array_equal(B[6:], before[6:])
+    # Mu and r were kept up to date for every row
+    Mu_new, r_new = gso_init(B)
+    assert np.allclose(Mu, Mu_new) and np.allclose(r, r_new)
+
+
+def test_transform_records_the_row_operations():
+    basis = random_basis(10, 12, 3)
+    B = np.array(basis, dtype=float)
+    T = np.eye(10)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, 0.99, T=T)
+    assert np.array_equal(T @ np.array(basis, dtype=float), B)
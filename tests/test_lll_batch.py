@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from helpers import is_lll_reduced, qary_basis, random_basis, same_lattice
+from lattice_reduction.lll_batch import LLL_batch
+from lattice_reduction.lll_engine import gso_init, lll_reduce
+
+
+def engine_swaps(basis, delta):
+    B = np.array(basis, dtype=float)
+    Mu, r = gso_init(B)
+    return lll_reduce(B, Mu, r, delta)
+
+
+@pytest.mark.parametrize("d", [2, 5, 12, 20])
+@pytest.mark.parametrize("delta", [0.75, 0.99])
+def test_lll_batch(d, delta):
+    bases = [random_basis(d, 12, seed) for seed in range(10)] + [qary_basis(d, 16, 0)]
+    reduced, swaps = LLL_batch(bases, delta)
+    assert reduced.shape == (len(bases), d, d)
+    for basis, result, count in zip(bases, reduced, swaps):
+        assert is_lll_reduced(result, delta)
+        assert same_lattice(basis, result)
+        # the same run as the one-basis engine's, one step at a time
+        assert count == engine_swaps(basis, delta)
+
+
+def test_rectangular_and_already_reduced():
+    rng = np.random.default_rng(0)
+    bases = rng.integers(-100, 100, size=(5, 6, 9))
+    bases[0] = np.eye(6, 9, dtype=int)
+    reduced, swaps = LLL_batch(bases, 0.99)
+    assert swaps[0] == 0 and np.array_equal(reduced[0], bases[0])
+    for result in reduced:
+        assert is_lll_reduced(result, 0.99)
+
+
+def test_single_vectors():
+    reduced, swaps = LLL_batch([[[3, 4]], [[1, 2]]])
+    assert np.array_equal(reduced, [[[3, 4]], [[1, 2]]]) and not swaps.any()
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from helpers import is_lll_reduced, random_basis, same_lattice
+from lattice_reduction.bkz import BKZ_alg
+from lattice_reduction.lll_engine import IntegerOverflow, gso_init
+from lattice_reduction.lll_precision import LLL_adaptive, fits_double, integer_basis
+from lattice_reduction.LLL import LLL_alg
+
+
+def test_fits_double():
+    assert fits_double(random_basis(10, 20, 0))
+    assert not fits_double(random_basis(10, 30, 0))
+
+
+@pytest.mark.parametrize("bits", [40, 100, 300])
+def test_wide_entries_stay_exact(bits):
+    # past 2^53 the float rows can't hold the basis: LLL_alg goes to LLL_adaptive and
+    # returns integers
+    basis = random_basis(10, bits, bits)
+    reduced = LLL_alg(basis, 0.99)
+    assert reduced[0].dtype.kind in "iO"
+    assert is_lll_reduced(reduced, 0.99)
+    assert same_lattice(basis, reduced)
+
+
+@pytest.mark.parametrize("precision", ["double", "longdouble", "rational"])
+def test_every_starting_precision(precision):
+    basis = random_basis(8, 60, 1)
+    reduced, report = LLL_adaptive(basis, 0.99, precision)
+    assert report["precision"] in ("double", "longdouble", "rational")
+    assert is_lll_reduced(reduced, 0.99)
+    assert same_lattice(basis, reduced)
+
+
+def test_int64_overflow_falls_back_to_python_ints(monkeypatch):
+    # the int64 basis is checked before every product; an overflow carries on in Python ints
+    from lattice_reduction import lll_engine
+    monkeypatch.setattr(lll_engine, "_INT64_LIMIT", 2.0 ** 20)
+    basis = random_basis(8, 12, 5)
+    assert integer_basis(basis).dtype == np.int64
+    reduced, report = LLL_adaptive(basis, 0.99)
+    assert any(e.startswith("int64") for e in report["escalations"])
+    assert is_lll_reduced(reduced, 0.99)
+    assert same_lattice(basis, reduced)
+
+
+def test_int64_products_are_checked():
+    B = np.array([[2 ** 40, 1], [1, 2 ** 40]], dtype=np.int64)
+    with pytest.raises(IntegerOverflow):
+        gso_init(B)
+
+
+def test_bkz_alg_on_wide_entries():
+    basis = random_basis(12, 120, 5)
+    reduced = BKZ_alg(basis, 6, 0.99)
+    assert reduced[0].dtype == object
+    assert same_lattice(basis, reduced)
+    assert is_lll_reduced(reduced, 0.99)
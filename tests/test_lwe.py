@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("fpylll")
+
+from lattice_reduction.lwe import attack, embedding_basis, generate_lwe
+
+
+def test_instance():
+    inst = generate_lwe(10, 30, 401, 1.0, 0)
+    assert np.array_equal((inst["A"] @ inst["s"] + inst["e"]) % 401, inst["b"])
+    assert np.array_equal(generate_lwe(10, 30, 401, 1.0, 0)["s"], inst["s"])
+
+
+def test_embedding_basis():
+    # rows I_n | ..., then q I_{m-n}, then (b, M)
+    inst = generate_lwe(10, 30, 401, 1.0, 1)
+    mat = embedding_basis(inst)
+    assert (mat.nrows, mat.ncols) == (31, 31)
+    assert [mat[i, i] for i in range(31)] == [1] * 10 + [401] * 20 + [1]
+    assert [mat[30, j] for j in range(30)] == list(map(int, inst["b"]))
+
+
+@pytest.mark.parametrize("algorithm, blocksize", [("lll_alg", 0), ("bkz_alg", 10)])
+@pytest.mark.parametrize("seed", range(2))
+def test_lwe_secret_recovered(algorithm, blocksize, seed):
+    record = attack(generate_lwe(10, 30, 401, 1.0, seed), algorithm, blocksize)
+    assert record["success"], record
@@ -0,0 +1,68 @@
+import pytest
+
+from helpers import is_lll_reduced, qary_basis, same_lattice
+from lattice_reduction.progressive import Progressive_alg, default_schedule
+
+BASIS = qary_basis(30, 10, 0)
+
+
+def test_default_schedule():
+    assert default_schedule(35) == [10, 20, 30, 35]
+    assert default_schedule(20, step=5, start=10) == [10, 15, 20]
+
+
+def test_runs_the_schedule():
+    events = []
+    basis, report = Progressive_alg(BASIS, 20, 0.99, step=5, hook=events.append)
+    assert same_lattice(BASIS, basis)
+    assert is_lll_reduced(basis, 0.99)
+    assert [blocksize for blocksize, _ in report["schedule"]] == [10, 15, 20]
+    assert report["blocksize"] == 20
+    assert report["out_of_budget"] is None
+    assert report["tours"] == sum(tours for _, tours in report["schedule"]) == len(events)
+    assert [e["blocksize"] for e in events] == sorted(e["blocksize"] for e in events)
+
+
+@pytest.mark.parametrize("abort_tours", [1, 2])
+def test_auto_abort(abort_tours):
+    # abort_scale 0: no tour after the first counts as progress, so every block size stops
+    # abort_tours tours after its first (or earlier, on a clean tour)
+    _, report = Progressive_alg(BASIS, 20, 0.99, step=5, max_tours=8, abort_tours=abort_tours,
+                                abort_scale=0.0)
+    assert all(tours <= abort_tours + 1 for _, tours in report["schedule"])
+    # without the abort, block size 10 goes on for longer
+    _, patient = Progressive_alg(BASIS, 20, 0.99, step=5, max_tours=8, abort_tours=100,
+                                 abort_scale=0.0)
+    assert patient["schedule"][0][1] > abort_tours + 1
+
+
+def test_max_tours():
+    _, report = Progressive_alg(BASIS, 20, 0.99, step=5, max_tours=1)
+    assert all(tours == 1 for _, tours in report["schedule"])
+
+
+def test_time_budget():
+    # out of time before the first tour: the LLL-reduced basis, nothing else
+    basis, report = Progressive_alg(BASIS, 20, 0.99, time_budget=0)
+    assert report["out_of_budget"] == "time"
+    assert report["tours"] == 0 and report["blocksize"] is None
+    assert same_lattice(BASIS, basis)
+    assert is_lll_reduced(basis, 0.99)
+
+
+def test_node_budget():
+    _, full = Progressive_alg(BASIS, 20, 0.99, step=5, node_budget=10 ** 9)
+    assert full["out_of_budget"] is None
+    budget = full["nodes"] // 4
+    basis, report = Progressive_alg(BASIS, 20, 0.99, step=5, node_budget=budget)
+    assert report["out_of_budget"] == "nodes"
+    # checked before every window, so at most one oracle call past the budget
+    assert budget <= report["nodes"] < full["nodes"]
+    assert report["tours"] <= full["tours"]
+    assert same_lattice(BASIS, basis)
+    assert is_lll_reduced(basis, 0.99)
+
+
+def test_sieve_has_no_node_budget():
+    with pytest.raises(ValueError):
+        Progressive_alg(BASIS, 20, oracle="sieve", node_budget=1000)
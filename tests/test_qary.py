@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from helpers import is_lll_reduced, same_lattice
+from lattice_reduction.LLL import LLL_alg
+from lattice_reduction.lll_engine import gso_init
+from lattice_reduction.qary import QaryLattice, qary_lll
+
+
+def lattice(n=8, m=60, q=257, seed=0):
+    # small q against m: LLL never reaches the first q e_j, so the lift is used
+    return QaryLattice(np.random.default_rng(seed).integers(0, q, size=(n, m)), q)
+
+
+def test_closed_form_gso():
+    L = lattice(n=6, m=10, q=1009)
+    Mu, r = L.gso()
+    Mu_dense, r_dense = gso_init(L.basis(float))
+    assert np.allclose(Mu, Mu_dense) and np.allclose(r, r_dense)
+
+
+def test_from_basis_round_trip():
+    L = lattice(n=5, m=7, q=101)
+    back = QaryLattice.from_basis(L.basis())
+    assert back.q == L.q and np.array_equal(back.A, L.A)
+    with pytest.raises(ValueError):
+        QaryLattice.from_basis(np.eye(4, dtype=np.int64) + 1)
+
+
+@pytest.mark.parametrize("untouched", [None, 5, 30, 59])
+def test_lifted_basis_is_reduced_and_the_same_lattice(untouched):
+    # None: the guess from the geometric series assumption; 59 leaves almost everything
+    # out, so the lifted basis fails at the boundary and the fallback pass has to fix it
+    L = lattice()
+    B, Mu, r, report = qary_lll(L, 0.99, untouched=untouched)
+    if untouched is None:
+        assert report["untouched"] > 0
+    if untouched == 59:
+        assert report["fallback"]
+    assert is_lll_reduced(B, 0.99)
+    assert same_lattice(L.basis(), B)
+    # the GSO handed back is that of the lifted basis
+    Mu_dense, r_dense = gso_init(B)
+    assert np.allclose(Mu, Mu_dense) and np.allclose(r, r_dense, rtol=1e-9)
+
+
+def test_lll_alg_on_a_qary_lattice():
+    L = lattice(n=6, m=30, q=257, seed=1)
+    reduced = LLL_alg(L, 0.99)
+    assert is_lll_reduced(reduced, 0.99)
+    assert same_lattice(L.basis(), reduced)
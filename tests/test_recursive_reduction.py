@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from helpers import is_lll_reduced, qary_basis, same_lattice
+from lattice_reduction.lll_engine import gso_init, lll_reduce
+from lattice_reduction.recursive_reduction import ORACLES, Recursive_alg, _memo_key, _reduce, make_aux
+
+BASIS = qary_basis(30, 12, 0)
+
+
+@pytest.mark.parametrize("oracle", ["enum", "fpylll"])
+def test_recursive_alg(oracle):
+    if oracle == "fpylll":
+        pytest.importorskip("fpylll")
+    reduced, report = Recursive_alg(BASIS, 10, 0.99, oracle=oracle, rounds=2)
+    assert same_lattice(BASIS, reduced)
+    assert is_lll_reduced(reduced, 0.99)
+    assert 1 <= report["tours"] <= 2
+    assert report["oracle_calls"] > 0 and report["subproblems"] > 0
+    assert not report["out_of_time"]
+
+
+def test_time_budget():
+    reduced, report = Recursive_alg(BASIS, 10, 0.99, oracle="enum", time_budget=0)
+    assert report["out_of_time"] and report["oracle_calls"] == 0
+    assert same_lattice(BASIS, reduced)
+
+
+def lll_arrays():
+    B = np.array(BASIS, dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, 0.99)
+    return B, Mu, r
+
+
+def test_transform_maps_input_to_output():
+    B, Mu, r = lll_arrays()
+    before = B.copy()
+    d = B.shape[0]
+    key = _memo_key(Mu, r, 0, d, False)
+    aux = make_aux(10, rounds=1)
+    T = np.eye(d)
+    _reduce(B, Mu, r, 0, d, False, 0, ORACLES["enum"], 0.99, aux, T)
+    assert aux["insertions"] > 0
+    # the caller's transform and the memoized one both take the input basis to the output
+    assert np.array_equal(T @ before, B)
+    assert np.array_equal(aux["memo"][key] @ before, B)
+    assert same_lattice(before, B)
+    after = B.copy()
+
+    # the same block again: solved by the memo, in one lookup
+    B, Mu, r = lll_arrays()
+    subproblems = aux["subproblems"]
+    _reduce(B, Mu, r, 0, d, False, 0, ORACLES["enum"], 0.99, aux)
+    assert aux["memo_hits"] == 1 and aux["subproblems"] == subproblems
+    # the memoized U, then size reduction: the same b_i*
+    assert same_lattice(before, B)
+    assert np.allclose(gso_init(B)[1], gso_init(after)[1])
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from helpers import is_lll_reduced, qary_basis, same_lattice
+from lattice_reduction.reduce import main, read_records, reduce_record
+
+DEFAULTS = {"algorithm": "lll", "delta": 0.99, "blocksize": 10}
+
+
+def test_read_records():
+    lines = [
+        "# a comment\n",
+        "\n",
+        "[[1, 2], [3, 4]]\n",
+        '{"id": "x1", "basis": [[1, 0], [0, 1]], "blocksize": 4}\n',
+        "[[1 2 3]\n",
+        "[4 5 6]\n",
+        "[7 8 10]\n",
+        "]\n",
+        "not a basis\n",
+        '{"id": "x2"}\n',
+        "[[1 2]\n",
+    ]
+    records = list(read_records(lines))
+    assert records[:3] == [{"basis": [[1, 2], [3, 4]]},
+                           {"id": "x1", "basis": [[1, 0], [0, 1]], "blocksize": 4},
+                           {"basis": [[1, 2, 3], [4, 5, 6], [7, 8, 10]]}]
+    assert [set(r) for r in records[3:]] == [{"error"}] * 3
+    assert "unterminated" in records[-1]["error"]
+
+
+def test_reduce_record():
+    basis = qary_basis(20, 10, 0)
+    out = reduce_record((3, {"id": "x", "basis": basis}, DEFAULTS))
+    assert out["id"] == "x" and out["index"] == 3 and "error" not in out
+    assert all(isinstance(v, int) for row in out["basis"] for v in row)
+    assert is_lll_reduced(out["basis"], 0.99)
+    assert same_lattice(basis, out["basis"])
+
+    # the record's own settings win over the command line's
+    out = reduce_record((0, {"basis": basis, "algorithm": "bkz", "blocksize": 8}, DEFAULTS))
+    assert same_lattice(basis, out["basis"])
+
+
+def test_bad_records():
+    assert reduce_record((0, {"error": "x"}, DEFAULTS)) == {"error": "x", "index": 0}
+    out = reduce_record((1, {"basis": [[1, 0], [0, 1]], "algorithm": "nope"}, DEFAULTS))
+    assert "unknown algorithm" in out["error"]
+    # linearly dependent rows: the backend's exception ends up in the record
+    out = reduce_record((2, {"basis": [[1, 2], [2, 4]], "algorithm": "lll-adaptive"}, DEFAULTS))
+    assert "ValueError" in out["error"]
+
+
+def test_main(tmp_path, capsys):
+    basis = qary_basis(10, 8, 0)
+    path = tmp_path / "bases.txt"
+    path.write_text(json.dumps(basis) + "\n" + str(basis).replace(",", "") + "\n")
+    assert main([str(path), "--delta", "0.75"]) == 0
+    outs = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [out["index"] for out in outs] == [0, 1]
+    assert outs[0]["basis"] == outs[1]["basis"]
+    assert is_lll_reduced(outs[0]["basis"], 0.75)
+
+
+def test_exit_status_on_a_bad_record(tmp_path, capsys):
+    path = tmp_path / "bases.jsonl"
+    path.write_text("[[1, 0], [0, 1]]\nnot a basis\n[[2, 1], [1, 1]]\n")
+    assert main([str(path)]) == 1
+    outs = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    # the bad record doesn't stop the ones after it
+    assert ["error" in out for out in outs] == [False, True, False]
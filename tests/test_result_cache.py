@@ -0,0 +1,75 @@
+import itertools
+import os
+
+import numpy as np
+import pytest
+
+from helpers import qary_basis, same_lattice
+from lattice_reduction import result_cache
+from lattice_reduction.bkz import BKZ_alg
+from lattice_reduction.result_cache import cache_lookup, cache_store, warm_start_lookup
+
+PARAMS = {"algorithm": "bkz_alg", "blocksize": 10, "delta": 0.99}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # a clock that ticks on every call, so the LRU order doesn't depend on timer resolution
+    ticks = itertools.count()
+    monkeypatch.setattr(result_cache.time, "time", lambda: float(next(ticks)))
+
+
+def test_hit_and_miss(tmp_path):
+    basis = qary_basis(10, 8, 0)
+    reduced = np.array(qary_basis(10, 8, 1))
+    assert cache_lookup(basis, PARAMS, tmp_path) is None
+    cache_store(basis, PARAMS, reduced, {"rhf": 1.01, "tours": 3}, tmp_path)
+
+    cached, summary = cache_lookup(basis, PARAMS, tmp_path)
+    assert (cached == reduced).all()
+    assert summary == {"rhf": 1.01, "tours": 3}
+    # the same basis as float rows is the same basis
+    assert cache_lookup(np.array(basis, dtype=float), PARAMS, tmp_path) is not None
+    assert cache_lookup(basis, dict(PARAMS, delta=0.75), tmp_path) is None
+    assert cache_lookup(qary_basis(10, 8, 2), PARAMS, tmp_path) is None
+
+
+def test_warm_start(tmp_path):
+    basis = qary_basis(10, 8, 0)
+    for blocksize in (4, 6, 20):
+        cache_store(basis, dict(PARAMS, blocksize=blocksize), np.array(basis) * blocksize, {},
+                    tmp_path)
+    cache_store(basis, dict(PARAMS, blocksize=8, delta=0.75), np.array(basis), {}, tmp_path)
+    reduced, blocksize = warm_start_lookup(basis, PARAMS, tmp_path)
+    assert blocksize == 6
+    assert (reduced == np.array(basis) * 6).all()
+    assert warm_start_lookup(basis, dict(PARAMS, blocksize=4), tmp_path) is None
+
+
+def test_lru_eviction(tmp_path, clock):
+    bases = [qary_basis(10, 8, seed) for seed in range(4)]
+    cache_store(bases[0], PARAMS, np.array(bases[0]), {}, tmp_path)
+    size = os.path.getsize(next(tmp_path.glob("*.npz")))
+    cache_store(bases[1], PARAMS, np.array(bases[1]), {}, tmp_path, max_bytes=2 * size)
+    # a hit makes the first entry the most recently used, so the second one goes
+    assert cache_lookup(bases[0], PARAMS, tmp_path) is not None
+    cache_store(bases[2], PARAMS, np.array(bases[2]), {}, tmp_path, max_bytes=2 * size)
+    assert cache_lookup(bases[1], PARAMS, tmp_path) is None
+    assert cache_lookup(bases[0], PARAMS, tmp_path) is not None
+    assert cache_lookup(bases[2], PARAMS, tmp_path) is not None
+    assert len(list(tmp_path.glob("*.npz"))) == 2
+
+    # the entry just stored always stays, even past max_bytes
+    cache_store(bases[3], PARAMS, np.array(bases[3]), {}, tmp_path, max_bytes=0)
+    assert [cache_lookup(b, PARAMS, tmp_path) is not None for b in bases] == [False] * 3 + [True]
+
+
+def test_bkz_alg_cache(tmp_path):
+    basis = qary_basis(20, 10, 0)
+    first = BKZ_alg(basis, 8, 0.99, cache_dir=tmp_path)
+    assert same_lattice(basis, first)
+    events = []
+    second = BKZ_alg(basis, 8, 0.99, cache_dir=tmp_path, hook=events.append)
+    # straight from the cache: no LLL pass, no tours
+    assert events == []
+    assert np.array_equal(np.array(first), np.array(second))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from helpers import is_lll_reduced, qary_basis, same_lattice
+from lattice_reduction.bkz import BKZ_alg
+from lattice_reduction.enumeration import enumerate_svp
+from lattice_reduction.lll_engine import gso_init, lll_reduce
+from lattice_reduction.sieve import SIEVE_MIN_DIM, database_size, sieve_svp
+
+
+def reduced_gso(d, seed):
+    B = np.array(qary_basis(d, 10, seed), dtype=float)
+    Mu, r = gso_init(B)
+    lll_reduce(B, Mu, r, 0.99)
+    return B, Mu, r
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_sieve_finds_the_shortest_vector(seed):
+    B, Mu, r = reduced_gso(SIEVE_MIN_DIM + 2, seed)
+    x, norm_sq = sieve_svp(Mu, r, seed=0)
+    v = np.array(x) @ B
+    assert norm_sq == pytest.approx(v @ v, rel=1e-6)
+    assert norm_sq == pytest.approx(enumerate_svp(Mu, r, r[0])[1], rel=1e-6)
+
+
+def test_same_seed_same_result():
+    B, Mu, r = reduced_gso(SIEVE_MIN_DIM + 2, 2)
+    assert list(sieve_svp(Mu, r, seed=5)[0]) == list(sieve_svp(Mu, r, seed=5)[0])
+
+
+def test_memory_cap():
+    assert database_size(60, max_memory_mb=1) * (60 * 12 + 8) <= 2 ** 20
+    assert database_size(60, max_memory_mb=1) < database_size(60)
+
+
+def test_sieve_oracle_in_bkz():
+    basis = qary_basis(24, 12, 4)
+    reduced = BKZ_alg(basis, 10, 0.99, svp="sieve", seed=0)
+    assert same_lattice(basis, reduced)
+    assert is_lll_reduced(reduced, 0.99)
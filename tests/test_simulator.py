@@ -0,0 +1,59 @@
+from math import lgamma, log, pi
+
+import pytest
+
+from lattice_reduction.instrumentation import gsa_slope, root_hermite_factor
+from lattice_reduction.simulator import calibrate, initial_profile, log_gh, simulate
+
+# a GSA-shaped LLL profile: d = 100, log ||b_i*|| falling by 0.04 a step, volume 1
+D = 100
+PROFILE = [0.04 * ((D - 1) / 2 - i) for i in range(D)]
+
+
+def test_log_gh():
+    # past the HKZ table, the usual formula
+    assert log_gh(60) == pytest.approx(lgamma(31) / 60 - log(pi) / 2)
+    assert log_gh(100) > log_gh(60)
+
+
+def test_initial_profile_from_r():
+    assert initial_profile([4.0, 1.0]) == pytest.approx([log(2), 0])
+
+
+def test_simulate_cn11():
+    prediction = simulate(PROFILE, 30, max_tours=8)
+    # the volume is kept, and the head of the basis gets shorter
+    assert sum(prediction["profile"]) == pytest.approx(sum(PROFILE), abs=1e-9)
+    assert prediction["profile"][0] < PROFILE[0]
+    assert 1 <= prediction["tours"] <= 8
+    assert prediction["rhf"] < root_hermite_factor(PROFILE)
+    assert abs(prediction["slope"]) < abs(gsa_slope(PROFILE))
+    # deterministic, and a larger block gets further
+    again = simulate(PROFILE, 30, max_tours=8)
+    assert (again["profile"], again["tours"]) == (prediction["profile"], prediction["tours"])
+    assert simulate(PROFILE, 50, max_tours=8)["rhf"] < prediction["rhf"]
+
+
+def test_simulate_bsw18_is_seeded():
+    first = simulate(PROFILE, 30, max_tours=4, probabilistic=True, trials=3, seed=1)
+    again = simulate(PROFILE, 30, max_tours=4, probabilistic=True, trials=3, seed=1)
+    assert first["profile"] == again["profile"]
+    assert sum(first["profile"]) == pytest.approx(sum(PROFILE), abs=1e-9)
+    assert first["rhf"] < root_hermite_factor(PROFILE)
+
+
+def test_calibrate_against_itself():
+    # "measured" tours that are the simulation's own: no difference anywhere
+    events = [{"phase": "lll", "index": 0, "profile": PROFILE}]
+    for tour in range(1, 4):
+        profile = simulate(PROFILE, 30, max_tours=tour, auto_abort=False)["profile"]
+        events.append({"phase": "tour", "index": tour, "profile": profile,
+                       "slope": gsa_slope(profile), "rhf": root_hermite_factor(profile)})
+    report = calibrate(events, 30)
+    assert report["measured_tours"] == 3
+    assert [row["tour"] for row in report["tours"]] == [1, 2, 3]
+    for row in report["tours"]:
+        assert row["profile_rms"] == pytest.approx(0, abs=1e-12)
+        assert row["log_norm"] == pytest.approx(row["measured_log_norm"])
+        assert row["rhf"] == pytest.approx(row["measured_rhf"])
+    assert report["predicted_tours"] == simulate(PROFILE, 30)["tours"]